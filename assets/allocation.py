@@ -0,0 +1,96 @@
+from django.db import transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from audit.recorder import record, snapshot
+from notifications.models import Notification
+from notifications.outbox import build
+from .models import Asset, AssetRequest
+
+# Hand out the best-condition stock first
+CONDITION_RANK = Case(
+    *[When(Q(condition=value), then=Value(rank)) for rank, (value, _) in enumerate(Asset.CONDITION_CHOICES)],
+    default=Value(len(Asset.CONDITION_CHOICES)), output_field=IntegerField(),
+)
+
+
+def approve_requests(request_ids=None, limit=500):
+    """
+    Approve pending asset requests (oldest first), assigning Available stock of
+    the requested type and creating procurement placeholders only when stock runs out.
+
+    Requests and stock rows are locked with SKIP LOCKED, so approvers working the
+    same backlog concurrently each take different rows instead of waiting on or
+    double-assigning them. Requests locked by someone else are reported as skipped.
+    """
+    today = timezone.now().date()
+    with transaction.atomic():
+        pending = AssetRequest.objects.select_for_update(skip_locked=True, of=('self',)).filter(status='Pending')
+        if request_ids is not None:
+            pending = pending.filter(pk__in=request_ids)
+        requests = list(pending.select_related('employee').order_by('request_date', 'id')[:limit])
+        before = {asset_request.pk: snapshot(asset_request, ['status', 'asset']) for asset_request in requests}
+
+        by_type = {}
+        for asset_request in requests:
+            by_type.setdefault(asset_request.asset_type, []).append(asset_request)
+
+        assigned, placeholders = [], []
+        for asset_type, waiting in by_type.items():
+            stock = list(
+                Asset.objects.select_for_update(skip_locked=True)
+                .filter(asset_type=asset_type, status='Available', assigned_to__isnull=True)
+                .order_by(CONDITION_RANK, 'id')[:len(waiting)]
+            )
+            for asset_request, asset in zip(waiting, stock):
+                asset.assigned_to = asset_request.employee
+                asset.assigned_date = today
+                asset.status = 'Assigned'
+                asset_request.asset = asset
+                assigned.append(asset)
+
+            # Out of stock: a placeholder to be replaced once the item is procured
+            for asset_request in waiting[len(stock):]:
+                asset = Asset(
+                    name=f"{asset_request.asset_type} for {asset_request.employee.first_name}",
+                    asset_type=asset_request.asset_type,
+                    serial_number=f"AUTO-{asset_request.id}", # Placeholder serial
+                    assigned_to=asset_request.employee,
+                    assigned_date=today,
+                    status='Assigned',
+                    condition='Good'
+                )
+                asset_request.asset = asset
+                placeholders.append(asset)
+
+        Asset.objects.bulk_update(assigned, ['assigned_to', 'assigned_date', 'status'], batch_size=500)
+        Asset.objects.bulk_create(placeholders, batch_size=500)
+        if any(asset.pk is None for asset in placeholders):
+            # Backends without INSERT ... RETURNING (MySQL): look the new ids up by serial
+            ids = dict(Asset.objects.filter(serial_number__in=[asset.serial_number for asset in placeholders])
+                       .values_list('serial_number', 'id'))
+            for asset in placeholders:
+                asset.pk = ids[asset.serial_number]
+        for asset_request in requests:
+            asset_request.status = 'Approved'
+            asset_request.asset_id = asset_request.asset.pk
+        AssetRequest.objects.bulk_update(requests, ['status', 'asset'], batch_size=500)
+        for asset_request in requests:
+            record(asset_request, before[asset_request.pk])
+        # Each requester hears about their own asset, queued in the same transaction
+        Notification.objects.bulk_create([
+            build('asset.approved', f"Your {asset_request.asset_type} request was approved", [asset_request.employee_id],
+                  body=f"Assigned: {asset_request.asset.name} ({asset_request.asset.serial_number})",
+                  payload={'asset_request': asset_request.pk, 'asset': asset_request.asset.pk})
+            for asset_request in requests
+        ], batch_size=500)
+
+    approved_ids = [asset_request.pk for asset_request in requests]
+    skipped_ids = sorted(set(request_ids) - set(approved_ids)) if request_ids is not None else []
+    return {
+        'approved': len(requests),
+        'allocated_from_stock': len(assigned),
+        'procurement_placeholders': len(placeholders),
+        'approved_ids': approved_ids,
+        'skipped_ids': skipped_ids,
+    }
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0002_alter_assetrequest_request_date'),
+        ('employee', '0005_employee_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['asset_type', 'status'], name='asset_type_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['assigned_to', 'status'], name='asset_holder_status_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0003_inventory_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetrequest',
+            name='asset',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='requests', to='assets.asset'),
+        ),
+    ]
@@ -27,6 +27,13 @@ class Asset(models.Model):
     assigned_date = models.DateField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Available')
     condition = models.CharField(max_length=20, choices=CONDITION_CHOICES, default='Excellent')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['asset_type', 'status'], name='asset_type_status_idx'),
+            # assigned_to alone is already indexed as a foreign key; holdings filter on both
+            models.Index(fields=['assigned_to', 'status'], name='asset_holder_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.serial_number})"
@@ -40,6 +47,8 @@ class AssetRequest(models.Model):
     # Auto-add date (Fixes the crash)
     request_date = models.DateField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    # Asset handed out on approval (from stock, or a procurement placeholder)
+    asset = models.ForeignKey(Asset, on_delete=models.SET_NULL, null=True, blank=True, related_name='requests')
 
     def __str__(self):
         return f"{self.employee.first_name} requested {self.asset_type}"
\ No newline at end of file
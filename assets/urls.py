@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AssetViewSet, AssetRequestViewSet
+from .views import AssetViewSet, AssetRequestViewSet, category_stats_async, inventory_stats_async
 
 router = DefaultRouter()
 router.register(r'inventory', AssetViewSet, basename='inventory')
@@ -8,4 +9,9 @@ router.register(r'requests', AssetRequestViewSet, basename='requests')
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
+
+# Under ASGI the stats endpoint is served by its async view (must come before the router)
+if settings.ASYNC_VIEWS:
+    urlpatterns.insert(0, path('inventory/category_stats/', category_stats_async, name='inventory-category-stats'))
+    urlpatterns.insert(0, path('inventory/inventory_stats/', inventory_stats_async, name='inventory-inventory-stats'))
\ No newline at end of file
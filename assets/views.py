@@ -1,25 +1,113 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db.models import Count
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from .allocation import approve_requests
+from audit.recorder import record, snapshot
 from .models import Asset, AssetRequest
 from .serializers import AssetSerializer, AssetRequestSerializer
+from lib_management.async_utils import api_checks, run_in_thread
+
+
+CATEGORY_CARDS = [
+    (1, 'Laptop', 'Laptops', '#6366f1'),
+    (2, 'Monitor', 'Monitors', '#22c55e'),
+    (3, 'Phone', 'Phones', '#f59e0b'),
+    (4, 'Accessory', 'Accessories', '#ec4899'),
+]
+
+
+def inventory_counts():
+    # One grouped query: {(asset_type, status, condition): count}
+    rows = Asset.objects.order_by().values('asset_type', 'status', 'condition').annotate(count=Count('id'))
+    return {(row['asset_type'], row['status'], row['condition']): row['count'] for row in rows}
+
+
+def category_stats():
+    by_type = {}
+    for (asset_type, _, _), count in inventory_counts().items():
+        by_type[asset_type] = by_type.get(asset_type, 0) + count
+    return [
+        {'id': card_id, 'name': name, 'count': by_type.get(asset_type, 0), 'color': color}
+        for card_id, asset_type, name, color in CATEGORY_CARDS
+    ]
+
+
+def inventory_stats():
+    # Totals by type, status and condition, plus status/condition per type, from the same grouped query
+    statuses = [value for value, _ in Asset.STATUS_CHOICES]
+    conditions = [value for value, _ in Asset.CONDITION_CHOICES]
+    stats = {
+        'total': 0,
+        'by_status': dict.fromkeys(statuses, 0),
+        'by_condition': dict.fromkeys(conditions, 0),
+        'by_type': {
+            asset_type: {'total': 0, 'by_status': dict.fromkeys(statuses, 0), 'by_condition': dict.fromkeys(conditions, 0)}
+            for asset_type, _ in Asset.TYPE_CHOICES
+        },
+    }
+    for (asset_type, asset_status, condition), count in inventory_counts().items():
+        per_type = stats['by_type'].setdefault(asset_type, {'total': 0, 'by_status': {}, 'by_condition': {}})
+        for bucket in (stats, per_type):
+            bucket['total'] += count
+            bucket['by_status'][asset_status] = bucket['by_status'].get(asset_status, 0) + count
+            bucket['by_condition'][condition] = bucket['by_condition'].get(condition, 0) + count
+    return stats
+
 
 class AssetViewSet(viewsets.ModelViewSet):
-    queryset = Asset.objects.all()
+    # assigned_to is joined so assigned_to_name doesn't cost a query per asset
+    queryset = Asset.objects.select_related('assigned_to').order_by('id')
     serializer_class = AssetSerializer
 
+    def get_queryset(self):
+        # Optional filters: ?asset_type=Laptop&status=Assigned
+        queryset = super().get_queryset()
+        asset_type = self.request.query_params.get('asset_type')
+        asset_status = self.request.query_params.get('status')
+        if asset_type:
+            queryset = queryset.filter(asset_type=asset_type)
+        if asset_status:
+            queryset = queryset.filter(status=asset_status)
+        return queryset
+
     @action(detail=False, methods=['get'])
     def category_stats(self, request):
-        stats = [
-            {'id': 1, 'name': 'Laptops', 'count': Asset.objects.filter(asset_type='Laptop').count(), 'color': '#6366f1'},
-            {'id': 2, 'name': 'Monitors', 'count': Asset.objects.filter(asset_type='Monitor').count(), 'color': '#22c55e'},
-            {'id': 3, 'name': 'Phones', 'count': Asset.objects.filter(asset_type='Phone').count(), 'color': '#f59e0b'},
-            {'id': 4, 'name': 'Accessories', 'count': Asset.objects.filter(asset_type='Accessory').count(), 'color': '#ec4899'},
-        ]
-        return Response(stats)
+        return Response(category_stats())
+
+    @action(detail=False, methods=['get'])
+    def inventory_stats(self, request):
+        return Response(inventory_stats())
+
+    # Assets held per employee; ?employee_id=EMP006 lists one employee's assets
+    @action(detail=False, methods=['get'])
+    def holdings(self, request):
+        employee_id = request.query_params.get('employee_id')
+        if employee_id:
+            assets = self.get_queryset().filter(assigned_to__employee_id=employee_id)
+            return Response(self.get_serializer(assets, many=True).data)
+
+        rows = (Asset.objects.filter(assigned_to__isnull=False).order_by()
+                .values('assigned_to', 'assigned_to__employee_id', 'assigned_to__first_name',
+                        'assigned_to__last_name', 'asset_type')
+                .annotate(count=Count('id')))
+        holders = {}
+        for row in rows:
+            holder = holders.setdefault(row['assigned_to'], {
+                'employee': row['assigned_to'],
+                'employee_id': row['assigned_to__employee_id'],
+                'name': f"{row['assigned_to__first_name']} {row['assigned_to__last_name']}",
+                'total': 0,
+                'by_type': {},
+            })
+            holder['total'] += row['count']
+            holder['by_type'][row['asset_type']] = row['count']
+        return Response(sorted(holders.values(), key=lambda holder: holder['employee_id']))
 
 class AssetRequestViewSet(viewsets.ModelViewSet):
-    queryset = AssetRequest.objects.all().order_by('-request_date')
+    queryset = AssetRequest.objects.select_related('employee').order_by('-request_date')
     serializer_class = AssetRequestSerializer
 
     @action(detail=True, methods=['patch'])
@@ -27,21 +115,49 @@ class AssetRequestViewSet(viewsets.ModelViewSet):
         asset_request = self.get_object()
         new_status = request.data.get('status')
         
-        if new_status == 'Approved' and asset_request.status != 'Approved':
-            # === LOGIC TO CREATE ASSET ON APPROVAL ===
-            Asset.objects.create(
-                name=f"{asset_request.asset_type} for {asset_request.employee.first_name}",
-                asset_type=asset_request.asset_type,
-                serial_number=f"AUTO-{asset_request.id}", # Placeholder serial
-                assigned_to=asset_request.employee,
-                assigned_date=asset_request.request_date,
-                status='Assigned',
-                condition='Good'
-            )
-            
-        if new_status in ['Approved', 'Rejected']:
+        if new_status == 'Approved':
+            if asset_request.status == 'Approved':
+                return Response({'message': 'Request Approved'})
+            # === ALLOCATE FROM STOCK ON APPROVAL (placeholder asset if none is available) ===
+            report = approve_requests([asset_request.pk])
+            if not report['approved']:
+                return Response({'error': 'Request is being processed by another approver or is no longer pending'}, status=409)
+            return Response({'message': 'Request Approved', **report})
+
+        if new_status == 'Rejected':
+            before = snapshot(asset_request, ['status'])
             asset_request.status = new_status
             asset_request.save()
+            record(asset_request, before)
             return Response({'message': f'Request {new_status}'})
         
-        return Response({'error': 'Invalid status'}, status=400)
\ No newline at end of file
+        return Response({'error': 'Invalid status'}, status=400)
+
+    # Approve a backlog in one call: {"ids": [1, 2, 3]} or {"all_pending": true, "limit": 200} for the oldest pending
+    @action(detail=False, methods=['post'])
+    def bulk_approve(self, request):
+        ids = request.data.get('ids')
+        all_pending = request.data.get('all_pending') in (True, 'true', 'True', '1', 1)
+        # An empty selection must never turn into "everything pending"
+        if not all_pending and (not isinstance(ids, list) or not ids):
+            return Response({'error': 'ids must be a non-empty list (or set all_pending to approve the oldest pending)'}, status=400)
+        try:
+            ids = None if all_pending else [int(pk) for pk in ids]
+            limit = min(max(int(request.data.get('limit', 500)), 1), 5000)
+        except (TypeError, ValueError):
+            return Response({'error': 'ids and limit must be numbers'}, status=400)
+        return Response(approve_requests(ids, limit=limit))
+
+
+# Async version of category_stats (served under ASGI)
+@require_GET
+@api_checks()
+async def category_stats_async(request):
+    stats = await run_in_thread(category_stats)
+    return JsonResponse(stats, safe=False)
+
+@require_GET
+@api_checks()
+async def inventory_stats_async(request):
+    stats = await run_in_thread(inventory_stats)
+    return JsonResponse(stats)
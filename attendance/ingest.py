@@ -0,0 +1,130 @@
+from datetime import datetime
+from itertools import islice
+
+from django.db import transaction
+
+from employee.models import Employee
+
+from .models import Attendance
+from .shifts import ShiftContext
+
+MAX_REPORTED_ERRORS = 1000
+
+
+def parse_time(value):
+    value = str(value).strip()
+    for fmt in ('%H:%M', '%H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            pass
+    raise ValueError(value)
+
+
+class AttendanceIngester:
+    """
+    Upsert attendance rows (one per employee and day) from an iterator of dict
+    rows, e.g. a clock-in device export. Per chunk: one query for the existing
+    rows, one ShiftContext for shifts and timezones, then bulk writes; status and
+    hours come from the same engine as Attendance.save().
+    """
+
+    def __init__(self, chunk_size=1000, dry_run=False):
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.created = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []
+        # Single pre-fetch: employee code (EMP001) -> pk
+        self.employees = {code.upper(): pk for code, pk in Employee.all_objects.values_list('employee_id', 'pk')}
+
+    def run(self, rows):
+        numbered = enumerate(rows, start=1)
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                break
+            self._ingest_chunk(chunk)
+        return self.report()
+
+    def report(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'failed': self.error_count,
+            'errors': self.errors,
+            'dry_run': self.dry_run,
+        }
+
+    def _error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'errors': errors})
+
+    def _parse(self, row_number, row):
+        if not isinstance(row, dict):
+            self._error(row_number, {'non_field_errors': ['Row must be an object']})
+            return None
+
+        errors = {}
+        employee_id = self.employees.get(str(row.get('employee_id') or row.get('employee') or '').strip().upper())
+        if employee_id is None:
+            errors['employee_id'] = ['Unknown employee.']
+        try:
+            day = datetime.strptime(str(row.get('date', '')).strip(), '%Y-%m-%d').date()
+        except ValueError:
+            errors['date'] = ['Use YYYY-MM-DD.']
+        times = {}
+        for field in ('check_in', 'check_out'):
+            times[field] = None
+            if row.get(field):
+                try:
+                    times[field] = parse_time(row[field])
+                except ValueError:
+                    errors[field] = ['Use HH:MM or HH:MM:SS.']
+        status = row.get('status') or None
+        if status and status not in dict(Attendance.STATUS_CHOICES):
+            errors['status'] = [f'"{status}" is not a valid status.']
+        if errors:
+            self._error(row_number, errors)
+            return None
+        return {'employee_id': employee_id, 'date': day, 'status': status, **times}
+
+    def _ingest_chunk(self, chunk):
+        parsed = {}
+        for row_number, row in chunk:
+            values = self._parse(row_number, row)
+            if values is not None:
+                # A later row for the same employee and day wins
+                parsed[values['employee_id'], values['date']] = values
+        if not parsed:
+            return
+
+        employee_ids = {employee_id for employee_id, _ in parsed}
+        dates = {day for _, day in parsed}
+        existing = {}
+        for record in Attendance.objects.filter(employee_id__in=employee_ids, date__in=dates).order_by('-id'):
+            # Oldest row per employee and day is the one kept up to date
+            existing[record.employee_id, record.date] = record
+
+        new, changed = [], []
+        for key, values in parsed.items():
+            record = existing.get(key)
+            if record is None:
+                record = Attendance(employee_id=values['employee_id'], date=values['date'])
+                new.append(record)
+            else:
+                changed.append(record)
+            record.check_in = values['check_in']
+            record.check_out = values['check_out']
+            if values['status']:
+                record.status = values['status']
+
+        ShiftContext.load(employee_ids, dates).apply_all(new + changed)
+        if not self.dry_run:
+            with transaction.atomic():
+                Attendance.objects.bulk_create(new, batch_size=1000)
+                Attendance.objects.bulk_update(changed, ['check_in', 'check_out', 'status', 'working_hours'], batch_size=1000)
+        self.created += len(new)
+        self.updated += len(changed)
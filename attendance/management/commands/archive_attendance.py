@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from attendance.models import Attendance, AttendanceArchive
+
+ARCHIVE_FIELDS = ['id', 'employee_id', 'date', 'check_in', 'check_out', 'status', 'working_hours']
+
+
+class Command(BaseCommand):
+    help = "Move attendance rows older than --before (default: start of this month) into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', help="YYYY-MM-DD; rows dated before this day are archived")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['before']:
+            try:
+                before = datetime.strptime(options['before'], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("--before must be YYYY-MM-DD")
+        else:
+            before = timezone.now().date().replace(day=1)
+
+        old_rows = Attendance.objects.filter(date__lt=before)
+        if options['dry_run']:
+            self.stdout.write(f"Would archive {old_rows.count()} attendance rows dated before {before}.")
+            return
+
+        # Batches walk the primary key so each one is a short transaction and a range scan
+        batch_size = options['batch_size']
+        total = 0
+        while True:
+            with transaction.atomic():
+                rows = list(old_rows.order_by('pk').values(*ARCHIVE_FIELDS)[:batch_size])
+                if not rows:
+                    break
+                # ignore_conflicts: a batch interrupted after the copy is simply copied again
+                AttendanceArchive.objects.bulk_create([AttendanceArchive(**row) for row in rows], ignore_conflicts=True)
+                Attendance.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+            total += len(rows)
+            self.stdout.write(f"  archived {total} rows...")
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} attendance rows dated before {before}."))
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from attendance.models import Attendance
+from attendance.shifts import ShiftContext
+
+
+class Command(BaseCommand):
+    help = "Recompute attendance status and hours from shifts and employee timezones (e.g. after changing a shift)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="YYYY-MM-DD, first day to recompute")
+        parser.add_argument('--end', help="YYYY-MM-DD, last day to recompute")
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        records = Attendance.objects.all()
+        try:
+            if options['start']:
+                records = records.filter(date__gte=datetime.strptime(options['start'], "%Y-%m-%d").date())
+            if options['end']:
+                records = records.filter(date__lte=datetime.strptime(options['end'], "%Y-%m-%d").date())
+        except ValueError:
+            raise CommandError("--start and --end must be YYYY-MM-DD")
+
+        # Batches walk the primary key; each loads its shifts and timezones once
+        last_pk = 0
+        total = changed_total = 0
+        while True:
+            batch = list(records.filter(pk__gt=last_pk).order_by('pk')[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            before = [(record.status, record.working_hours) for record in batch]
+            ShiftContext.load({record.employee_id for record in batch}, {record.date for record in batch}).apply_all(batch)
+            changed = [record for record, old in zip(batch, before) if (record.status, record.working_hours) != old]
+            with transaction.atomic():
+                Attendance.objects.bulk_update(changed, ['status', 'working_hours'], batch_size=1000)
+            total += len(batch)
+            changed_total += len(changed)
+            self.stdout.write(f"  checked {total} rows...")
+
+        self.stdout.write(self.style.SUCCESS(f"Recomputed {total} attendance rows, {changed_total} changed."))
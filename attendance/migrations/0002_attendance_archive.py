@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+        ('employee', '0005_employee_soft_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('check_in', models.TimeField(blank=True, null=True)),
+                ('check_out', models.TimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('Present', 'Present'), ('Absent', 'Absent'), ('On Leave', 'On Leave'), ('Late', 'Late'), ('Half Day', 'Half Day'), ('Working', 'Working')], default='Absent', max_length=20)),
+                ('working_hours', models.CharField(blank=True, default='-', max_length=20, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['employee', 'date'], name='attendance_emp_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='attendancearchive',
+            name='employee',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendances', to='employee.employee'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancearchive',
+            index=models.Index(fields=['date', 'status'], name='attendance_arch_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancearchive',
+            index=models.Index(fields=['employee', 'date'], name='attendance_arch_emp_date_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:52
+
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_standard_shift(apps, schema_editor):
+    # The rule attendance used so far: 09:00 start, late after 09:30
+    Shift = apps.get_model('attendance', 'Shift')
+    Shift.objects.get_or_create(name='Standard', defaults={
+        'start_time': datetime.time(9, 0), 'end_time': datetime.time(18, 0),
+        'grace_minutes': 30, 'half_day_minutes': 0, 'is_default': True,
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_attendance_archive'),
+        ('employee', '0006_employee_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Shift',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('start_time', models.TimeField(default=datetime.time(9, 0))),
+                ('end_time', models.TimeField(default=datetime.time(18, 0))),
+                ('grace_minutes', models.PositiveIntegerField(default=30)),
+                ('half_day_minutes', models.PositiveIntegerField(default=0)),
+                ('is_default', models.BooleanField(default=False)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EmployeeShift',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('effective_from', models.DateField()),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shift_assignments', to='employee.employee')),
+                ('shift', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='assignments', to='attendance.shift')),
+            ],
+            options={
+                'ordering': ['employee', '-effective_from', '-id'],
+                'indexes': [models.Index(fields=['employee', 'effective_from'], name='employee_shift_from_idx')],
+            },
+        ),
+        migrations.RunPython(create_standard_shift, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,55 @@
-from django.db import models
-from datetime import date, datetime, timedelta
+from django.db import models, transaction
+from datetime import date, time
 from employee.models import Employee
 
 
+class Shift(models.Model):
+    # Working hours in the employee's own timezone (EmployeeSettings.timezone).
+    # An end at or before the start means the shift runs past midnight (e.g. 22:00-06:00).
+    name = models.CharField(max_length=100, unique=True)
+    start_time = models.TimeField(default=time(9, 0))
+    end_time = models.TimeField(default=time(18, 0))
+    # Checking in later than start + grace is Late
+    grace_minutes = models.PositiveIntegerField(default=30)
+    # Less time worked than this is a Half Day (0 = never)
+    half_day_minutes = models.PositiveIntegerField(default=0)
+    # Used for employees without an assignment
+    is_default = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} ({self.start_time:%H:%M}-{self.end_time:%H:%M})"
+
+    @property
+    def crosses_midnight(self):
+        return self.end_time <= self.start_time
+
+    def save(self, *args, **kwargs):
+        # Only one default shift
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self.is_default:
+                Shift.objects.filter(is_default=True).exclude(pk=self.pk).update(is_default=False)
+
+
+class EmployeeShift(models.Model):
+    # Effective-dated shift assignments: the latest one on or before a day applies to it
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='shift_assignments')
+    shift = models.ForeignKey(Shift, on_delete=models.PROTECT, related_name='assignments')
+    effective_from = models.DateField()
+
+    class Meta:
+        ordering = ['employee', '-effective_from', '-id']
+        indexes = [
+            models.Index(fields=['employee', 'effective_from'], name='employee_shift_from_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id}: {self.shift.name} from {self.effective_from}"
+
+
 class Attendance(models.Model):
     STATUS_CHOICES = [
         ('Present', 'Present'),
@@ -24,33 +71,57 @@ class Attendance(models.Model):
     # We store this, but also calculate it
     working_hours = models.CharField(max_length=20, blank=True, null=True, default='-')
 
-    def save(self, *args, **kwargs):
-        # 1. Auto-Calculate Status based on Time
-        if self.check_in and not self.check_out and self.status != 'On Leave':
-             self.status = 'Working'
-        
-        elif self.check_in and self.check_out:
-            # Example Logic: Late if after 9:30 AM
-            check_in_time = self.check_in.strftime('%H:%M')
-            if check_in_time > '09:30':
-                self.status = 'Late'
-            else:
-                self.status = 'Present'
-
-            # 2. Calculate Working Hours
-            t1 = datetime.combine(date.today(), self.check_in)
-            t2 = datetime.combine(date.today(), self.check_out)
-            diff = t2 - t1
-            
-            total_seconds = diff.total_seconds()
-            hours = int(total_seconds // 3600)
-            minutes = int((total_seconds % 3600) // 60)
-            self.working_hours = f"{hours}h {minutes}m"
-        
-        elif not self.check_in and self.status != 'On Leave':
-            self.status = 'Absent'
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+            models.Index(fields=['employee', 'date'], name='attendance_emp_date_idx'),
+        ]
 
+    def save(self, *args, **kwargs):
+        # Status and hours from the employee's shift and timezone (attendance/shifts.py)
+        from .shifts import ShiftContext
+        if self.check_in and self.check_out:
+            context = ShiftContext.load([self.employee_id], [self.date])
+        else:
+            # Without both times no shift or timezone is involved: skip their queries
+            context = ShiftContext.empty()
+        context.apply(self)
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.employee.first_name} {self.employee.last_name} - {self.date}"
\ No newline at end of file
+        return f"{self.employee.first_name} {self.employee.last_name} - {self.date}"
+
+
+class AttendanceArchive(models.Model):
+    # Rows moved out of Attendance by `manage.py archive_attendance`; ids are kept as-is
+    id = models.BigIntegerField(primary_key=True)
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='archived_attendances')
+
+    date = models.DateField()
+    check_in = models.TimeField(null=True, blank=True)
+    check_out = models.TimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Attendance.STATUS_CHOICES, default='Absent')
+    working_hours = models.CharField(max_length=20, blank=True, null=True, default='-')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'status'], name='attendance_arch_date_idx'),
+            models.Index(fields=['employee', 'date'], name='attendance_arch_emp_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.first_name} {self.employee.last_name} - {self.date} (archived)"
+
+    @classmethod
+    def boundary(cls):
+        # Latest archived date; anything after it lives in Attendance
+        return cls.objects.order_by('-date').values_list('date', flat=True).first()
+
+    @classmethod
+    def covers(cls, start_date):
+        # Only a date range reaching back past the boundary needs the archive
+        if start_date is None:
+            return False
+        boundary = cls.boundary()
+        return boundary is not None and start_date <= boundary
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Attendance
+from .models import Attendance, EmployeeShift, Shift
 
 
 class AttendanceSerializer(serializers.ModelSerializer):
@@ -16,4 +16,20 @@ class AttendanceSerializer(serializers.ModelSerializer):
         ]
 
     def get_employee_name(self, obj):
-        return f"{obj.employee.first_name} {obj.employee.last_name}"
\ No newline at end of file
+        return f"{obj.employee.first_name} {obj.employee.last_name}"
+
+
+class ShiftSerializer(serializers.ModelSerializer):
+    crosses_midnight = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Shift
+        fields = ['id', 'name', 'start_time', 'end_time', 'grace_minutes', 'half_day_minutes', 'is_default', 'crosses_midnight']
+
+
+class EmployeeShiftSerializer(serializers.ModelSerializer):
+    shift_name = serializers.CharField(source='shift.name', read_only=True)
+
+    class Meta:
+        model = EmployeeShift
+        fields = ['id', 'employee', 'shift', 'shift_name', 'effective_from']
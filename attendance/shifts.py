@@ -0,0 +1,129 @@
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+
+from settings_app.models import EmployeeSettings
+
+from .models import EmployeeShift, Shift
+
+DAY = timedelta(days=1)
+# Any fixed day: hours are computed from times of day only
+ANY_DAY = date(2000, 1, 1)
+
+# Used when no Shift is marked default: the historical "late after 09:30" rule
+FALLBACK_SHIFT = Shift(name='Standard', start_time=time(9, 0), end_time=time(18, 0), grace_minutes=30, half_day_minutes=0)
+
+
+def get_zone(name):
+    try:
+        return ZoneInfo(name or 'UTC')
+    except (ZoneInfoNotFoundError, ValueError):
+        return dt_timezone.utc
+
+
+def clock_zone():
+    # Timezone check_in/check_out are recorded in (the server clock unless configured)
+    return get_zone(getattr(settings, 'ATTENDANCE_CLOCK_TIMEZONE', None) or settings.TIME_ZONE)
+
+
+def format_hours(seconds):
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    return f"{hours}h {minutes}m"
+
+
+class ShiftContext:
+    """
+    Everything status/hours computation needs for a batch of attendance rows,
+    loaded up front: the shift table, the employees' shift assignments (one
+    query) and their timezones (EmployeeSettings.for_employees, cached).
+    After load() no row costs a query.
+    """
+
+    def __init__(self, shifts, assignments, zones, default_shift):
+        self.shifts = shifts              # shift pk -> Shift
+        self.assignments = assignments    # employee pk -> ([effective_from ...], [shift pk ...]) ascending
+        self.zones = zones                # employee pk -> tzinfo
+        self.default_shift = default_shift
+        self.clock = clock_zone()
+
+    @classmethod
+    def load(cls, employee_ids, dates):
+        employee_ids = {pk for pk in employee_ids if pk}
+        shifts = {shift.pk: shift for shift in Shift.objects.all()}
+        default_shift = next((shift for shift in shifts.values() if shift.is_default), FALLBACK_SHIFT)
+
+        assignments = {}
+        if employee_ids and dates:
+            rows = (EmployeeShift.objects.filter(employee_id__in=employee_ids, effective_from__lte=max(dates))
+                    .order_by('employee_id', 'effective_from', 'id').values_list('employee_id', 'effective_from', 'shift_id'))
+            for employee_id, effective_from, shift_id in rows:
+                days, shift_ids = assignments.setdefault(employee_id, ([], []))
+                days.append(effective_from)
+                shift_ids.append(shift_id)
+
+        preferences = EmployeeSettings.for_employees(employee_ids) if employee_ids else {}
+        zones = {pk: get_zone(values.get('timezone')) for pk, values in preferences.items()}
+        return cls(shifts, assignments, zones, default_shift)
+
+    @classmethod
+    def empty(cls):
+        # For rows without a full check-in/check-out pair, whose status needs no shift
+        return cls({}, {}, {}, FALLBACK_SHIFT)
+
+    def shift_for(self, employee_id, day):
+        days, shift_ids = self.assignments.get(employee_id, ((), ()))
+        position = bisect_right(days, day)
+        if position:
+            return self.shifts.get(shift_ids[position - 1], self.default_shift)
+        return self.default_shift
+
+    def evaluate(self, employee_id, day, check_in, check_out, current_status):
+        """(status, working_hours) for one row; working_hours None = leave as is."""
+        if not (check_in and check_out):
+            # Leave days keep their status until someone actually checks in and out
+            if current_status == 'On Leave':
+                return current_status, None
+            return ('Working' if check_in else 'Absent'), None
+
+        shift = self.shift_for(employee_id, day)
+        zone = self.zones.get(employee_id, dt_timezone.utc)
+        scheduled_start = datetime.combine(day, shift.start_time, tzinfo=zone)
+        arrived = self._instant_near(check_in, scheduled_start)
+        worked = self._worked_seconds(check_in, check_out)
+
+        if shift.half_day_minutes and worked < shift.half_day_minutes * 60:
+            status = 'Half Day'
+        elif arrived > scheduled_start + timedelta(minutes=shift.grace_minutes):
+            status = 'Late'
+        else:
+            status = 'Present'
+        return status, format_hours(worked)
+
+    def apply(self, record):
+        status, working_hours = self.evaluate(record.employee_id, record.date, record.check_in,
+                                              record.check_out, record.status)
+        record.status = status
+        if working_hours is not None:
+            record.working_hours = working_hours
+        return record
+
+    def apply_all(self, records):
+        for record in records:
+            self.apply(record)
+        return records
+
+    def _instant_near(self, clock_time, target):
+        # The recorded time of day taken on whichever day (before/on/after) lands closest to
+        # the scheduled start: a 22:00 shift in UTC-8 checks in at 06:00 server time the next day
+        local_day = target.astimezone(self.clock).date()
+        candidates = [datetime.combine(local_day + offset * DAY, clock_time, tzinfo=self.clock) for offset in (-1, 0, 1)]
+        return min(candidates, key=lambda instant: abs(instant - target))
+
+    @staticmethod
+    def _worked_seconds(check_in, check_out):
+        # Check-out earlier in the day than check-in means it happened after midnight
+        seconds = (datetime.combine(ANY_DAY, check_out) - datetime.combine(ANY_DAY, check_in)).total_seconds()
+        return seconds % 86400
@@ -1,10 +1,17 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AttendanceViewSet
+from .views import AttendanceViewSet, ShiftViewSet, attendance_stats_async
 
 router = DefaultRouter()
+# Before the attendance routes, whose detail pattern would otherwise match "shifts/"
+router.register(r'shifts', ShiftViewSet, basename='shift')
 router.register(r'', AttendanceViewSet, basename='attendance')
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
+
+# Under ASGI the stats endpoint is served by its async view (must come before the router)
+if settings.ASYNC_VIEWS:
+    urlpatterns.insert(0, path('stats/', attendance_stats_async, name='attendance-stats'))
\ No newline at end of file
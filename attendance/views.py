@@ -1,11 +1,73 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count
+from django.http import JsonResponse
 from django.utils import timezone
+from django.views.decorators.http import require_GET
 from datetime import datetime
-from .models import Attendance
-from .serializers import AttendanceSerializer
+from .models import Attendance, AttendanceArchive, EmployeeShift, Shift
+from .serializers import AttendanceSerializer, EmployeeShiftSerializer, ShiftSerializer
+from .ingest import AttendanceIngester
+from employee.bulk_import import iter_rows
 from employee.models import Employee
+from employee.filters import active_employee_rows
+from lib_management.async_utils import api_checks, run_in_thread
+
+
+def parse_stats_date(request):
+    # Get date or default to today
+    date_str = request.GET.get('date', str(timezone.now().date()))
+
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return timezone.now().date()
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+    except ValueError:
+        return None
+
+
+def attendance_stats(target_date):
+    # Rows per status for that specific day. Archived days read the archive as well as the
+    # live table: rows written after the day was archived (e.g. a late device import) stay live.
+    tables = [Attendance, AttendanceArchive] if AttendanceArchive.covers(target_date) else [Attendance]
+    counts = {}
+    for model in tables:
+        for row in model.objects.filter(date=target_date).values('status').annotate(n=Count('id')):
+            counts[row['status']] = counts.get(row['status'], 0) + row['n']
+
+    return [
+        {
+            'label': 'Present',
+            'value': counts.get('Present', 0) + counts.get('Late', 0),
+            'icon': 'check',
+            'color': '#22c55e'
+        },
+        {
+            'label': 'Absent',
+            'value': counts.get('Absent', 0),
+            'icon': 'x',
+            'color': '#ef4444'
+        },
+        {
+            'label': 'On Leave',
+            'value': counts.get('On Leave', 0),
+            'icon': 'coffee',
+            'color': '#f59e0b'
+        },
+        {
+            'label': 'Late',
+            'value': counts.get('Late', 0),
+            'icon': 'clock',
+            'color': '#6366f1'
+        }
+    ]
 
 
 class AttendanceViewSet(viewsets.ModelViewSet):
@@ -13,53 +75,39 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     serializer_class = AttendanceSerializer
 
     def get_queryset(self):
-        # Filter by date if provided in URL (e.g. ?date=2024-12-07)
-        queryset = super().get_queryset()
+        # Filter by date if provided in URL (e.g. ?date=2024-12-07 or ?start=2024-01-01&end=2024-03-31)
+        return self.filter_dates(super().get_queryset())
+
+    def filter_dates(self, queryset):
         date_param = self.request.query_params.get('date')
+        start = self.request.query_params.get('start')
+        end = self.request.query_params.get('end')
         if date_param:
             queryset = queryset.filter(date=date_param)
+        if start:
+            queryset = queryset.filter(date__gte=start)
+        if end:
+            queryset = queryset.filter(date__lte=end)
+        if self.action == 'list':
+            queryset = active_employee_rows(queryset, self.request)
         return queryset
 
-    @action(detail=False, methods=['get'])
-    def stats(self, request):
-        # Get date or default to today
-        date_str = request.query_params.get('date', str(timezone.now().date()))
+    def list(self, request, *args, **kwargs):
+        records = list(self.get_queryset())
 
-        try:
-            target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except ValueError:
-            target_date = timezone.now().date()
+        # Ranges that reach back past the archive boundary also read the archive table.
+        # Archived rows are all older than current ones, so appending keeps the -date order.
+        start = parse_date(request.query_params.get('date') or request.query_params.get('start'))
+        if AttendanceArchive.covers(start):
+            archived = AttendanceArchive.objects.select_related('employee').order_by('-date', 'employee__first_name')
+            records += list(self.filter_dates(archived))
+
+        serializer = self.get_serializer(records, many=True)
+        return Response(serializer.data)
 
-        # Filter records for that specific day
-        daily_records = Attendance.objects.filter(date=target_date)
-
-        stats = [
-            {
-                'label': 'Present',
-                'value': daily_records.filter(status__in=['Present', 'Late']).count(),
-                'icon': 'check',
-                'color': '#22c55e'
-            },
-            {
-                'label': 'Absent',
-                'value': daily_records.filter(status='Absent').count(),
-                'icon': 'x',
-                'color': '#ef4444'
-            },
-            {
-                'label': 'On Leave',
-                'value': daily_records.filter(status='On Leave').count(),
-                'icon': 'coffee',
-                'color': '#f59e0b'
-            },
-            {
-                'label': 'Late',
-                'value': daily_records.filter(status='Late').count(),
-                'icon': 'clock',
-                'color': '#6366f1'
-            }
-        ]
-        return Response(stats)
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        return Response(attendance_stats(parse_stats_date(request)))
 
     # Generate attendance for all employees for a given date
     @action(detail=False, methods=['post'])
@@ -70,21 +118,81 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         except ValueError:
             target_date = timezone.now().date()
 
-        employees = Employee.objects.filter(is_active=True)
-        created_count = 0
-
-        for emp in employees:
-            # Check if attendance already exists for this employee on this date
-            exists = Attendance.objects.filter(employee=emp, date=target_date).exists()
-            if not exists:
-                Attendance.objects.create(
-                    employee=emp,
-                    date=target_date,
-                    status='Absent'  # Default to Absent, can be updated via check-in
-                )
-                created_count += 1
+        # One query for who already has a row, one bulk insert for the rest
+        recorded = set(Attendance.objects.filter(date=target_date).values_list('employee_id', flat=True))
+        missing = Employee.objects.filter(is_active=True).exclude(pk__in=recorded).values_list('pk', flat=True)
+        # Default to Absent, can be updated via check-in (no times, so no shift to evaluate)
+        created = Attendance.objects.bulk_create(
+            [Attendance(employee_id=pk, date=target_date, status='Absent') for pk in missing], batch_size=1000)
+        created_count = len(created)
 
         return Response({
             'message': f'Generated attendance records for {created_count} employees.',
             'date': str(target_date)
-        })
\ No newline at end of file
+        })
+
+    # Clock-in device export: /api/attendance/bulk/?input_format=csv|ndjson&dry_run=true
+    # Columns: employee_id (EMP001), date, check_in, check_out, status (optional, e.g. On Leave).
+    # One row per employee and day is created or updated; status and hours follow the shifts.
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        fmt = request.query_params.get('input_format')  # ('format' is taken by DRF)
+        if not fmt:
+            fmt = 'ndjson' if 'json' in (request.content_type or '') else 'csv'
+        if fmt not in ('csv', 'ndjson'):
+            return Response({"error": "input_format must be csv or ndjson"}, status=status.HTTP_400_BAD_REQUEST)
+        if request.stream is None:
+            return Response({"error": "Request body is empty"}, status=status.HTTP_400_BAD_REQUEST)
+
+        ingester = AttendanceIngester(dry_run=request.query_params.get('dry_run') in ('1', 'true', 'True'))
+        lines = (line.decode('utf-8-sig') for line in request.stream)
+        try:
+            report = ingester.run(iter_rows(lines, fmt))
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({"error": f"Could not read file: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
+
+
+class ShiftViewSet(viewsets.ModelViewSet):
+    queryset = Shift.objects.all()
+    serializer_class = ShiftSerializer
+
+    # Put employees on this shift: {"employees": [1, 2, 3], "effective_from": "2024-03-01"}
+    # Existing attendance is not changed; run `manage.py recompute_attendance` for past days.
+    @action(detail=True, methods=['post'])
+    def assign(self, request, pk=None):
+        shift = self.get_object()
+        effective_from = parse_date(request.data.get('effective_from')) or timezone.now().date()
+        try:
+            employee_ids = {int(pk) for pk in request.data.get('employees') or []}
+        except (TypeError, ValueError):
+            return Response({"error": "employees must be a list of ids"}, status=status.HTTP_400_BAD_REQUEST)
+        employee_ids &= set(Employee.all_objects.filter(pk__in=employee_ids).values_list('pk', flat=True))
+        if not employee_ids:
+            return Response({"error": "No known employees given"}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # Re-assigning on the same day replaces that day's assignment
+            EmployeeShift.objects.filter(employee_id__in=employee_ids, effective_from=effective_from).delete()
+            EmployeeShift.objects.bulk_create([
+                EmployeeShift(employee_id=employee_id, shift=shift, effective_from=effective_from)
+                for employee_id in sorted(employee_ids)
+            ])
+        return Response({'shift': shift.pk, 'effective_from': str(effective_from), 'assigned': len(employee_ids)})
+
+    # Assignment history: /api/attendance/shifts/assignments/?employee=3
+    @action(detail=False, methods=['get'])
+    def assignments(self, request):
+        rows = EmployeeShift.objects.select_related('shift')
+        employee = request.query_params.get('employee')
+        if employee:
+            rows = rows.filter(employee_id=employee)
+        return Response(EmployeeShiftSerializer(rows[:500], many=True).data)
+
+
+# Async version of the stats action (served under ASGI)
+@require_GET
+@api_checks()
+async def attendance_stats_async(request):
+    stats = await run_in_thread(attendance_stats, parse_stats_date(request))
+    return JsonResponse(stats, safe=False)
\ No newline at end of file
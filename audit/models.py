@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import models
+
+
+class AuditEntry(models.Model):
+    """
+    One audited change to one record: {field: [old, new]}. Append-only; rows are
+    written in bulk by audit.recorder once the change has committed.
+    """
+    ACTION_CHOICES = [('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')]
+
+    entity_type = models.CharField(max_length=100)  # app_label.model, e.g. employee.employee
+    entity_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, default='update')
+    changes = models.JSONField(default=dict)
+
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    # Kept even if the user is deleted later
+    actor_name = models.CharField(max_length=150, blank=True, default='')
+    path = models.CharField(max_length=200, blank=True, default='')
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            # Newest first per record / per actor; ids grow with time, so they double as the page cursor
+            models.Index(fields=['entity_type', 'entity_id', '-id'], name='audit_entity_idx'),
+            models.Index(fields=['actor', '-id'], name='audit_actor_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.entity_type}#{self.entity_id} by {self.actor_name or 'system'}"
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Audit entries are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Audit entries are append-only")
@@ -0,0 +1,111 @@
+import json
+from contextvars import ContextVar
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .models import AuditEntry
+
+# Entries of the current request (or audit_batch), flushed in one INSERT at the end
+_batch = ContextVar('audit_batch', default=None)
+
+
+def to_json(value):
+    # Dates, decimals, UUIDs... as JSON the way DRF would render them
+    return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+
+
+def snapshot(instance, fields=None):
+    """
+    Current values of a model instance's fields (foreign keys as ids). By default
+    the editable ones: derived columns and timestamps are not worth a diff.
+    """
+    values = {}
+    for field in instance._meta.concrete_fields:
+        if fields is None and field.editable or fields is not None and (field.name in fields or field.attname in fields):
+            values[field.attname] = getattr(instance, field.attname)
+    return to_json(values)
+
+
+def diff(before, after):
+    return {field: [before.get(field), value] for field, value in after.items() if before.get(field) != value}
+
+
+def log(entity_type, entity_id, changes, action='update'):
+    """
+    Queue one audit entry. It is kept only if the surrounding transaction commits
+    (immediately outside one) and written with the rest of the batch.
+    """
+    if not changes and action == 'update':
+        return None
+    entry = AuditEntry(entity_type=entity_type, entity_id=str(entity_id)[:64], action=action, changes=to_json(changes))
+    batch = _batch.get()
+    if batch is None:
+        # Outside a request or audit_batch(): written on its own
+        transaction.on_commit(lambda: AuditEntry.objects.bulk_create([entry]))
+    else:
+        transaction.on_commit(lambda: batch.entries.append(entry))
+    return entry
+
+
+def record(instance, before, action='update'):
+    # Field-level diff of an instance against a snapshot() taken before it was changed
+    after = snapshot(instance, before.keys() if before else None)
+    changes = diff(before or {}, after)
+    return log(instance._meta.label_lower, instance.pk, changes, action)
+
+
+class AuditBatch:
+    def __init__(self, actor=None, path='', ip_address=None):
+        self.actor = actor
+        self.path = path
+        self.ip_address = ip_address
+        self.entries = []
+
+    def __enter__(self):
+        self._token = _batch.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _batch.reset(self._token)
+        self.flush()
+
+    def flush(self):
+        if not self.entries:
+            return
+        actor = self.actor if getattr(self.actor, 'is_authenticated', False) else None
+        for entry in self.entries:
+            entry.actor = actor
+            entry.actor_name = actor.get_username() if actor else ''
+            entry.path = self.path[:200]
+            entry.ip_address = self.ip_address
+        AuditEntry.objects.bulk_create(self.entries)
+        self.entries = []
+
+
+def audit_batch(actor=None, path=''):
+    """Group everything audited in a block (e.g. a management command) into one INSERT."""
+    return AuditBatch(actor=actor, path=path)
+
+
+class AuditMiddleware:
+    """
+    Collects the audit entries of a request and writes them with one bulk_create
+    after the response is built. The actor is read at that point, so users
+    authenticated by DRF (JWT) are attributed correctly.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        batch = AuditBatch(path=request.path, ip_address=request.META.get('REMOTE_ADDR') or None)
+        token = _batch.set(batch)
+        try:
+            response = self.get_response(request)
+        finally:
+            _batch.reset(token)
+        if batch.entries:
+            batch.actor = getattr(request, 'user', None)
+            batch.flush()
+        return response
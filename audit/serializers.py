@@ -0,0 +1,9 @@
+from rest_framework import serializers
+from .models import AuditEntry
+
+
+class AuditEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuditEntry
+        fields = ['id', 'entity_type', 'entity_id', 'action', 'changes', 'actor', 'actor_name',
+                  'path', 'ip_address', 'created_at']
@@ -0,0 +1,45 @@
+from rest_framework import viewsets
+from rest_framework.response import Response
+from .models import AuditEntry
+from .serializers import AuditEntrySerializer
+
+
+class AuditEntryViewSet(viewsets.ReadOnlyModelViewSet):
+    # API Path: /api/audit/?entity=employee.employee&entity_id=12  or  /api/audit/?actor=3
+    # Newest first; next page with ?before=<last id>&limit=100
+    queryset = AuditEntry.objects.all()
+    serializer_class = AuditEntrySerializer
+    MAX_LIMIT = 500
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        # Both filters match an (..., -id) index, so every page is one index range scan
+        if params.get('entity'):
+            queryset = queryset.filter(entity_type=params['entity'].lower())
+            if params.get('entity_id'):
+                queryset = queryset.filter(entity_id=params['entity_id'])
+        if params.get('actor'):
+            queryset = queryset.filter(actor_id=params['actor'])
+        if params.get('action'):
+            queryset = queryset.filter(action=params['action'])
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 100)), 1), self.MAX_LIMIT)
+            before = int(request.query_params['before']) if request.query_params.get('before') else None
+            if request.query_params.get('actor'):
+                int(request.query_params['actor'])
+        except ValueError:
+            return Response({'error': 'limit, before and actor must be numbers'}, status=400)
+
+        queryset = self.get_queryset()
+        if before is not None:
+            queryset = queryset.filter(id__lt=before)
+        entries = list(queryset[:limit])
+        return Response({
+            'results': self.get_serializer(entries, many=True).data,
+            # Pass back as ?before= for the next (older) page
+            'next_before': entries[-1].id if len(entries) == limit else None,
+        })
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.models import Snapshot
+from dashboard.snapshots import CHUNK_SIZE, available_formats, create_snapshot
+
+
+class Command(BaseCommand):
+    help = "Export employees, attendance, payroll and leave requests to a columnar snapshot (Parquet or npz)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=['parquet', 'npz'], help="Default: parquet if pyarrow is installed, else npz")
+        parser.add_argument('--since', help="Snapshot id (or 'latest') to export only rows added after it")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        base = None
+        if options['since'] == 'latest':
+            base = Snapshot.objects.first()
+        elif options['since']:
+            base = Snapshot.objects.filter(pk=options['since']).first()
+            if base is None:
+                raise CommandError(f"Snapshot {options['since']} does not exist.")
+
+        try:
+            snapshot = create_snapshot(fmt=options['format'], since=base, chunk_size=options['chunk_size'])
+        except ValueError as e:
+            raise CommandError(f"{e} Available: {', '.join(available_formats()) or 'none'}.")
+
+        for table, count in snapshot.row_counts.items():
+            self.stdout.write(f"  {table}: {count} rows")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {snapshot.file.name} ({snapshot.size} bytes) as snapshot #{snapshot.pk}."))
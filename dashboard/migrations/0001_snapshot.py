@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Snapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('format', models.CharField(choices=[('parquet', 'Parquet'), ('npz', 'NumPy npz')], max_length=10)),
+                ('file', models.FileField(blank=True, upload_to='snapshots/')),
+                ('watermarks', models.JSONField(default=dict)),
+                ('row_counts', models.JSONField(default=dict)),
+                ('size', models.BigIntegerField(default=0)),
+                ('base', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='increments', to='dashboard.snapshot')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -1,3 +1,27 @@
 from django.db import models
 
-# Create your models here.
+
+class Snapshot(models.Model):
+    # Columnar export of the HR tables for Finance/BI (see dashboard/snapshots.py)
+    FORMAT_CHOICES = [
+        ('parquet', 'Parquet'),
+        ('npz', 'NumPy npz'),
+    ]
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    file = models.FileField(upload_to='snapshots/', blank=True)
+
+    # Incremental snapshots only hold rows added after `base`
+    base = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='increments')
+    # Table name -> highest primary key covered by this snapshot (and its bases)
+    watermarks = models.JSONField(default=dict)
+    row_counts = models.JSONField(default=dict)
+    size = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        kind = f"since #{self.base_id}" if self.base_id else "full"
+        return f"Snapshot #{self.pk} ({self.format}, {kind})"
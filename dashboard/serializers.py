@@ -0,0 +1,8 @@
+from rest_framework import serializers
+from .models import Snapshot
+
+
+class SnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Snapshot
+        fields = ['id', 'created_at', 'format', 'base', 'watermarks', 'row_counts', 'size']
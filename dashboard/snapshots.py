@@ -0,0 +1,192 @@
+import tempfile
+import zipfile
+from datetime import timezone as dt_timezone
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Max
+
+from attendance.models import Attendance, AttendanceArchive
+from employee.models import Employee
+from leaves.models import LeaveRequest
+from payroll.models import Payroll
+
+from .models import Snapshot
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNK_SIZE = 50000
+
+# Table name -> (querysets it is read from, exported fields).
+# Archived attendance keeps its ids, so both attendance tables export as one.
+TABLES = {
+    'employee': ([Employee.all_objects.all()], [
+        'id', 'employee_id', 'first_name', 'last_name', 'gender', 'date_of_birth', 'email', 'phone',
+        'department', 'department_ref', 'designation', 'date_of_joining', 'basic_salary', 'is_active', 'archived_at',
+    ]),
+    'attendance': ([Attendance.objects.all(), AttendanceArchive.objects.all()], [
+        'id', 'employee', 'date', 'check_in', 'check_out', 'status', 'working_hours',
+    ]),
+    'payroll': ([Payroll.objects.all()], [
+        'id', 'employee', 'department', 'basic_salary', 'allowances', 'deductions', 'net_salary', 'status', 'pay_date',
+        'payment_batch',
+    ]),
+    'leave_request': ([LeaveRequest.objects.all()], [
+        'id', 'employee', 'leave_type', 'start_date', 'end_date', 'reason', 'status', 'created_at',
+    ]),
+}
+
+KINDS = {
+    'AutoField': 'int', 'BigAutoField': 'int', 'IntegerField': 'int', 'BigIntegerField': 'int', 'ForeignKey': 'int',
+    'DecimalField': 'decimal', 'BooleanField': 'bool',
+    'DateField': 'date', 'DateTimeField': 'datetime', 'TimeField': 'time',
+}
+
+
+def available_formats():
+    formats = []
+    if pyarrow is not None:
+        formats.append('parquet')
+    if numpy is not None:
+        formats.append('npz')
+    return formats
+
+
+def table_columns(queryset, names):
+    # [(column name, kind, model field)]; foreign keys export their id column
+    columns = []
+    for name in names:
+        field = queryset.model._meta.get_field(name)
+        columns.append((field.attname, KINDS.get(field.get_internal_type(), 'str'), field))
+    return columns
+
+
+def iter_chunks(querysets, columns, after, upto, chunk_size):
+    # Yields {column: [values]} blocks straight from a server-side cursor
+    names = [name for name, _, _ in columns]
+    for queryset in querysets:
+        rows = queryset.filter(pk__gt=after, pk__lte=upto).order_by('pk').values_list(*names)
+        block = []
+        for row in rows.iterator(chunk_size=chunk_size):
+            block.append(row)
+            if len(block) >= chunk_size:
+                yield dict(zip(names, map(list, zip(*block))))
+                block = []
+        if block:
+            yield dict(zip(names, map(list, zip(*block))))
+
+
+class ParquetWriter:
+    # Zip (stored, not recompressed) of one Parquet file per table; each chunk is a row group
+    extension = 'zip'
+
+    def __init__(self, fileobj):
+        self.zip = zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_STORED, allowZip64=True)
+
+    def write_table(self, table, columns, chunks):
+        schema = pyarrow.schema([(name, self._type(kind, field)) for name, kind, field in columns])
+        with self.zip.open(f'{table}.parquet', 'w', force_zip64=True) as entry:
+            with pyarrow.parquet.ParquetWriter(entry, schema, compression='zstd') as writer:
+                rows = 0
+                for chunk in chunks:
+                    writer.write_table(pyarrow.Table.from_pydict(chunk, schema=schema))
+                    rows += len(chunk['id'])
+        return rows
+
+    def close(self):
+        self.zip.close()
+
+    def _type(self, kind, field):
+        if kind == 'decimal':
+            return pyarrow.decimal128(field.max_digits, field.decimal_places)
+        return {
+            'int': pyarrow.int64(), 'bool': pyarrow.bool_(), 'date': pyarrow.date32(),
+            'datetime': pyarrow.timestamp('us', tz='UTC'), 'time': pyarrow.time64('us'),
+        }.get(kind, pyarrow.string())
+
+
+class NpzWriter:
+    """
+    Deflated .npz with one array per table, column and chunk: numpy.load(path)
+    exposes keys like "payroll/net_salary/00000"; concatenate the chunks of a column.
+    Decimals are float64, nullable numbers use NaN, dates/datetimes are datetime64 (NaT for null).
+    """
+    extension = 'npz'
+
+    def __init__(self, fileobj):
+        self.zip = zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+    def write_table(self, table, columns, chunks):
+        rows = 0
+        for number, chunk in enumerate(chunks):
+            for name, kind, field in columns:
+                with self.zip.open(f'{table}/{name}/{number:05d}.npy', 'w', force_zip64=True) as entry:
+                    numpy.save(entry, self._array(chunk[name], kind, field), allow_pickle=False)
+            rows += len(chunk['id'])
+        return rows
+
+    def close(self):
+        self.zip.close()
+
+    def _array(self, values, kind, field):
+        if kind == 'int' and not field.null:
+            return numpy.array(values, dtype='int64')
+        if kind in ('int', 'decimal'):
+            return numpy.array([numpy.nan if value is None else float(value) for value in values], dtype='float64')
+        if kind == 'bool':
+            return numpy.array(values, dtype='bool')
+        if kind == 'date':
+            return numpy.array(values, dtype='datetime64[D]')
+        if kind == 'datetime':
+            # numpy has no time zones: store naive UTC
+            values = [value.astimezone(dt_timezone.utc).replace(tzinfo=None) if value else None for value in values]
+            return numpy.array(values, dtype='datetime64[us]')
+        return numpy.array(['' if value is None else str(value) for value in values], dtype='str')
+
+
+WRITERS = {'parquet': ParquetWriter, 'npz': NpzWriter}
+
+
+def create_snapshot(fmt=None, since=None, chunk_size=CHUNK_SIZE):
+    """
+    Export every table in TABLES to one file in default_storage and record it as a Snapshot.
+    With `since` (a Snapshot), only rows whose primary key is above that snapshot's
+    watermark are exported. Rows edited in place after an export are not picked up
+    again; take a full snapshot to refresh them.
+    """
+    formats = available_formats()
+    fmt = fmt or (formats[0] if formats else None)
+    if fmt not in formats:
+        raise ValueError(f"Snapshot format {fmt!r} is not available (install pyarrow or numpy).")
+
+    previous = since.watermarks if since else {}
+    watermarks, row_counts = {}, {}
+
+    with tempfile.TemporaryFile() as tmp:
+        writer = WRITERS[fmt](tmp)
+        for table, (querysets, fields) in TABLES.items():
+            after = previous.get(table, 0)
+            # Fix the upper bound first so all chunks come from the same range
+            upto = max([queryset.aggregate(top=Max('pk'))['top'] or 0 for queryset in querysets] + [after])
+            columns = table_columns(querysets[0], fields)
+            chunks = iter_chunks(querysets, columns, after, upto, chunk_size)
+            row_counts[table] = writer.write_table(table, columns, chunks)
+            watermarks[table] = upto
+        writer.close()
+
+        with transaction.atomic():
+            snapshot = Snapshot.objects.create(format=fmt, base=since, watermarks=watermarks, row_counts=row_counts)
+            tmp.seek(0)
+            snapshot.file.save(f"snapshot-{snapshot.pk}.{writer.extension}", File(tmp), save=False)
+            snapshot.size = snapshot.file.size
+            snapshot.save(update_fields=['file', 'size'])
+    return snapshot
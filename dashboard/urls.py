@@ -1,7 +1,10 @@
+from django.conf import settings
 from django.urls import path
-from .views import DashboardStatsView
+from .views import DashboardStatsView, SnapshotDownloadView, SnapshotListView, dashboard_stats_async
 
 urlpatterns = [
     # API Path: /api/dashboard/
-    path('', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('', dashboard_stats_async if settings.ASYNC_VIEWS else DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('snapshots/', SnapshotListView.as_view(), name='dashboard-snapshots'),
+    path('snapshots/<int:pk>/download/', SnapshotDownloadView.as_view(), name='dashboard-snapshot-download'),
 ]
\ No newline at end of file
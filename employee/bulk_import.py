@@ -0,0 +1,201 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Department, Employee, EmployeeSearchToken
+from .serializers import EmployeeSerializer
+
+MAX_REPORTED_ERRORS = 1000
+
+
+class EmployeeImportSerializer(EmployeeSerializer):
+    # Uniqueness is checked against one pre-fetch per import instead of a query per field per row
+    class Meta(EmployeeSerializer.Meta):
+        fields = EmployeeSerializer.Meta.fields + ['basic_salary']
+        extra_kwargs = {
+            'employee_id': {'validators': []},
+            'email': {'validators': []},
+        }
+
+
+def iter_csv(lines):
+    for row in csv.DictReader(lines):
+        # Empty cells mean "not provided"
+        yield {key.strip(): value.strip() for key, value in row.items() if key and value not in (None, '')}
+
+
+def iter_ndjson(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_rows(lines, fmt):
+    if fmt == 'ndjson':
+        return iter_ndjson(lines)
+    return iter_csv(lines)
+
+
+class EmployeeImporter:
+    """
+    Validate and upsert employees from an iterator of dict rows, chunk by chunk.
+    Existing employee ids and emails are loaded once; rows are then written with
+    one bulk upsert per chunk keyed on employee_id.
+    """
+
+    def __init__(self, chunk_size=500, dry_run=False):
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.created = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []
+        self.touched_departments = set()
+
+        # Single pre-fetch: employee_id -> department id, email -> employee_id
+        self.known_ids = {}
+        self.email_owner = {}
+        for employee_id, email, department_id in Employee.all_objects.values_list('employee_id', 'email', 'department_ref_id'):
+            self.known_ids[employee_id] = department_id
+            self.email_owner[email.lower()] = employee_id
+        self.departments = {dept.name.lower(): dept for dept in Department.objects.all()}
+
+    def run(self, rows):
+        numbered = enumerate(rows, start=1)
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                break
+            self._import_chunk(chunk)
+
+        if self.touched_departments and not self.dry_run:
+            Department.recount(self.touched_departments)
+        return self.report()
+
+    def report(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'failed': self.error_count,
+            'errors': self.errors,
+            'dry_run': self.dry_run,
+        }
+
+    def _error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'errors': errors})
+
+    def _import_chunk(self, chunk):
+        valid = []
+        chunk_ids = set()
+        chunk_emails = {}
+        for row_number, row in chunk:
+            if not isinstance(row, dict):
+                self._error(row_number, {'non_field_errors': ['Row must be an object']})
+                continue
+            serializer = EmployeeImportSerializer(data=row)
+            if not serializer.is_valid():
+                self._error(row_number, dict(serializer.errors))
+                continue
+
+            data = serializer.validated_data
+            employee_id, email = data['employee_id'], data['email'].lower()
+            if employee_id in chunk_ids:
+                self._error(row_number, {'employee_id': ['Duplicate employee_id in this chunk']})
+                continue
+            owner = chunk_emails.get(email, self.email_owner.get(email))
+            if owner is not None and owner != employee_id:
+                self._error(row_number, {'email': [f'Already used by {owner}']})
+                continue
+            chunk_ids.add(employee_id)
+            chunk_emails[email] = employee_id
+            valid.append(data)
+
+        if not valid:
+            return
+
+        # Group rows by the columns they provide so updates only touch those columns
+        groups = {}
+        for data in valid:
+            groups.setdefault(tuple(sorted(data)), []).append(data)
+
+        with transaction.atomic():
+            for columns, rows in groups.items():
+                self._upsert(columns, rows)
+
+    def _upsert(self, columns, rows):
+        employees = []
+        for data in rows:
+            employee = Employee(**data)
+            employee.department_ref = self._department(data['department'])
+            employee.department = employee.department_ref.name
+            employee.search_text = employee.build_search_text()
+            employees.append(employee)
+
+        new_ids = [emp.employee_id for emp in employees if emp.employee_id not in self.known_ids]
+        if not self.dry_run:
+            # Salaries before the upsert overwrites them: the start of any missing history
+            old_salaries = {}
+            if 'basic_salary' in columns and len(new_ids) < len(employees):
+                old_salaries = dict(Employee.all_objects.filter(
+                    employee_id__in=[emp.employee_id for emp in employees if emp.employee_id in self.known_ids]
+                ).values_list('employee_id', 'basic_salary'))
+            update_fields = [field for field in columns if field != 'employee_id'] + ['department_ref', 'search_text']
+            options = {}
+            if connection.features.supports_update_conflicts_with_target:
+                options['unique_fields'] = ['employee_id']
+            Employee.all_objects.bulk_create(employees, update_conflicts=True, update_fields=update_fields, **options)
+
+            if connection.vendor != 'postgresql':
+                saved = Employee.all_objects.filter(employee_id__in=[emp.employee_id for emp in employees]).only('id', 'search_text')
+                EmployeeSearchToken.reindex(list(saved))
+            self._record_salaries(employees, columns, old_salaries)
+
+        for employee in employees:
+            old_department = self.known_ids.get(employee.employee_id)
+            if old_department:
+                self.touched_departments.add(old_department)
+            self.touched_departments.add(employee.department_ref_id)
+            self.known_ids[employee.employee_id] = employee.department_ref_id
+            self.email_owner[employee.email.lower()] = employee.employee_id
+
+        self.created += len(new_ids)
+        self.updated += len(employees) - len(new_ids)
+
+    def _record_salaries(self, employees, columns, old_salaries):
+        # Payroll prices every month from the salary history: new hires and employees without
+        # one get it started at their joining date, and an imported salary that differs from the
+        # one in effect becomes a new revision from today
+        from payroll.models import SalaryRevision
+        today = timezone.now().date()
+        saved = {emp.employee_id: emp for emp in Employee.all_objects.filter(
+            employee_id__in=[emp.employee_id for emp in employees]).only('id', 'employee_id', 'basic_salary', 'date_of_joining')}
+        pks = [emp.pk for emp in saved.values()]
+        with_history = set(SalaryRevision.objects.filter(employee_id__in=pks).values_list('employee_id', flat=True).distinct())
+        current = SalaryRevision.as_of(today, pks) if 'basic_salary' in columns else {}
+
+        revisions = []
+        for employee in employees:
+            stored = saved[employee.employee_id]
+            previous = old_salaries.get(employee.employee_id, stored.basic_salary)
+            if stored.pk not in with_history:
+                revisions.append(SalaryRevision(employee_id=stored.pk, basic_salary=previous,
+                                                effective_date=stored.date_of_joining, note='Initial salary'))
+            in_effect = current[stored.pk]['basic_salary'] if stored.pk in current else previous
+            if 'basic_salary' in columns and in_effect != employee.basic_salary:
+                revisions.append(SalaryRevision(employee_id=stored.pk, basic_salary=employee.basic_salary,
+                                                effective_date=today, note='bulk import'))
+        SalaryRevision.objects.bulk_create(revisions, batch_size=1000)
+
+    def _department(self, name):
+        key = name.strip().lower()
+        if key not in self.departments:
+            if self.dry_run:
+                return Department(name=name.strip())
+            self.departments[key] = Department.resolve(name)
+        return self.departments[key]
@@ -0,0 +1,13 @@
+def include_archived(request):
+    # ?include_archived=true opts list endpoints back into archived employees
+    return request.query_params.get('include_archived') in ('1', 'true', 'True')
+
+
+def active_employee_rows(queryset, request, field='employee'):
+    """
+    Hide rows of archived employees from a list queryset. Callers already
+    select_related the employee, so the filter reuses that join.
+    """
+    if include_archived(request):
+        return queryset
+    return queryset.filter(**{f'{field}__is_active': True})
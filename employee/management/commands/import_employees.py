@@ -0,0 +1,39 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employee.bulk_import import EmployeeImporter, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk create/update employees from a CSV or NDJSON file ('-' reads stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension')
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, write nothing')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+
+        try:
+            handle = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        except OSError as e:
+            raise CommandError(f"Cannot open {path}: {e}")
+
+        with handle:
+            try:
+                importer = EmployeeImporter(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+                report = importer.run(iter_rows(handle, fmt))
+            except ValueError as e:
+                raise CommandError(f"Could not read {path}: {e}")
+
+        for error in report['errors']:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'], default=str)}")
+        summary = f"created {report['created']}, updated {report['updated']}, failed {report['failed']}"
+        if report['dry_run']:
+            summary += " (dry run, nothing written)"
+        self.stdout.write(self.style.SUCCESS(summary))
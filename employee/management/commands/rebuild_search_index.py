@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from employee.models import Employee, EmployeeSearchToken
+
+
+class Command(BaseCommand):
+    help = "Recompute Employee.search_text and, on MySQL/SQLite, the prefix token table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        use_tokens = connection.vendor != 'postgresql'
+        batch, total = [], 0
+
+        for employee in Employee.all_objects.order_by('pk').iterator(chunk_size=batch_size):
+            employee.search_text = employee.build_search_text()
+            batch.append(employee)
+            if len(batch) >= batch_size:
+                total += self._flush(batch, use_tokens)
+                batch = []
+        if batch:
+            total += self._flush(batch, use_tokens)
+
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {total} employees."))
+
+    def _flush(self, batch, use_tokens):
+        with transaction.atomic():
+            Employee.all_objects.bulk_update(batch, ['search_text'])
+            if use_tokens:
+                EmployeeSearchToken.reindex(batch)
+        return len(batch)
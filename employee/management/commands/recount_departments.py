@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from employee.models import Department
+
+
+class Command(BaseCommand):
+    help = "Rebuild Department headcount/active counters from the employee table."
+
+    def handle(self, *args, **options):
+        updated = Department.recount()
+        self.stdout.write(self.style.SUCCESS(f"Recounted {updated} departments."))
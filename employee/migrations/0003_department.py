@@ -0,0 +1,49 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_departments(apps, schema_editor):
+    Department = apps.get_model('employee', 'Department')
+    Employee = apps.get_model('employee', 'Employee')
+
+    # One Department per distinct name, ignoring case and surrounding spaces
+    raw_names = {}
+    for name in Employee.objects.values_list('department', flat=True).distinct():
+        raw_names.setdefault((name or '').strip().lower(), []).append(name)
+
+    for raw in raw_names.values():
+        department = Department.objects.create(name=(raw[0] or '').strip())
+        Employee.objects.filter(department__in=raw).update(department_ref=department, department=department.name)
+        department.headcount = Employee.objects.filter(department_ref=department).count()
+        department.active_count = Employee.objects.filter(department_ref=department, is_active=True).count()
+        department.save(update_fields=['headcount', 'active_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0002_employee_basic_salary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Department',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('headcount', models.IntegerField(default=0)),
+                ('active_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='department_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='employees', to='employee.department'),
+        ),
+        migrations.RunPython(populate_departments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:23
+
+import django.db.models.deletion
+import re
+
+from django.db import migrations, models
+
+SEARCH_INDEX_SQL = "CREATE INDEX IF NOT EXISTS employee_search_gin ON employee_employee USING gin (to_tsvector('simple', search_text))"
+
+
+def populate_search(apps, schema_editor):
+    Employee = apps.get_model('employee', 'Employee')
+    EmployeeSearchToken = apps.get_model('employee', 'EmployeeSearchToken')
+    postgres = schema_editor.connection.vendor == 'postgresql'
+
+    for employee in Employee.objects.iterator(chunk_size=1000):
+        parts = [employee.first_name, employee.last_name, employee.employee_id,
+                 employee.email, employee.designation, employee.department]
+        employee.search_text = ' '.join(part for part in parts if part).lower()
+        Employee.objects.filter(pk=employee.pk).update(search_text=employee.search_text)
+        if not postgres:
+            EmployeeSearchToken.objects.bulk_create([
+                EmployeeSearchToken(employee_id=employee.pk, token=token[:100])
+                for token in set(re.findall(r'\w+', employee.search_text))
+            ])
+
+    if postgres:
+        schema_editor.execute(SEARCH_INDEX_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS employee_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0003_department'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.CreateModel(
+            name='EmployeeSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(db_index=True, max_length=100)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='employee.employee')),
+            ],
+        ),
+        migrations.RunPython(populate_search, drop_search_index),
+    ]
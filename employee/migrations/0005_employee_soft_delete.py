@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0004_employee_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['department_ref'], name='employee_active_dept_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['date_of_joining'], name='employee_active_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['last_name', 'first_name'], name='employee_active_name_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-19 19:04
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def rename_case_duplicates(apps, schema_editor):
+    # Departments created concurrently as e.g. "Sales" and "sales" keep their rows (payroll and
+    # summaries point at them) but get distinct names; employees move to the oldest one on their next save
+    Department = apps.get_model('employee', 'Department')
+    seen = set()
+    for department in Department.objects.order_by('id'):
+        key = department.name.lower()
+        if key in seen:
+            suffix = 2
+            while f'{key} ({suffix})' in seen:
+                suffix += 1
+            department.name = f'{department.name} ({suffix})'
+            department.save(update_fields=['name'])
+            key = department.name.lower()
+        seen.add(key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0006_employee_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='department',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='department_name_ci_uniq'),
+        ),
+    ]
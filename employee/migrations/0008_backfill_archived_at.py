@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-19 19:11
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_archived_at(apps, schema_editor):
+    # Employees deactivated before 0005 added archived_at have no archive time; the row records
+    # no earlier one, so they count as archived when this runs (dashboard "left" trend, payroll cohorts)
+    Employee = apps.get_model('employee', 'Employee')
+    Employee.objects.filter(is_active=False, archived_at__isnull=True).update(archived_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0007_department_name_case_insensitive'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_archived_at, migrations.RunPython.noop),
+    ]
@@ -1,26 +1,223 @@
-from django.db import models
+import re
+
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+SEARCH_TOKEN_RE = re.compile(r'\w+')
+
+
+def search_tokens(text):
+    return SEARCH_TOKEN_RE.findall((text or '').lower())
+
+
+class Department(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    # Maintained by Employee.save()/delete() (and recount() after bulk writes),
+    # so breakdowns read one row per department instead of grouping employees
+    headcount = models.IntegerField(default=0)
+    active_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['name']
+        constraints = [
+            # "Sales" and "sales" are the same department, also when created concurrently
+            models.UniqueConstraint(Lower('name'), name='department_name_ci_uniq'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def resolve(cls, name):
+        # Case-insensitive match so "Sales" and "sales " land in the same department
+        name = (name or '').strip()
+        department = cls.objects.filter(name__iexact=name).first()
+        if department is None:
+            try:
+                with transaction.atomic():
+                    department = cls.objects.create(name=name)
+            except IntegrityError:
+                # Someone else created it (in any case) in the meantime
+                department = cls.objects.get(name__iexact=name)
+        return department
+
+    @classmethod
+    def bump(cls, department_id, headcount=0, active=0):
+        if department_id and (headcount or active):
+            cls.objects.filter(pk=department_id).update(
+                headcount=F('headcount') + headcount,
+                active_count=F('active_count') + active,
+            )
+
+    @classmethod
+    def recount(cls, department_ids=None):
+        # Rebuild counters from the employee table (bulk imports, repairs)
+        departments = cls.objects.all()
+        if department_ids is not None:
+            departments = departments.filter(pk__in=department_ids)
+        counts = {
+            row['department_ref']: row
+            for row in Employee.all_objects.filter(department_ref__in=departments).values('department_ref').annotate(
+                total=Count('id'), active=Count('id', filter=Q(is_active=True)))
+        }
+        updated = []
+        for department in departments:
+            row = counts.get(department.id, {})
+            department.headcount = row.get('total', 0)
+            department.active_count = row.get('active', 0)
+            updated.append(department)
+        cls.objects.bulk_update(updated, ['headcount', 'active_count'])
+        return len(updated)
+
+    @classmethod
+    def total_active(cls):
+        return cls.objects.aggregate(total=Sum('active_count'))['total'] or 0
+
+
+# Employee fields Department.headcount/active_count depend on
+COUNTED_FIELDS = {'department', 'department_ref', 'is_active'}
+
+
+class ActiveEmployeeManager(models.Manager):
+    # Archived (soft-deleted) employees are hidden unless you ask Employee.all_objects
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
 
 class Employee(models.Model):
+    # Login account of this employee, if they have one
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='employee')
+
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
     employee_id = models.CharField(max_length=20, unique=True)
-    
+
     GENDER_CHOICES = [('Male', 'Male'), ('Female', 'Female'), ('Other', 'Other')]
     gender = models.CharField(max_length=10, choices=GENDER_CHOICES)
-    
+
     date_of_birth = models.DateField(null=True, blank=True)
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=15)
     address = models.TextField(blank=True, null=True)
-    
+
     department = models.CharField(max_length=100)
+    # Normalized department; the name above is kept in sync for existing API consumers
+    department_ref = models.ForeignKey(Department, on_delete=models.PROTECT, null=True, blank=True, related_name='employees')
     designation = models.CharField(max_length=100)
     date_of_joining = models.DateField()
-    
+
     # === NEW FIELD ADDED FOR PAYROLL ===
-    basic_salary = models.DecimalField(max_digits=10, decimal_places=2, default=5000.00) 
-    
+    basic_salary = models.DecimalField(max_digits=10, decimal_places=2, default=5000.00)
+
     is_active = models.BooleanField(default=True) # To soft delete instead of hard delete
+    archived_at = models.DateTimeField(null=True, blank=True)
+
+    # Lower-cased name/id/email/designation/department, indexed for search (see employee/search.py)
+    search_text = models.TextField(blank=True, default='', editable=False)
+
+    objects = ActiveEmployeeManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Partial indexes: only active rows, which is what almost every query reads
+            models.Index(fields=['department_ref'], condition=Q(is_active=True), name='employee_active_dept_idx'),
+            models.Index(fields=['date_of_joining'], condition=Q(is_active=True), name='employee_active_joined_idx'),
+            models.Index(fields=['last_name', 'first_name'], condition=Q(is_active=True), name='employee_active_name_idx'),
+        ]
+
+    def build_search_text(self):
+        parts = [self.first_name, self.last_name, self.employee_id, self.email, self.designation, self.department]
+        return ' '.join(part for part in parts if part).lower()
+
+    def save(self, *args, **kwargs):
+        # Partial saves that leave department and is_active alone must not move the counters
+        update_fields = kwargs.get('update_fields')
+        moves_counters = update_fields is None or bool(COUNTED_FIELDS & set(update_fields))
+        if update_fields is not None and moves_counters:
+            # The columns derived in step 1 are saved with the fields they come from
+            kwargs['update_fields'] = set(update_fields) | COUNTED_FIELDS | {'archived_at'}
+
+        with transaction.atomic():
+            # 1. Point department_ref at the Department matching the free-text name
+            if self.department_ref_id is None or self.department_ref.name.lower() != self.department.strip().lower():
+                self.department_ref = Department.resolve(self.department)
+            self.department = self.department_ref.name
+            self.search_text = self.build_search_text()
+            if self.is_active:
+                self.archived_at = None
+            elif self.archived_at is None:
+                self.archived_at = timezone.now()
+
+            # 2. Lock the stored row to see what the counters currently reflect (hire/transfer/deactivation)
+            old = None
+            if self.pk:
+                old = Employee.all_objects.select_for_update().filter(pk=self.pk).values('department_ref_id', 'is_active', 'user_id').first()
+
+            super().save(*args, **kwargs)
+            # Linked user changed, or the employee was archived/restored
+            old_user_id = old['user_id'] if old else None
+            if old_user_id != self.user_id or (old and old['is_active'] != self.is_active):
+                user_ids = [old_user_id, self.user_id]
+                transaction.on_commit(lambda: forget_user_employee(user_ids))
+
+            # 3. Move this employee between department counters
+            if moves_counters:
+                if old and old['department_ref_id'] == self.department_ref_id:
+                    Department.bump(self.department_ref_id, active=int(self.is_active) - int(old['is_active']))
+                else:
+                    if old:
+                        Department.bump(old['department_ref_id'], headcount=-1, active=-int(old['is_active']))
+                    Department.bump(self.department_ref_id, headcount=1, active=int(self.is_active))
+
+            # 4. Postgres searches search_text through its GIN index; other backends use the token table
+            if connection.vendor != 'postgresql':
+                EmployeeSearchToken.reindex([self])
+
+    def archive(self):
+        # Soft delete: keeps attendance/payroll/leave history and avoids cascading deletes
+        self.is_active = False
+        self.save()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            old = Employee.all_objects.select_for_update().filter(pk=self.pk).values('department_ref_id', 'is_active', 'user_id').first()
+            result = super().delete(*args, **kwargs)
+            if old:
+                Department.bump(old['department_ref_id'], headcount=-1, active=-int(old['is_active']))
+                if old['user_id']:
+                    transaction.on_commit(lambda: forget_user_employee([old['user_id']]))
+            return result
 
     def __str__(self):
-        return f"{self.first_name} {self.last_name} ({self.employee_id})"
\ No newline at end of file
+        return f"{self.first_name} {self.last_name} ({self.employee_id})"
+
+
+def forget_user_employee(user_ids):
+    # Drop cached user -> employee links (settings_app caches them next to the settings)
+    from settings_app.models import EmployeeSettings
+    EmployeeSettings.forget_users([user_id for user_id in user_ids if user_id])
+
+
+class EmployeeSearchToken(models.Model):
+    # Prefix index for search on MySQL/SQLite: one row per distinct word of Employee.search_text
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=100, db_index=True)
+
+    def __str__(self):
+        return self.token
+
+    @classmethod
+    def reindex(cls, employees):
+        employees = [emp for emp in employees if emp.pk]
+        cls.objects.filter(employee__in=employees).delete()
+        tokens = [
+            cls(employee=emp, token=token[:100])
+            for emp in employees
+            for token in set(search_tokens(emp.search_text))
+        ]
+        cls.objects.bulk_create(tokens, batch_size=1000)
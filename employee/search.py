@@ -0,0 +1,62 @@
+from django.db import connection
+from django.db.models import BooleanField, Count, F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Employee, EmployeeSearchToken, search_tokens
+
+# Must match the expression of the employee_search_gin index (migration 0004)
+TSVECTOR_SQL = "to_tsvector('simple', search_text)"
+
+
+def search_employees(query, offset=0, limit=20):
+    """
+    Ranked search over name, employee id, email, designation and department.
+    Every word of the query must match the start of a word on the employee,
+    so partial input ("jo sm") works for type-ahead.
+    Returns (total_matches, [Employee with .rank]).
+    """
+    terms = search_tokens(query)[:8]
+    if not terms:
+        return 0, []
+    if connection.vendor == 'postgresql':
+        return _search_postgres(terms, offset, limit)
+    return _search_tokens(terms, offset, limit)
+
+
+def _search_postgres(terms, offset, limit):
+    # Terms are \w+ only, so they are safe inside a tsquery; ':*' makes each a prefix match
+    tsquery = ' & '.join(f"{term}:*" for term in terms)
+    matches = RawSQL(f"{TSVECTOR_SQL} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+    rank = RawSQL(f"ts_rank({TSVECTOR_SQL}, to_tsquery('simple', %s))", [tsquery], output_field=FloatField())
+
+    employees = Employee.objects.filter(matches)
+    total = employees.count()
+    results = list(employees.annotate(rank=rank).order_by('-rank', 'first_name', 'last_name')[offset:offset + limit])
+    return total, results
+
+
+def _search_tokens(terms, offset, limit):
+    # MySQL/SQLite: prefix lookups on the indexed token column, grouped per employee
+    any_term = Q()
+    per_term = {}
+    for i, term in enumerate(terms):
+        any_term |= Q(token__startswith=term)
+        per_term[f'hit_{i}'] = Count('id', filter=Q(token__startswith=term))
+        # Whole-word matches rank above prefix matches
+        per_term[f'exact_{i}'] = Count('id', filter=Q(token=term))
+
+    rank = sum((F(f'hit_{i}') + 2 * F(f'exact_{i}') for i in range(len(terms))), Value(0))
+    grouped = (EmployeeSearchToken.objects.filter(any_term, employee__is_active=True)
+               .values('employee_id').annotate(**per_term)
+               .filter(**{f'hit_{i}__gt': 0 for i in range(len(terms))}))
+    total = grouped.count()
+    page = list(grouped.annotate(rank=rank).order_by('-rank', 'employee_id')[offset:offset + limit]) if total else []
+
+    employees = Employee.objects.in_bulk([row['employee_id'] for row in page])
+    results = []
+    for row in page:
+        employee = employees.get(row['employee_id'])
+        if employee is not None:
+            employee.rank = row['rank']
+            results.append(employee)
+    return total, results
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Employee
+from rest_framework.validators import UniqueValidator
+from .models import Department, Employee
 
 class EmployeeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -9,11 +10,22 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'first_name', 'last_name', 'employee_id', 
             'gender', 'date_of_birth', 
             'email', 'phone', 'address', 
-            'department', 'designation', 'date_of_joining', 'is_active'
+            'department', 'department_ref', 'designation', 'date_of_joining', 'is_active', 'user'
         ]
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'department_ref']
+        # Archived employees still own their id and email
+        extra_kwargs = {
+            'employee_id': {'validators': [UniqueValidator(queryset=Employee.all_objects.all())]},
+            'email': {'validators': [UniqueValidator(queryset=Employee.all_objects.all())]},
+        }
 
     def validate_employee_id(self, value):
         if "EMP" not in value.upper():
             raise serializers.ValidationError("Employee ID must contain 'EMP'")
         return value
+
+
+class DepartmentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Department
+        fields = ['id', 'name', 'headcount', 'active_count']
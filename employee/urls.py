@@ -1,6 +1,9 @@
 from django.urls import path
-from .views import EmployeeProfileView
+from .views import DepartmentListView, EmployeeBulkImportView, EmployeeProfileView, EmployeeSearchView
 
 urlpatterns = [
     path('employee-profile/', EmployeeProfileView.as_view(), name='employee-profile'),
+    path('departments/', DepartmentListView.as_view(), name='departments'),
+    path('search/', EmployeeSearchView.as_view(), name='employee-search'),
+    path('bulk-import/', EmployeeBulkImportView.as_view(), name='employee-bulk-import'),
 ]
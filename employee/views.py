@@ -1,19 +1,28 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Employee
-from .serializers import EmployeeSerializer
+from .models import Department, Employee
+from .serializers import DepartmentSerializer, EmployeeSerializer
+from .search import search_employees
+from .bulk_import import EmployeeImporter, iter_rows
+from .filters import include_archived
+from audit.recorder import record, snapshot
 
 class EmployeeProfileView(APIView):
     
     def get(self, request):
         emp_id = request.query_params.get('employee_id')
         dept = request.query_params.get('department')
-        employees = Employee.objects.all()
+        dept_id = request.query_params.get('department_id')
+        employees = Employee.all_objects.all() if include_archived(request) else Employee.objects.all()
         if emp_id:
             employees = employees.filter(employee_id=emp_id)
+        if dept_id:
+            employees = employees.filter(department_ref_id=dept_id)
         if dept:
-            employees = employees.filter(department__icontains=dept)
+            # Match names on the small department table, then use the indexed foreign key
+            dept_ids = list(Department.objects.filter(name__icontains=dept).values_list('id', flat=True))
+            employees = employees.filter(department_ref__in=dept_ids)
         serializer = EmployeeSerializer(employees, many=True)
         return Response(serializer.data)
 
@@ -32,12 +41,15 @@ class EmployeeProfileView(APIView):
         if not pk:
             return Response({"error": "ID is required for update"}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            employee = Employee.objects.get(id=pk)
+            # Archived employees can be edited (and restored with is_active=true)
+            employee = Employee.all_objects.get(id=pk)
         except Employee.DoesNotExist:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
         serializer = EmployeeSerializer(employee, data=request.data, partial=True)
         if serializer.is_valid():
+            before = snapshot(employee)
             serializer.save()
+            record(employee, before)
             return Response({"message": "Employee profile updated successfully"})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -46,8 +58,64 @@ class EmployeeProfileView(APIView):
         if not pk:
             return Response({"error": "ID is required for deletion"}, status=status.HTTP_400_BAD_REQUEST)
         try:
+            # Archive instead of deleting: a hard delete cascades through attendance, payroll and leaves
             employee = Employee.objects.get(id=pk)
-            employee.delete()
-            return Response({"message": "Employee profile deleted successfully"})
+            employee.archive()
+            return Response({"message": "Employee profile archived successfully"})
         except Employee.DoesNotExist:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
+
+
+class DepartmentListView(APIView):
+
+    def get(self, request):
+        departments = Department.objects.all()
+        serializer = DepartmentSerializer(departments, many=True)
+        return Response(serializer.data)
+
+
+class EmployeeSearchView(APIView):
+    # API Path: /api/employee/search/?q=jo&page=1&page_size=10
+    MAX_PAGE_SIZE = 100
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 20)), 1), self.MAX_PAGE_SIZE)
+        except ValueError:
+            return Response({"error": "page and page_size must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        total, employees = search_employees(query, offset=(page - 1) * page_size, limit=page_size)
+        results = EmployeeSerializer(employees, many=True).data
+        for item, employee in zip(results, employees):
+            item['rank'] = employee.rank
+        return Response({
+            'count': total,
+            'page': page,
+            'page_size': page_size,
+            'results': results,
+        })
+
+
+class EmployeeBulkImportView(APIView):
+    # API Path: /api/employee/bulk-import/?input_format=csv|ndjson&dry_run=true
+    # Body is the raw CSV (with a header row) or NDJSON file, read line by line
+
+    def post(self, request):
+        fmt = request.query_params.get('input_format')  # ('format' is taken by DRF)
+        if not fmt:
+            fmt = 'ndjson' if 'json' in (request.content_type or '') else 'csv'
+        if fmt not in ('csv', 'ndjson'):
+            return Response({"error": "input_format must be csv or ndjson"}, status=status.HTTP_400_BAD_REQUEST)
+        if request.stream is None:
+            return Response({"error": "Request body is empty"}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run') in ('1', 'true', 'True')
+        lines = (line.decode('utf-8-sig') for line in request.stream)
+        try:
+            report = EmployeeImporter(dry_run=dry_run).run(iter_rows(lines, fmt))
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({"error": f"Could not read file: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(report, status=status.HTTP_200_OK)
@@ -0,0 +1,22 @@
+# Gunicorn settings (loaded by the Procfile)
+#
+# Each worker thread keeps its own persistent database connection (CONN_MAX_AGE).
+# Total connections to the database are therefore roughly:
+#
+#     WEB_CONCURRENCY (workers) x GUNICORN_THREADS (threads per worker)
+#
+# Keep that product below the managed database's connection limit.
+#
+# ASGI: set GUNICORN_APP=lib_management.asgi:application and
+# GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker. The dashboard and stats
+# endpoints then run as async views, and a slow request no longer holds a whole
+# worker. GUNICORN_THREADS is ignored by uvicorn workers; the async views use
+# Django's thread pool for their queries instead.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+keepalive = 5
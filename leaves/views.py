@@ -2,9 +2,13 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction
 from .models import LeaveRequest
 from employee.models import Employee # Make sure to import Employee
 from .serializers import LeaveRequestSerializer
+from employee.filters import active_employee_rows
+from notifications.outbox import notify
+from audit.recorder import record, snapshot
 
 class LeaveRequestView(APIView):
     
@@ -19,6 +23,7 @@ class LeaveRequestView(APIView):
             leaves = leaves.filter(status=status_filter)
         if emp_id:
             leaves = leaves.filter(employee__employee_id=emp_id)
+        leaves = active_employee_rows(leaves, request)
 
         serializer = LeaveRequestSerializer(leaves, many=True)
         return Response(serializer.data)
@@ -69,7 +74,17 @@ class LeaveRequestView(APIView):
             
         serializer = LeaveRequestSerializer(leave, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            old_status = leave.status
+            before = snapshot(leave)
+            with transaction.atomic():
+                leave = serializer.save()
+                record(leave, before)
+                # Tell the employee about the decision (queued; sent by the notification worker)
+                if leave.status != old_status and leave.status in ('Approved', 'Rejected'):
+                    notify(f'leave.{leave.status.lower()}', f"Your {leave.leave_type} leave was {leave.status.lower()}",
+                           [leave.employee_id],
+                           body=f"{leave.leave_type}: {leave.start_date} to {leave.end_date} ({leave.days} days) - {leave.status}",
+                           payload={'leave_request': leave.pk})
             return Response({"message": "Leave request updated successfully"})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
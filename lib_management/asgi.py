@@ -0,0 +1,19 @@
+"""
+ASGI config for lib_management project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Serving through this entry point also switches the dashboard and stats
+endpoints to their async views (see ASYNC_VIEWS in settings).
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "lib_management.settings")
+os.environ.setdefault("ASYNC_VIEWS", "True")
+
+application = get_asgi_application()
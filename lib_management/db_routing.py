@@ -0,0 +1,83 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.deprecation import MiddlewareMixin
+
+# Alias that reads in the current request should use (None = primary)
+_read_alias = ContextVar('read_alias', default=None)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE = 'hr_primary_pin'
+
+
+def replica_alias():
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', None)
+    if alias and alias in settings.DATABASES:
+        return alias
+    return None
+
+
+def use_primary(view):
+    """Opt a view function, view method or whole view class out of replica reads."""
+    view.use_primary_db = True
+    return view
+
+
+class ReplicaRouter:
+    """Send reads to the replica while a request has asked for it, everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Always explicit: rows loaded from the replica must still be saved on the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary and replica hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is kept in sync by the database itself
+        return db != replica_alias()
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Route GET/HEAD requests to the replica unless the view opted out with
+    @use_primary, or the client wrote something within the last
+    REPLICA_PIN_SECONDS (read-after-write goes to the primary).
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        alias = replica_alias()
+        if not alias or request.method not in SAFE_METHODS:
+            return None
+        if request.COOKIES.get(PIN_COOKIE) or _wants_primary(request, view_func):
+            return None
+        _read_alias.set(alias)
+        return None
+
+    def process_response(self, request, response):
+        _read_alias.set(None)
+        pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 0)
+        if replica_alias() and pin_seconds and request.method not in SAFE_METHODS:
+            response.set_cookie(PIN_COOKIE, '1', max_age=pin_seconds, httponly=True, samesite='Lax')
+        return response
+
+
+def _wants_primary(request, view_func):
+    if getattr(view_func, 'use_primary_db', False):
+        return True
+
+    # DRF views: check the class, then the handler method (or viewset action) for this HTTP method
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return False
+    if getattr(view_class, 'use_primary_db', False):
+        return True
+    actions = getattr(view_func, 'actions', None) or {}
+    handler_name = actions.get(request.method.lower(), request.method.lower())
+    handler = getattr(view_class, handler_name, None)
+    return getattr(handler, 'use_primary_db', False)
@@ -41,6 +41,8 @@ INSTALLED_APPS = [
     'onboarding',
     'assets',
     'settings_app',
+    'notifications',
+    'audit',
 ]
 
 # Middleware
@@ -52,6 +54,9 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Buffers the request's audit entries and writes them in one INSERT (audit/recorder.py)
+    'audit.recorder.AuditMiddleware',
+    'lib_management.db_routing.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -75,12 +80,26 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'lib_management.wsgi.application'
+ASGI_APPLICATION = 'lib_management.asgi.application'
+
+# Serve dashboard/stats endpoints with async views (set automatically by asgi.py)
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "False") == "True"
 
 # DATABASE SETTINGS
 # Logic: If 'DATABASE_URL' exists (Render), use it. Otherwise use local MySQL.
+# Connections are kept open between requests (CONN_MAX_AGE) and pinged before
+# reuse (CONN_HEALTH_CHECKS), so a request only pays the TCP/TLS handshake when
+# its thread has no live connection yet.
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", "600"))
+DB_CONN_HEALTH_CHECKS = os.environ.get("DB_CONN_HEALTH_CHECKS", "True") == "True"
+
 if os.environ.get('DATABASE_URL'):
     DATABASES = {
-        'default': dj_database_url.config(conn_max_age=600, ssl_require=True)
+        'default': dj_database_url.config(
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=DB_CONN_HEALTH_CHECKS,
+            ssl_require=True,
+        )
     }
 else:
     DATABASES = {
@@ -91,9 +110,30 @@ else:
             'PASSWORD': os.environ.get("DB_PASSWORD", "Kishore@18"),
             'HOST': os.environ.get("DB_HOST", "localhost"),
             'PORT': os.environ.get("DB_PORT", "3306"),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
         }
     }
 
+# READ REPLICA
+# Set DATABASE_REPLICA_URL to send dashboard/stats/list GETs to a replica.
+# Writes, and GETs within REPLICA_PIN_SECONDS of a client's last write, stay on
+# the primary. Views can opt out with lib_management.db_routing.use_primary.
+REPLICA_DATABASE_ALIAS = os.environ.get("REPLICA_DATABASE_ALIAS", "replica")
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "5"))
+
+if os.environ.get('DATABASE_REPLICA_URL'):
+    DATABASES[REPLICA_DATABASE_ALIAS] = dj_database_url.parse(
+        os.environ['DATABASE_REPLICA_URL'],
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS,
+        ssl_require=os.environ.get("DB_REPLICA_SSL", "True") == "True",
+    )
+    # Tests read their own writes: point the replica at the test primary
+    DATABASES[REPLICA_DATABASE_ALIAS]['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['lib_management.db_routing.ReplicaRouter']
+
 # Password Validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -115,12 +155,83 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # ADDED: This allows Render to serve your static files efficiently
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Uploaded/generated files (analytics snapshots)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+
+# Payslip PDFs (manage.py render_payslips); workers default to the CPU count
+PAYSLIP_COMPANY_NAME = os.environ.get('PAYSLIP_COMPANY_NAME', 'simpleHr')
+PAYSLIP_FONT_PATH = os.environ.get('PAYSLIP_FONT_PATH') or None
+PAYSLIP_WORKERS = int(os.environ.get('PAYSLIP_WORKERS', 0)) or None
+
+# Resume uploads (text extraction runs in manage.py process_resumes)
+RESUME_MAX_BYTES = int(os.environ.get('RESUME_MAX_BYTES', 5 * 1024 * 1024))
+RESUME_WORKERS = int(os.environ.get('RESUME_WORKERS', 0)) or None
+
+# Timezone attendance check_in/check_out times are recorded in (defaults to TIME_ZONE);
+# shifts are evaluated in each employee's own timezone from their settings
+ATTENDANCE_CLOCK_TIMEZONE = os.environ.get('ATTENDANCE_CLOCK_TIMEZONE') or None
+
+# Notifications (sent by manage.py send_notifications, never from a request).
+# Email goes through EMAIL_BACKEND; locally run a debug SMTP server on port 1025:
+#   python -m aiosmtpd -n -l localhost:1025
+NOTIFICATION_BACKENDS = {
+    'email': os.environ.get('NOTIFICATION_EMAIL_BACKEND', 'notifications.backends.EmailBackend'),
+    'push': os.environ.get('NOTIFICATION_PUSH_BACKEND', 'notifications.backends.FileBackend'),
+}
+NOTIFICATION_FILE_PATH = os.environ.get('NOTIFICATION_FILE_PATH', os.path.join(BASE_DIR, 'notifications.jsonl'))
+NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', 6))
+NOTIFICATION_RETRY_BASE_SECONDS = int(os.environ.get('NOTIFICATION_RETRY_BASE_SECONDS', 30))
+NOTIFICATION_RETRY_MAX_SECONDS = int(os.environ.get('NOTIFICATION_RETRY_MAX_SECONDS', 3600))
+NOTIFICATION_LEASE_SECONDS = int(os.environ.get('NOTIFICATION_LEASE_SECONDS', 300))
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 1025))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False') == 'True'
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'simpleHr <noreply@localhost>')
+
 # JWT Authentication
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    ]
+        # simplejwt's JWTAuthentication with cached users and blacklist (library/authentication.py)
+        'library.authentication.CachedJWTAuthentication',
+    ],
+    # Token buckets for the password views (library/throttling.py): "5/min" = burst of 5, refilling 5 per minute
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('LOGIN_RATE_PER_IP', '30/min'),
+        'login_user': os.environ.get('LOGIN_RATE_PER_USER', '5/min'),
+    },
+}
+
+# Login throttle buckets live in their own cache so clearing the default cache does not reset them.
+# Local memory is per process; point THROTTLE_CACHE_LOCATION at memcached to share them across workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'throttle': {
+        'BACKEND': os.environ.get('THROTTLE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('THROTTLE_CACHE_LOCATION', 'login-throttle'),
+    },
+    # Employee settings, written through on every save. Local memory is per process, so other
+    # workers see a change within SETTINGS_CACHE_TTL; point it at memcached to share one copy.
+    'settings': {
+        'BACKEND': os.environ.get('SETTINGS_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('SETTINGS_CACHE_LOCATION', 'employee-settings'),
+    },
 }
+THROTTLE_CACHE_ALIAS = 'throttle'
+SETTINGS_CACHE_ALIAS = 'settings'
+SETTINGS_CACHE_TTL = int(os.environ.get('SETTINGS_CACHE_TTL', 300))
+
+# Per-process auth caches: users are re-read at most every AUTH_USER_CACHE_TTL seconds,
+# new blacklist entries (logouts in other workers) are picked up every JWT_BLACKLIST_SYNC_SECONDS
+AUTH_USER_CACHE_SIZE = int(os.environ.get('AUTH_USER_CACHE_SIZE', 10000))
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 60))
+JWT_BLACKLIST_SYNC_SECONDS = int(os.environ.get('JWT_BLACKLIST_SYNC_SECONDS', 5))
+# Each sync re-reads blacklist rows this recent, for logouts that committed out of id order
+JWT_BLACKLIST_SYNC_OVERLAP_SECONDS = int(os.environ.get('JWT_BLACKLIST_SYNC_OVERLAP_SECONDS', 60))
 
 # CORS
 CORS_ALLOW_ALL_ORIGINS = True  # Useful for testing, but careful in production
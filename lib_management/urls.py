@@ -1,15 +1,13 @@
 from django.contrib import admin
 from django.urls import path, include
 # === 1. IMPORT THESE VIEWS ===
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView
+from library.views import ThrottledTokenObtainPairView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'), # Login
+    path('api/token/', ThrottledTokenObtainPairView.as_view(), name='token_obtain_pair'), # Login
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'), # Refresh Token
 
     path('api/employee/', include('employee.urls')),
@@ -23,4 +21,6 @@ urlpatterns = [
     path('api/onboarding/', include('onboarding.urls')),
     path('api/assets/', include('assets.urls')),
     path('api/settings/', include('settings_app.urls')),
+    path('api/notifications/', include('notifications.urls')),
+    path('api/audit/', include('audit.urls')),
 ]
\ No newline at end of file
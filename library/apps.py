@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class LibraryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'library'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_delete, post_save
+
+        from .authentication import user_cache
+
+        # Cached users must not outlive a change to the row (deactivation, password, permissions)
+        def drop_cached_user(sender, instance, **kwargs):
+            user_cache.invalidate(instance.pk)
+
+        User = get_user_model()
+        post_save.connect(drop_cached_user, sender=User, dispatch_uid='library_drop_cached_user_save')
+        post_delete.connect(drop_cached_user, sender=User, dispatch_uid='library_drop_cached_user_delete')
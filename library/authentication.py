@@ -0,0 +1,168 @@
+import copy
+import threading
+import time
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch, get_md5_hash_password
+
+
+class UserCache:
+    """
+    Per-process LRU of users by id with a TTL. Entries are dropped when the user
+    is saved or deleted in this process (see LibraryConfig.ready) and on logout;
+    other processes pick up changes within the TTL.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # A copy, so a view changing request.user never changes the cached row
+        return copy.copy(user)
+
+    def put(self, user_id, user):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (copy.copy(user), time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TokenBlacklist:
+    """
+    Per-process set of blacklisted, not yet expired token ids (jti). Kept in sync
+    with the token_blacklist table by reading only recent rows, at most every
+    JWT_BLACKLIST_SYNC_SECONDS, instead of a query per request.
+
+    Ids are handed out before commit, so with concurrent logouts a lower id can
+    become visible after a higher one. Each sync therefore re-reads everything
+    above the highest id seen at least JWT_BLACKLIST_SYNC_OVERLAP_SECONDS ago,
+    not just above the last id seen.
+    """
+
+    def __init__(self, sync_seconds, overlap_seconds=60):
+        self.sync_seconds = sync_seconds
+        self.overlap_seconds = overlap_seconds
+        self._expiry = {}  # jti -> expires_at
+        self._watermarks = deque()  # (monotonic time of a sync, highest id seen by then), oldest first
+        self._safe_id = 0  # rows up to this id are taken as committed; later ones are re-read every sync
+        self._next_sync = 0
+        self._lock = threading.Lock()
+
+    def contains(self, jti):
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+        return jti in self._expiry
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            self._expiry[jti] = expires_at
+
+    def sync(self):
+        with self._lock:
+            if time.monotonic() < self._next_sync:
+                return  # Another thread just did it
+            # Always on the primary: a lagging replica would let a logged-out token through
+            rows = (BlacklistedToken.objects.using(DEFAULT_DB_ALIAS).filter(id__gt=self._safe_id)
+                    .order_by('id').values_list('id', 'token__jti', 'token__expires_at'))
+            last_id = self._watermarks[-1][1] if self._watermarks else self._safe_id
+            for row_id, jti, expires_at in rows:
+                self._expiry[jti] = expires_at
+                last_id = max(last_id, row_id)
+
+            started = time.monotonic()
+            self._watermarks.append((started, last_id))
+            # Ids seen long enough ago have no uncommitted rows below them left to wait for
+            while self._watermarks and self._watermarks[0][0] <= started - self.overlap_seconds:
+                self._safe_id = self._watermarks.popleft()[1]
+
+            # Expired tokens fail signature/claim validation anyway
+            now = datetime_from_epoch(time.time())
+            for jti in [jti for jti, expires_at in self._expiry.items() if expires_at <= now]:
+                del self._expiry[jti]
+            self._next_sync = time.monotonic() + self.sync_seconds
+
+    def reset(self):
+        with self._lock:
+            self._expiry.clear()
+            self._watermarks.clear()
+            self._safe_id = 0
+            self._next_sync = 0
+
+
+user_cache = UserCache(getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000), getattr(settings, 'AUTH_USER_CACHE_TTL', 60))
+token_blacklist = TokenBlacklist(getattr(settings, 'JWT_BLACKLIST_SYNC_SECONDS', 5),
+                                 getattr(settings, 'JWT_BLACKLIST_SYNC_OVERLAP_SECONDS', 60))
+
+
+def blacklist_token(token):
+    """Blacklist any token (access tokens included) and make it fail in this process right away."""
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = datetime_from_epoch(token['exp'])
+    outstanding, _ = OutstandingToken.objects.get_or_create(
+        jti=jti,
+        defaults={'token': str(token), 'expires_at': expires_at, 'user_id': token.get(api_settings.USER_ID_CLAIM)},
+    )
+    BlacklistedToken.objects.get_or_create(token=outstanding)
+    token_blacklist.add(jti, expires_at)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without a database query per request: the token signature
+    and claims are checked locally, the user comes from `user_cache` and the
+    token id is checked against the in-process `token_blacklist`.
+    """
+
+    def get_user(self, validated_token):
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti and token_blacklist.contains(jti):
+            raise InvalidToken(_("Token is blacklisted"))
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = user_cache.get(user_id)
+        if user is None:
+            # Cache miss: the stock lookup (one query) with all its checks
+            user = super().get_user(validated_token)
+            user_cache.put(user_id, user)
+            return user
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
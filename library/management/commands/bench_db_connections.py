@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = "Measure per-request database connection overhead with and without persistent connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per mode')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        total = options['requests']
+        conn = connections[alias]
+        configured_age = conn.settings_dict.get('CONN_MAX_AGE', 0)
+
+        modes = [('new connection per request', 0)]
+        if configured_age != 0:
+            modes.append((f'persistent (CONN_MAX_AGE={configured_age})', configured_age))
+        else:
+            modes.append(('persistent (CONN_MAX_AGE=600)', 600))
+
+        results = {}
+        try:
+            for label, age in modes:
+                conn.close()
+                conn.settings_dict['CONN_MAX_AGE'] = age
+                results[label] = self._run(conn, total)
+        finally:
+            conn.close()
+            conn.settings_dict['CONN_MAX_AGE'] = configured_age
+
+        self.stdout.write(f"Database: {conn.vendor} ({alias}), {total} simulated requests per mode")
+        for label, elapsed in results.items():
+            per_request = elapsed / total * 1000
+            self.stdout.write(f"  {label:<40} {per_request:8.3f} ms/request  ({elapsed:.2f}s total)")
+
+        baseline, persistent = results.values()
+        if persistent > 0:
+            self.stdout.write(self.style.SUCCESS(f"Speedup: {baseline / persistent:.1f}x"))
+
+    def _run(self, conn, total):
+        # Mimic Django's request cycle: request_started/finished close connections
+        # that are past CONN_MAX_AGE, exactly like a real view would see
+        start = time.perf_counter()
+        for _ in range(total):
+            request_started.send(sender=self.__class__)
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            request_finished.send(sender=self.__class__)
+        return time.perf_counter() - start
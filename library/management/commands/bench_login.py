@@ -0,0 +1,96 @@
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from library.views import ThrottledTokenObtainPairView
+
+PASSWORD = 'bench-login-password'
+
+
+class Command(BaseCommand):
+    help = "Fire a burst of logins at the token endpoint with and without the login throttles and compare throughput."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8, help="Threads sending logins at once")
+        parser.add_argument('--users', type=int, default=5, help="Accounts the attempts are spread over")
+        parser.add_argument('--ips', type=int, default=1, help="Client addresses the attempts come from")
+        parser.add_argument('--bad-ratio', type=float, default=0.5, help="Share of attempts with a wrong password")
+
+    def handle(self, *args, **options):
+        run = uuid.uuid4().hex[:8]
+        # One hash for all bench accounts: creating them should not cost a hash each
+        password = make_password(PASSWORD)
+        prefix = f'bench-{run}-'
+        User.objects.bulk_create([User(username=f'{prefix}{i}', password=password) for i in range(options['users'])])
+
+        rng = random.Random(0)
+        attempts = [
+            {
+                'username': f'{prefix}{rng.randrange(options["users"])}',
+                'password': 'wrong' if rng.random() < options['bad_ratio'] else PASSWORD,
+                'ip': f'198.18.{i % options["ips"] // 250}.{i % options["ips"] % 250}',
+            }
+            for i in range(options['attempts'])
+        ]
+
+        try:
+            self.stdout.write(f"{len(attempts)} login attempts, {options['concurrency']} at a time, "
+                              f"{options['users']} accounts, {options['ips']} addresses")
+            rates = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})
+            for label, throttled in [('unthrottled', False), (f"throttled {rates}", True)]:
+                self._reset_buckets()
+                self._report(label, self._run(attempts, options['concurrency'], throttled))
+        finally:
+            # By name: bulk_create returns no primary keys on MySQL
+            OutstandingToken.objects.filter(user__username__startswith=prefix).delete()
+            User.objects.filter(username__startswith=prefix).delete()
+
+    def _run(self, attempts, concurrency, throttled):
+        factory = APIRequestFactory()
+        view = ThrottledTokenObtainPairView.as_view(**({} if throttled else {'throttle_classes': []}))
+
+        def attempt(item):
+            request = factory.post('/api/token/', {'username': item['username'], 'password': item['password']},
+                                   format='json', REMOTE_ADDR=item['ip'])
+            started = time.perf_counter()
+            try:
+                response = view(request)
+                return response.status_code, time.perf_counter() - started
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(attempt, attempts))
+        return results, time.perf_counter() - started
+
+    def _reset_buckets(self):
+        # Only a private in-process cache is cleared; a shared one keeps its buckets (use fresh --ips then)
+        cache = caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+        if isinstance(cache, LocMemCache):
+            cache.clear()
+
+    def _report(self, label, run):
+        results, elapsed = run
+        codes = {}
+        for code, _ in results:
+            codes[code] = codes.get(code, 0) + 1
+        latencies = sorted(seconds for _, seconds in results)
+        p50 = latencies[len(latencies) // 2] * 1000
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000
+
+        self.stdout.write(f"  {label}")
+        self.stdout.write(f"    {len(results) / elapsed:8.1f} attempts/s   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms   ({elapsed:.2f}s)")
+        self.stdout.write(f"    ok {codes.get(200, 0)}, wrong password {codes.get(401, 0)}, throttled {codes.get(429, 0)}")
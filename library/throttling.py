@@ -0,0 +1,75 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+# Read-modify-write of a bucket is serialized within the process; across processes a
+# shared cache backend may let a few extra attempts through under contention
+_bucket_lock = threading.Lock()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket on top of DRF's rate settings: a rate of "5/min" is a bucket of 5
+    attempts that refills at 5 per minute. Bursts up to the bucket size go through,
+    after that attempts are spaced out instead of blocked for a whole window.
+    Buckets live in the THROTTLE_CACHE_ALIAS cache.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cache = caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+        self.refill_per_second = self.num_requests / self.duration if self.num_requests else 0
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        with _bucket_lock:
+            self.now = self.timer()
+            tokens, updated = self.cache.get(self.key) or (self.num_requests, self.now)
+            tokens = min(self.num_requests, tokens + (self.now - updated) * self.refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.tokens = tokens
+            # A bucket untouched for a full period is full again, so it can expire
+            self.cache.set(self.key, (tokens, self.now), self.duration)
+        return allowed
+
+    def wait(self):
+        if not self.refill_per_second:
+            return None
+        return max((1 - self.tokens) / self.refill_per_second, 0)
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    # Password attempts per client address
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    # Password attempts per account, whichever addresses they come from
+    scope = 'login_user'
+
+    def get_cache_key(self, request, view):
+        try:
+            username = request.data.get('username')
+        except AttributeError:
+            return None
+        if not username or not isinstance(username, str):
+            return None
+        # Cache keys must stay short and printable whatever the client sends
+        ident = username.strip().lower()[:150].encode('unicode_escape').decode('ascii').replace(' ', '_')[:200]
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+# Every view that hashes a password
+LOGIN_THROTTLES = [LoginIPThrottle, LoginUsernameThrottle]
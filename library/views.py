@@ -5,12 +5,18 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from .authentication import blacklist_token, user_cache
+from .throttling import LOGIN_THROTTLES
 
 
 # -----------------------------
 #   USER SIGNUP
 # -----------------------------
 class SignupView(APIView):
+    throttle_classes = LOGIN_THROTTLES
+
     def post(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
@@ -35,6 +41,8 @@ class SignupView(APIView):
 #   LOGIN → RETURN JWT TOKEN
 # -----------------------------
 class LoginView(APIView):
+    throttle_classes = LOGIN_THROTTLES
+
     def post(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
@@ -57,6 +65,11 @@ class LoginView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+# /api/token/ (simplejwt) hashes the password too
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    throttle_classes = LOGIN_THROTTLES
+
+
 # -----------------------------
 #   LOGOUT → BLACKLIST TOKEN
 # -----------------------------
@@ -67,7 +80,11 @@ class LogoutView(APIView):
         try:
             refresh_token = request.data["refresh"]
             token = RefreshToken(refresh_token)
-            token.blacklist()
+            blacklist_token(token)
+            # The access token used for this request stops working too, not only at expiry
+            if request.auth is not None:
+                blacklist_token(request.auth)
+            user_cache.invalidate(request.user.pk)
 
             return Response({"message": "Logout successful"}, status=status.HTTP_200_OK)
 
@@ -0,0 +1,63 @@
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+class BaseBackend:
+    """
+    Delivers one batch of messages for a channel. `send()` gets a list of dicts
+    (id, address, employee_id, subject, body, kind, payload) and returns
+    {id: error message} for the ones that failed; everything else counts as sent.
+    """
+
+    def send(self, messages):
+        raise NotImplementedError('.send() must be overridden')
+
+
+class EmailBackend(BaseBackend):
+    # Django's configured EMAIL_BACKEND (SMTP by default), one connection per batch
+    def send(self, messages):
+        errors = {}
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+            for message in messages:
+                email = EmailMessage(message['subject'], message['body'], settings.DEFAULT_FROM_EMAIL,
+                                     [message['address']], connection=connection)
+                try:
+                    email.send()
+                except Exception as e:
+                    errors[message['id']] = f"{type(e).__name__}: {e}"
+        except Exception as e:
+            # Could not reach the server: the whole batch is retried
+            return {message['id']: f"{type(e).__name__}: {e}" for message in messages if message['id'] not in errors}
+        finally:
+            connection.close()
+        return errors
+
+
+class FileBackend(BaseBackend):
+    # Appends one JSON line per message to NOTIFICATION_FILE_PATH (development, tests, push stand-in)
+    _lock = threading.Lock()
+
+    def __init__(self, path=None):
+        self.path = path or getattr(settings, 'NOTIFICATION_FILE_PATH', None) or os.path.join(settings.BASE_DIR, 'notifications.jsonl')
+
+    def send(self, messages):
+        sent_at = timezone.now().isoformat()
+        lines = ''.join(json.dumps({**message, 'sent_at': sent_at}, default=str) + '\n' for message in messages)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as handle:
+            handle.write(lines)
+        return {}
+
+
+def get_backend(channel):
+    path = settings.NOTIFICATION_BACKENDS.get(channel)
+    if not path:
+        raise ValueError(f"No notification backend configured for channel {channel!r}")
+    return import_string(path)()
@@ -0,0 +1,46 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications.outbox import deliver_due, dispatch_pending
+
+
+class Command(BaseCommand):
+    help = "Fan queued notifications out to recipients and deliver them per channel, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--channel', action='append', help="Only this channel (repeatable); default: all configured")
+        parser.add_argument('--batch-size', type=int, default=200, help="Deliveries per backend call")
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new notifications")
+        parser.add_argument('--sleep', type=float, default=5.0, help="Seconds between polls with --loop")
+        parser.add_argument('--json', action='store_true', help="Print each run's metrics as one JSON line")
+
+    def handle(self, *args, **options):
+        channels = options['channel'] or list(settings.NOTIFICATION_BACKENDS)
+        unknown = set(channels) - set(settings.NOTIFICATION_BACKENDS)
+        if unknown:
+            raise CommandError(f"No backend configured for: {', '.join(sorted(unknown))}")
+
+        while True:
+            fanned_out = 0
+            while True:
+                dispatched, created = dispatch_pending()
+                fanned_out += created
+                if not dispatched:
+                    break
+            metrics = [deliver_due(channel, batch_size=options['batch_size']) for channel in channels]
+            busy = fanned_out or any(m['sent'] or m['retrying'] or m['failed'] for m in metrics)
+
+            if options['json']:
+                self.stdout.write(json.dumps({'deliveries_created': fanned_out, 'channels': metrics}))
+            elif busy or not options['loop']:
+                self.stdout.write(f"Created {fanned_out} deliveries.")
+                for m in metrics:
+                    self.stdout.write(f"  {m['channel']:<6} sent {m['sent']}, retrying {m['retrying']}, failed {m['failed']} "
+                                      f"in {m['seconds']}s ({m['per_second']}/s)")
+            if not options['loop']:
+                break
+            if not busy:
+                time.sleep(options['sleep'])
@@ -0,0 +1,69 @@
+from django.db import models
+from django.utils import timezone
+from employee.models import Employee
+
+CHANNELS = [('email', 'Email'), ('push', 'Push')]
+
+
+class Notification(models.Model):
+    """
+    Outbox row: written in the same transaction as the change it announces, so it
+    exists exactly when that change committed. `manage.py send_notifications` fans it
+    out into one Delivery per recipient and enabled channel.
+    """
+    STATUS_CHOICES = [('Pending', 'Pending'), ('Dispatched', 'Dispatched')]
+
+    kind = models.CharField(max_length=50)  # e.g. leave.approved, payroll.generated
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True, default='')
+    payload = models.JSONField(default=dict, blank=True)
+    # Employee ids; one row however many people it goes to
+    recipients = models.JSONField(default=list)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    delivery_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='notification_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+
+class Delivery(models.Model):
+    STATUS_CHOICES = [
+        ('Pending', 'Pending'),
+        ('Sent', 'Sent'),
+        ('Failed', 'Failed'),  # Gave up after NOTIFICATION_MAX_ATTEMPTS
+    ]
+
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='deliveries')
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='notification_deliveries')
+    channel = models.CharField(max_length=10, choices=CHANNELS)
+    address = models.CharField(max_length=254, blank=True, default='')
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    attempts = models.IntegerField(default=0)
+    # When a worker may (re)try it; also pushed forward while a worker holds it
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.CharField(max_length=500, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # Fan-out can be retried without sending anything twice
+            models.UniqueConstraint(fields=['notification', 'employee', 'channel'], name='delivery_once_per_channel'),
+        ]
+        indexes = [
+            models.Index(fields=['channel', 'status', 'next_attempt_at'], name='delivery_due_idx'),
+            models.Index(fields=['channel', 'sent_at'], name='delivery_sent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} to {self.address or self.employee_id} ({self.status})"
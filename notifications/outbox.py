@@ -0,0 +1,174 @@
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from employee.models import Employee
+from settings_app.models import EmployeeSettings
+
+from .backends import get_backend
+from .models import CHANNELS, Delivery, Notification
+
+# Which EmployeeSettings flag opts an employee in to each channel
+CHANNEL_FLAGS = {'email': 'email_notifications', 'push': 'push_notifications'}
+
+
+def build(kind, title, employee_ids, body='', payload=None):
+    # Unsaved, for Notification.objects.bulk_create() when one change notifies many people differently
+    return Notification(kind=kind, title=title, body=body, payload=payload or {},
+                        recipients=sorted({int(pk) for pk in employee_ids}))
+
+
+def notify(kind, title, employee_ids, body='', payload=None):
+    """
+    Queue a notification. Call it inside the transaction of the change it announces:
+    nothing is sent from the request, the worker picks it up once it committed.
+    """
+    notification = build(kind, title, employee_ids, body, payload)
+    if not notification.recipients:
+        return None
+    notification.save()
+    return notification
+
+
+def backoff_seconds(attempts):
+    # Exponential with jitter, so a failing server is not hit by every retry at the same moment
+    base = settings.NOTIFICATION_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return min(base, settings.NOTIFICATION_RETRY_MAX_SECONDS) * random.uniform(1, 1.25)
+
+
+def dispatch_pending(batch_size=20):
+    """
+    Fan queued notifications out into deliveries. Recipient preferences and
+    addresses are read in bulk for the whole batch.
+    Returns (notifications dispatched, deliveries created).
+    """
+    created = 0
+    with transaction.atomic():
+        notifications = list(Notification.objects.select_for_update(skip_locked=True)
+                             .filter(status='Pending').order_by('created_at')[:batch_size])
+        if not notifications:
+            return 0, 0
+
+        employee_ids = {pk for notification in notifications for pk in notification.recipients}
+        preferences = EmployeeSettings.for_employees(employee_ids)
+        emails = dict(Employee.objects.filter(pk__in=employee_ids).values_list('pk', 'email'))
+
+        now = timezone.now()
+        for notification in notifications:
+            deliveries = []
+            for employee_id in notification.recipients:
+                # Archived or deleted employees are not notified
+                if employee_id not in emails:
+                    continue
+                prefs = preferences.get(employee_id, {})
+                if prefs.get(CHANNEL_FLAGS['email']) and emails[employee_id]:
+                    deliveries.append(Delivery(notification=notification, employee_id=employee_id, channel='email',
+                                               address=emails[employee_id], next_attempt_at=now))
+                if prefs.get(CHANNEL_FLAGS['push']):
+                    deliveries.append(Delivery(notification=notification, employee_id=employee_id, channel='push',
+                                               next_attempt_at=now))
+            Delivery.objects.bulk_create(deliveries, batch_size=1000, ignore_conflicts=True)
+            created += len(deliveries)
+            notification.status = 'Dispatched'
+            notification.dispatched_at = now
+            notification.delivery_count = len(deliveries)
+        Notification.objects.bulk_update(notifications, ['status', 'dispatched_at', 'delivery_count'])
+    return len(notifications), created
+
+
+def claim_due(channel, batch_size):
+    # Lock due deliveries for this worker and push them out of reach for the lease period:
+    # if the worker dies mid-send they become due again instead of stuck
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(Delivery.objects.select_for_update(skip_locked=True)
+                   .filter(channel=channel, status='Pending', next_attempt_at__lte=now)
+                   .order_by('next_attempt_at').values_list('pk', flat=True)[:batch_size])
+        Delivery.objects.filter(pk__in=ids).update(
+            next_attempt_at=now + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS))
+    return list(Delivery.objects.filter(pk__in=ids).select_related('notification'))
+
+
+def deliver_due(channel, batch_size=200, limit=None):
+    """
+    Send due deliveries of one channel through its backend, batch by batch, until
+    none are due (or `limit` were attempted). Failures are retried with backoff.
+    Returns this run's metrics for the channel.
+    """
+    backend = get_backend(channel)
+    metrics = {'channel': channel, 'sent': 0, 'retrying': 0, 'failed': 0, 'batches': 0, 'seconds': 0.0}
+    started = time.monotonic()
+    while limit is None or metrics['sent'] + metrics['retrying'] + metrics['failed'] < limit:
+        deliveries = claim_due(channel, batch_size)
+        if not deliveries:
+            break
+        metrics['batches'] += 1
+        messages = [{
+            'id': delivery.pk,
+            'address': delivery.address,
+            'employee_id': delivery.employee_id,
+            'subject': delivery.notification.title,
+            'body': delivery.notification.body,
+            'kind': delivery.notification.kind,
+            'payload': delivery.notification.payload,
+        } for delivery in deliveries]
+        try:
+            errors = backend.send(messages)
+        except Exception as e:
+            errors = {message['id']: f"{type(e).__name__}: {e}" for message in messages}
+
+        now = timezone.now()
+        for delivery in deliveries:
+            delivery.attempts += 1
+            error = errors.get(delivery.pk)
+            if error is None:
+                delivery.status, delivery.sent_at, delivery.last_error = 'Sent', now, ''
+                metrics['sent'] += 1
+            elif delivery.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+                delivery.status, delivery.last_error = 'Failed', error[:500]
+                metrics['failed'] += 1
+            else:
+                delivery.next_attempt_at = now + timedelta(seconds=backoff_seconds(delivery.attempts))
+                delivery.last_error = error[:500]
+                metrics['retrying'] += 1
+        Delivery.objects.bulk_update(deliveries, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'], batch_size=500)
+
+    metrics['seconds'] = round(time.monotonic() - started, 3)
+    metrics['per_second'] = round(metrics['sent'] / metrics['seconds'], 1) if metrics['seconds'] else 0.0
+    return metrics
+
+
+def delivery_stats(hours=1):
+    # Queue depth and recent throughput per channel, from one grouped query
+    since = timezone.now() - timedelta(hours=hours)
+    rows = Delivery.objects.values('channel').annotate(
+        pending=Count('id', filter=Q(status='Pending')),
+        due=Count('id', filter=Q(status='Pending', next_attempt_at__lte=timezone.now())),
+        retrying=Count('id', filter=Q(status='Pending', attempts__gt=0)),
+        failed=Count('id', filter=Q(status='Failed')),
+        sent_recently=Count('id', filter=Q(status='Sent', sent_at__gte=since)),
+    )
+    by_channel = {row['channel']: row for row in rows}
+    result = []
+    for channel, label in CHANNELS:
+        row = by_channel.get(channel, {})
+        sent = row.get('sent_recently', 0)
+        result.append({
+            'channel': channel,
+            'label': label,
+            'pending': row.get('pending', 0),
+            'due': row.get('due', 0),
+            'retrying': row.get('retrying', 0),
+            'failed': row.get('failed', 0),
+            f'sent_last_{hours}h': sent,
+            'sent_per_minute': round(sent / (hours * 60), 2),
+        })
+    return {
+        'queued_notifications': Notification.objects.filter(status='Pending').count(),
+        'channels': result,
+    }
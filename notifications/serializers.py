@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from .models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    recipient_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'kind', 'title', 'body', 'payload', 'recipient_count', 'status',
+                  'created_at', 'dispatched_at', 'delivery_count']
+
+    def get_recipient_count(self, obj):
+        return len(obj.recipients)
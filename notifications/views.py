@@ -0,0 +1,31 @@
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .models import Notification
+from .outbox import delivery_stats
+from .serializers import NotificationSerializer
+
+
+class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Notification.objects.all()
+    serializer_class = NotificationSerializer
+
+    def get_queryset(self):
+        # Optional filters: ?kind=payroll.generated&status=Pending
+        queryset = super().get_queryset()
+        kind = self.request.query_params.get('kind')
+        notification_status = self.request.query_params.get('status')
+        if kind:
+            queryset = queryset.filter(kind=kind)
+        if notification_status:
+            queryset = queryset.filter(status=notification_status)
+        return queryset
+
+    # Queue depth and throughput per channel: /api/notifications/stats/?hours=1
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        try:
+            hours = min(max(int(request.query_params.get('hours', 1)), 1), 24 * 7)
+        except ValueError:
+            hours = 1
+        return Response(delivery_stats(hours))
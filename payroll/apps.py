@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class PayrollConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'payroll'
+
+    def ready(self):
+        from django.db.models.signals import post_save
+
+        from employee.models import Employee
+        from .models import SalaryRevision
+
+        # New hires start their salary history (bulk imports do this themselves)
+        def start_salary_history(sender, instance, created, raw=False, **kwargs):
+            if created and not raw:
+                SalaryRevision.start_history([instance])
+
+        post_save.connect(start_salary_history, sender=Employee, dispatch_uid='payroll_start_salary_history')
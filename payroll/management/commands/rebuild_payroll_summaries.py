@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from payroll.models import PayrollMonthlySummary
+
+
+class Command(BaseCommand):
+    help = "Rebuild PayrollMonthlySummary from the Payroll table (after raw SQL edits or repairs)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int)
+        parser.add_argument('--month', type=int)
+
+    def handle(self, *args, **options):
+        if options['year'] and options['month']:
+            PayrollMonthlySummary.rebuild_month(options['year'], options['month'])
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {options['year']}-{options['month']:02d}."))
+            return
+        months = PayrollMonthlySummary.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {months} months of payroll summaries."))
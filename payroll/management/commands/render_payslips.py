@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from payroll.payslips import render_period
+
+
+class Command(BaseCommand):
+    help = "Render payslip PDFs for a pay period on a process pool. Re-running resumes where it stopped."
+
+    def add_arguments(self, parser):
+        today = timezone.now().date()
+        parser.add_argument('--year', type=int, default=today.year)
+        parser.add_argument('--month', type=int, default=today.month)
+        parser.add_argument('--workers', type=int, help="Default: PAYSLIP_WORKERS or the CPU count")
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--force', action='store_true', help="Re-render payslips that already exist")
+
+    def handle(self, *args, **options):
+        year, month = options['year'], options['month']
+
+        def progress(done, total):
+            self.stdout.write(f"  {done}/{total} rendered")
+
+        count = render_period(year, month, workers=options['workers'], batch_size=options['batch_size'],
+                              force=options['force'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"Rendered {count} payslips for {year}-{month:02d}."))
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+
+
+def populate_summaries(apps, schema_editor):
+    Employee = apps.get_model('employee', 'Employee')
+    Payroll = apps.get_model('payroll', 'Payroll')
+    PayrollMonthlySummary = apps.get_model('payroll', 'PayrollMonthlySummary')
+
+    # Existing payrolls are attributed to the employee's current department
+    Payroll.objects.update(department=Subquery(
+        Employee.objects.filter(pk=OuterRef('employee_id')).values('department_ref_id')[:1]))
+
+    rows = (Payroll.objects.values('pay_date__year', 'pay_date__month', 'department_id')
+            .annotate(
+                paid_count=Count('id', filter=Q(status='Paid')),
+                pending_count=Count('id', filter=~Q(status='Paid')),
+                paid_amount=Sum('net_salary', filter=Q(status='Paid')),
+                pending_amount=Sum('net_salary', filter=~Q(status='Paid')),
+            ))
+    PayrollMonthlySummary.objects.bulk_create([
+        PayrollMonthlySummary(
+            year=row['pay_date__year'], month=row['pay_date__month'], department_id=row['department_id'],
+            paid_count=row['paid_count'], pending_count=row['pending_count'],
+            paid_amount=row['paid_amount'] or 0, pending_amount=row['pending_amount'] or 0)
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0005_employee_soft_delete'),
+        ('payroll', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payroll',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payrolls', to='employee.department'),
+        ),
+        migrations.CreateModel(
+            name='PayrollMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('paid_count', models.IntegerField(default=0)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pending_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='payroll_summaries', to='employee.department')),
+            ],
+            options={
+                'ordering': ['year', 'month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='payrollmonthlysummary',
+            constraint=models.UniqueConstraint(fields=('year', 'month', 'department'), name='payroll_summary_month_dept_uniq'),
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll', '0002_monthly_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Payslip',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(max_length=200, upload_to='payslips/')),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+                ('payroll', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='payslip', to='payroll.payroll')),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def seed_revisions(apps, schema_editor):
+    # Current salaries become the first revision, effective from the joining date
+    Employee = apps.get_model('employee', 'Employee')
+    SalaryRevision = apps.get_model('payroll', 'SalaryRevision')
+    SalaryRevision.objects.bulk_create([
+        SalaryRevision(employee_id=pk, basic_salary=salary, effective_date=joined, note='Initial salary')
+        for pk, salary, joined in Employee.objects.values_list('id', 'basic_salary', 'date_of_joining').iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0005_employee_soft_delete'),
+        ('payroll', '0003_payslip'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalaryRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('basic_salary', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('effective_date', models.DateField()),
+                ('note', models.CharField(blank=True, default='', max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='salary_revisions', to='employee.employee')),
+            ],
+            options={
+                'ordering': ['employee', '-effective_date', '-id'],
+                'indexes': [models.Index(fields=['employee', '-effective_date', '-id'], name='salary_rev_emp_effective_idx')],
+            },
+        ),
+        migrations.RunPython(seed_revisions, migrations.RunPython.noop),
+    ]
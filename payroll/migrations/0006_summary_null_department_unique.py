@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-19 19:03
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_summaries(apps, schema_editor):
+    # Rows without a department may have been duplicated before the constraint covered them
+    Summary = apps.get_model('payroll', 'PayrollMonthlySummary')
+    duplicated = (Summary.objects.filter(department__isnull=True).values('year', 'month')
+                  .annotate(rows=Count('id')).filter(rows__gt=1))
+    for group in duplicated:
+        rows = list(Summary.objects.filter(department__isnull=True, year=group['year'], month=group['month']).order_by('id'))
+        keep = rows[0]
+        for row in rows[1:]:
+            keep.paid_count += row.paid_count
+            keep.pending_count += row.pending_count
+            keep.paid_amount += row.paid_amount
+            keep.pending_amount += row.pending_amount
+        keep.save()
+        Summary.objects.filter(pk__in=[row.pk for row in rows[1:]]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0006_employee_user'),
+        ('payroll', '0005_payment_batch'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='payrollmonthlysummary',
+            name='payroll_summary_month_dept_uniq',
+        ),
+        migrations.RunPython(merge_duplicate_summaries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='payrollmonthlysummary',
+            constraint=models.UniqueConstraint(models.F('year'), models.F('month'), django.db.models.functions.comparison.Coalesce('department', models.Value(0)), name='payroll_summary_month_dept_uniq'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-19 19:20
+
+from django.db import migrations
+
+
+def backfill_initial_salary(apps, schema_editor):
+    # Employees created after 0004 have no revision from their joining date, so months before
+    # their first revision fell back to Employee.basic_salary (today's salary). Start their history
+    # at joining: with the current salary if they have no revision at all, otherwise with the
+    # earliest recorded one (the salary they had before it is not stored anywhere).
+    Employee = apps.get_model('employee', 'Employee')
+    SalaryRevision = apps.get_model('payroll', 'SalaryRevision')
+    earliest = {}
+    for employee_id, effective_date, salary in (SalaryRevision.objects.order_by('employee_id', 'effective_date', 'id')
+                                                .values_list('employee_id', 'effective_date', 'basic_salary')):
+        earliest.setdefault(employee_id, (effective_date, salary))
+
+    revisions = []
+    for pk, salary, joined in Employee.objects.values_list('id', 'basic_salary', 'date_of_joining').iterator():
+        first = earliest.get(pk)
+        if first and first[0] <= joined:
+            continue
+        revisions.append(SalaryRevision(employee_id=pk, basic_salary=first[1] if first else salary,
+                                        effective_date=joined, note='Initial salary'))
+    SalaryRevision.objects.bulk_create(revisions, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll', '0006_summary_null_department_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_initial_salary, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,14 @@
-from django.db import models
+from decimal import Decimal
 
-# Create your models here.
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Count, F, Q, Sum, Value, Window
+from django.db.models.functions import Coalesce, RowNumber
 from django.utils import timezone
-from employee.models import Employee  # Link to Employee App
+from employee.models import Department, Employee  # Link to Employee App
+
+def to_decimal(value):
+    return Decimal(str(value or 0))
+
 
 class Payroll(models.Model):
     STATUS_CHOICES = [
@@ -13,6 +18,8 @@ class Payroll(models.Model):
 
     # FOREIGN KEY: Links specific payroll record to a specific employee
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='payrolls')
+    # Department the salary was paid under (kept if the employee transfers later)
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='payrolls')
     
     # Financials
     basic_salary = models.DecimalField(max_digits=10, decimal_places=2)
@@ -22,16 +29,250 @@ class Payroll(models.Model):
     
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
     pay_date = models.DateField(default=timezone.now)
+    # Set when the row is paid through a PaymentBatch
+    payment_batch = models.ForeignKey('PaymentBatch', on_delete=models.SET_NULL, null=True, blank=True, related_name='payrolls')
 
-    def save(self, *args, **kwargs):
+    def prepare(self):
         # 1. If basic_salary is missing, grab it from the Employee profile
         if not self.basic_salary and self.employee.basic_salary:
             self.basic_salary = self.employee.basic_salary
             
         # 2. Auto-calculate Net Salary
-        # Convert to float for calculation to avoid Decimal type errors
-        self.net_salary = float(self.basic_salary) + float(self.allowances) - float(self.deductions)
-        super().save(*args, **kwargs)
+        # Convert through str so request values (str/int/float) become exact Decimals
+        self.net_salary = to_decimal(self.basic_salary) + to_decimal(self.allowances) - to_decimal(self.deductions)
+
+        # 3. Attribute the payment to the employee's current department
+        if self.department_id is None:
+            self.department_id = self.employee.department_ref_id
+
+    def save(self, *args, **kwargs):
+        self.prepare()
+        with transaction.atomic():
+            old = None
+            if self.pk:
+                old = Payroll.objects.select_for_update().filter(pk=self.pk).values(*PayrollMonthlySummary.SOURCE_FIELDS).first()
+            super().save(*args, **kwargs)
+
+            # Move this row's amount between monthly summaries (old month/status out, new in)
+            if old:
+                PayrollMonthlySummary.apply(old, -1)
+                # The rendered payslip no longer matches; the next render replaces its file
+                Payslip.objects.filter(payroll_id=self.pk).delete()
+            PayrollMonthlySummary.apply({
+                'pay_date': self.pay_date, 'department_id': self.department_id,
+                'status': self.status, 'net_salary': self.net_salary,
+            }, 1)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            old = Payroll.objects.select_for_update().filter(pk=self.pk).values(*PayrollMonthlySummary.SOURCE_FIELDS).first()
+            result = super().delete(*args, **kwargs)
+            if old:
+                PayrollMonthlySummary.apply(old, -1)
+            return result
+
+    def __str__(self):
+        return f"{self.employee.employee_id} - {self.pay_date.strftime('%B %Y')}"
+
+
+class PayrollMonthlySummary(models.Model):
+    """
+    Paid/pending totals per month and department.
+    Payroll.save()/delete() apply deltas; bulk writes call rebuild_month() afterwards.
+    """
+    SOURCE_FIELDS = ['pay_date', 'department_id', 'status', 'net_salary']
+
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, null=True, blank=True, related_name='payroll_summaries')
+
+    paid_count = models.IntegerField(default=0)
+    pending_count = models.IntegerField(default=0)
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    pending_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ['year', 'month']
+        constraints = [
+            # NULLs are distinct in a plain unique constraint: "no department" is keyed as 0 so
+            # concurrent get_or_create() calls cannot create two rows for it
+            models.UniqueConstraint('year', 'month', Coalesce('department', Value(0)), name='payroll_summary_month_dept_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.year}-{self.month:02d} {self.department or 'No department'}"
+
+    @classmethod
+    def apply(cls, row, sign):
+        # row: the SOURCE_FIELDS of one payroll; sign: +1 to add it, -1 to remove it
+        prefix = 'paid' if row['status'] == 'Paid' else 'pending'
+        amount = to_decimal(row['net_salary']) * sign
+        summary, _ = cls.objects.get_or_create(
+            year=row['pay_date'].year, month=row['pay_date'].month, department_id=row['department_id'])
+        cls.objects.filter(pk=summary.pk).update(**{
+            f'{prefix}_count': F(f'{prefix}_count') + sign,
+            f'{prefix}_amount': F(f'{prefix}_amount') + amount,
+        })
+
+    @classmethod
+    def rebuild_month(cls, year, month):
+        # Recompute one month from the Payroll table (after bulk_create/update)
+        rows = (Payroll.objects.filter(pay_date__year=year, pay_date__month=month)
+                .values('department_id')
+                .annotate(
+                    paid_count=Count('id', filter=Q(status='Paid')),
+                    pending_count=Count('id', filter=~Q(status='Paid')),
+                    paid_amount=Sum('net_salary', filter=Q(status='Paid')),
+                    pending_amount=Sum('net_salary', filter=~Q(status='Paid')),
+                ))
+        with transaction.atomic():
+            cls.objects.filter(year=year, month=month).delete()
+            cls.objects.bulk_create([
+                cls(year=year, month=month, department_id=row['department_id'],
+                    paid_count=row['paid_count'], pending_count=row['pending_count'],
+                    paid_amount=row['paid_amount'] or 0, pending_amount=row['pending_amount'] or 0)
+                for row in rows
+            ])
+
+    @classmethod
+    def rebuild(cls):
+        months = Payroll.objects.dates('pay_date', 'month')
+        with transaction.atomic():
+            cls.objects.all().delete()
+            for month in months:
+                cls.rebuild_month(month.year, month.month)
+        return len(months)
+
+
+class PaymentBatch(models.Model):
+    """
+    One payout run: the payrolls it marked paid point back to it. The
+    idempotency key makes retried requests return the original result.
+    """
+    idempotency_key = models.CharField(max_length=100, unique=True)
+    # The selection the batch was created with (year/month/department_id/ids)
+    criteria = models.JSONField(default=dict)
+    payroll_count = models.IntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Batch {self.idempotency_key} ({self.payroll_count} payrolls)"
+
+    def pay(self, payrolls):
+        # Mark every pending payroll in `payrolls` paid with a single UPDATE, then refresh totals
+        with transaction.atomic():
+            payrolls.filter(status='Pending').update(status='Paid', payment_batch=self)
+            paid = Payroll.objects.filter(payment_batch=self)
+            totals = paid.aggregate(count=Count('id'), amount=Sum('net_salary'))
+            self.payroll_count = totals['count']
+            self.total_amount = totals['amount'] or 0
+            self.save(update_fields=['payroll_count', 'total_amount'])
+
+            # Bulk path: rebuild the touched months and drop now-stale payslips
+            for month in paid.dates('pay_date', 'month'):
+                PayrollMonthlySummary.rebuild_month(month.year, month.month)
+            Payslip.objects.filter(payroll__payment_batch=self).delete()
+
+    def report(self):
+        by_department = (self.payrolls.values('department__name')
+                         .annotate(count=Count('id'), amount=Sum('net_salary')).order_by('department__name'))
+        return {
+            'batch_id': self.pk,
+            'idempotency_key': self.idempotency_key,
+            'criteria': self.criteria,
+            'paid': self.payroll_count,
+            'total_amount': float(self.total_amount),
+            'by_department': [
+                {'department': row['department__name'], 'paid': row['count'], 'amount': float(row['amount'] or 0)}
+                for row in by_department
+            ],
+            'created_at': self.created_at,
+        }
+
+
+class Payslip(models.Model):
+    # Rendered PDF for one payroll row (see payroll/payslips.py)
+    payroll = models.OneToOneField(Payroll, on_delete=models.CASCADE, related_name='payslip')
+    file = models.FileField(upload_to='payslips/', max_length=200)
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Payslip for {self.payroll}"
+
+
+class SalaryRevision(models.Model):
+    # Effective-dated basic salary history; Employee.basic_salary mirrors the revision in effect today
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='salary_revisions')
+    basic_salary = models.DecimalField(max_digits=10, decimal_places=2)
+    effective_date = models.DateField()
+    note = models.CharField(max_length=200, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['employee', '-effective_date', '-id']
+        indexes = [
+            models.Index(fields=['employee', '-effective_date', '-id'], name='salary_rev_emp_effective_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.employee.employee_id} - {self.pay_date.strftime('%B %Y')}"
\ No newline at end of file
+        return f"{self.employee.employee_id}: {self.basic_salary} from {self.effective_date}"
+
+    @classmethod
+    def as_of(cls, on_date, employees=None):
+        """
+        Revision in effect on `on_date` for each employee, in one query:
+        {employee pk: {'basic_salary', 'effective_date'}}. Employees with no
+        revision by that date are missing from the result.
+        """
+        revisions = cls.objects.filter(effective_date__lte=on_date)
+        if employees is not None:
+            revisions = revisions.filter(employee__in=employees)
+        fields = ('employee_id', 'basic_salary', 'effective_date')
+
+        if connection.vendor == 'postgresql':
+            # DISTINCT ON keeps the first row per employee in this order
+            rows = (revisions.order_by('employee_id', '-effective_date', '-id')
+                    .distinct('employee_id').values(*fields))
+        else:
+            rows = (revisions.annotate(position=Window(
+                        RowNumber(), partition_by=[F('employee_id')],
+                        order_by=[F('effective_date').desc(), F('id').desc()]))
+                    .filter(position=1).values(*fields))
+        return {row['employee_id']: row for row in rows}
+
+    @classmethod
+    def start_history(cls, employees):
+        """
+        First revision for employees without one: their salary effective from the
+        joining date, so as_of() covers every past month and never has to fall back
+        to Employee.basic_salary, which moves with later revisions.
+        """
+        revisions = [
+            cls(employee_id=employee.pk, basic_salary=employee.basic_salary,
+                effective_date=employee.date_of_joining, note='Initial salary')
+            for employee in employees
+        ]
+        cls.objects.bulk_create(revisions, batch_size=1000)
+        return revisions
+
+    @classmethod
+    def salary_on(cls, employee, on_date):
+        revision = cls.as_of(on_date, [employee.pk]).get(employee.pk)
+        return revision['basic_salary'] if revision else employee.basic_salary
+
+    @classmethod
+    def record(cls, employee, basic_salary, effective_date, note=''):
+        # Add a revision, then refresh the cached Employee.basic_salary to whatever is in effect today
+        with transaction.atomic():
+            if not cls.objects.filter(employee=employee).exists():
+                # No history yet: keep the stored salary as what applied before this revision
+                stored = Employee.all_objects.only('basic_salary', 'date_of_joining').get(pk=employee.pk)
+                cls.start_history([stored])
+            revision = cls.objects.create(employee=employee, basic_salary=basic_salary,
+                                          effective_date=effective_date, note=note)
+            current = cls.as_of(timezone.now().date(), [employee.pk]).get(employee.pk)
+            if current:
+                Employee.all_objects.filter(pk=employee.pk).update(basic_salary=current['basic_salary'])
+                employee.basic_salary = current['basic_salary']
+        return revision
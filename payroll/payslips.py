@@ -0,0 +1,158 @@
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .models import Payroll, Payslip
+from .rendering import render_batch, render_payslip
+
+PAYSLIP_FIELDS = [
+    'id', 'pay_date', 'status', 'basic_salary', 'allowances', 'deductions', 'net_salary',
+    'employee__first_name', 'employee__last_name', 'employee__employee_id',
+    'employee__department', 'employee__designation',
+]
+
+
+def render_options():
+    return {
+        'company': getattr(settings, 'PAYSLIP_COMPANY_NAME', 'simpleHr'),
+        'font_path': getattr(settings, 'PAYSLIP_FONT_PATH', None),
+    }
+
+
+def period_payrolls(year, month):
+    return Payroll.objects.filter(pay_date__year=year, pay_date__month=month)
+
+
+def payslip_data(row):
+    # Plain, picklable dict for the renderer
+    return {
+        'employee_name': f"{row['employee__first_name']} {row['employee__last_name']}",
+        'employee_id': row['employee__employee_id'],
+        'department': row['employee__department'],
+        'designation': row['employee__designation'],
+        'pay_date': row['pay_date'].strftime('%d %b %Y'),
+        'status': row['status'],
+        'basic_salary': row['basic_salary'],
+        'allowances': row['allowances'],
+        'deductions': row['deductions'],
+        'net_salary': row['net_salary'],
+    }
+
+
+def payslip_name(row):
+    return f"payslips/{row['pay_date']:%Y/%m}/{row['employee__employee_id']}-{row['id']}.pdf"
+
+
+def store_payslips(rendered, names):
+    # rendered: [(payroll id, pdf bytes)]; replaces any earlier file for the same payroll.
+    # Returns the saved Payslip rows as {payroll id: payslip}
+    existing = {slip.payroll_id: slip for slip in Payslip.objects.filter(payroll_id__in=[pk for pk, _ in rendered])}
+    new, saved = [], {}
+    for payroll_id, pdf in rendered:
+        slip = existing.get(payroll_id)
+        if slip and slip.file:
+            slip.file.delete(save=False)
+        if default_storage.exists(names[payroll_id]):
+            default_storage.delete(names[payroll_id])
+        stored = default_storage.save(names[payroll_id], ContentFile(pdf))
+        if slip:
+            slip.file.name = stored
+            slip.save(update_fields=['file', 'rendered_at'])
+        else:
+            slip = Payslip(payroll_id=payroll_id, file=stored)
+            new.append(slip)
+        saved[payroll_id] = slip
+    Payslip.objects.bulk_create(new)
+    return saved
+
+
+def render_period(year, month, workers=None, batch_size=200, force=False, progress=None):
+    """
+    Render payslips for every payroll in a pay period on a process pool.
+    Payrolls that already have a payslip are skipped unless `force`, so an
+    interrupted run picks up where it stopped. Returns the number rendered.
+    """
+    payrolls = period_payrolls(year, month)
+    if not force:
+        payrolls = payrolls.filter(payslip__isnull=True)
+    rows = list(payrolls.order_by('pk').values(*PAYSLIP_FIELDS))
+    if not rows:
+        return 0
+
+    names = {row['id']: payslip_name(row) for row in rows}
+    batches = [
+        [(row['id'], payslip_data(row)) for row in rows[i:i + batch_size]]
+        for i in range(0, len(rows), batch_size)
+    ]
+    options = render_options()
+    workers = workers or getattr(settings, 'PAYSLIP_WORKERS', None) or os.cpu_count() or 1
+
+    done = 0
+
+    def collect(future):
+        rendered = future.result()
+        with transaction.atomic():
+            store_payslips(rendered, names)
+        if progress:
+            progress(done + len(rendered), len(rows))
+        return len(rendered)
+
+    # Stored batch by batch, so finished work survives an interruption; at most
+    # two batches per worker are in flight, which bounds the PDFs held in memory
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(pool.submit(render_batch, batch, **options))
+            if len(in_flight) >= workers * 2:
+                done += collect(in_flight.popleft())
+        while in_flight:
+            done += collect(in_flight.popleft())
+    return done
+
+
+def payslip_for(payroll):
+    # Single payslip, rendered in-process on first request
+    slip = Payslip.objects.filter(payroll=payroll).first()
+    if slip and slip.file:
+        return slip
+    row = Payroll.objects.filter(pk=payroll.pk).values(*PAYSLIP_FIELDS).get()
+    saved = store_payslips([(row['id'], render_payslip(payslip_data(row), **render_options()))], {row['id']: payslip_name(row)})
+    # The row just written, not a re-read (which a lagging replica might not have yet)
+    return saved[row['id']]
+
+
+class ZipStream:
+    # Write-only buffer that ZipFile fills and stream_zip drains after every block
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_zip(payslips, block_size=64 * 1024):
+    # Yields the zip as it is built: one payslip in memory at a time, never the whole archive
+    buffer = ZipStream()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        for slip in payslips:
+            with slip.file.open('rb') as source, archive.open(os.path.basename(slip.file.name), 'w', force_zip64=True) as target:
+                for block in iter(lambda: source.read(block_size), b''):
+                    target.write(block)
+                    yield buffer.drain()
+            yield buffer.drain()
+    yield buffer.drain()
@@ -0,0 +1,114 @@
+# Payslip drawing with Pillow. Kept free of Django imports so process-pool
+# workers only load Pillow; everything a payslip shows is passed in as a dict.
+import io
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+# A4 at 100 dpi
+PAGE_SIZE = (827, 1169)
+MARGIN = 60
+ACCENT = (79, 70, 229)
+TEXT = (31, 41, 55)
+MUTED = (107, 114, 128)
+
+EMPLOYEE_ROWS = [
+    ('Employee', 'employee_name'),
+    ('Employee ID', 'employee_id'),
+    ('Department', 'department'),
+    ('Designation', 'designation'),
+    ('Pay date', 'pay_date'),
+    ('Status', 'status'),
+]
+AMOUNT_ROWS = [
+    ('Basic salary', 'basic_salary'),
+    ('Allowances', 'allowances'),
+    ('Deductions', 'deductions'),
+]
+
+
+@lru_cache(maxsize=None)
+def load_fonts(font_path=None):
+    # Loaded once per process and shared by every payslip it renders
+    def font(size, bold=False):
+        names = [font_path] if font_path else []
+        names += ['DejaVuSans-Bold.ttf' if bold else 'DejaVuSans.ttf', 'Arial Bold.ttf' if bold else 'Arial.ttf']
+        for name in names:
+            try:
+                return ImageFont.truetype(name, size)
+            except OSError:
+                continue
+        return ImageFont.load_default(size)
+
+    return {
+        'title': font(30, bold=True),
+        'heading': font(20, bold=True),
+        'label': font(17),
+        'value': font(17, bold=True),
+        'small': font(13),
+    }
+
+
+@lru_cache(maxsize=8)
+def page_template(company, font_path=None):
+    # Everything that is the same on every payslip: header band, labels, table lines
+    fonts = load_fonts(font_path)
+    page = Image.new('RGB', PAGE_SIZE, 'white')
+    draw = ImageDraw.Draw(page)
+    width = PAGE_SIZE[0]
+
+    draw.rectangle([0, 0, width, 130], fill=ACCENT)
+    draw.text((MARGIN, 38), company, font=fonts['title'], fill='white')
+    draw.text((MARGIN, 82), 'Payslip', font=fonts['heading'], fill='white')
+
+    y = 180
+    for label, _ in EMPLOYEE_ROWS:
+        draw.text((MARGIN, y), label, font=fonts['label'], fill=MUTED)
+        y += 36
+
+    y += 30
+    draw.text((MARGIN, y), 'Earnings & deductions', font=fonts['heading'], fill=TEXT)
+    y += 44
+    draw.line([MARGIN, y - 8, width - MARGIN, y - 8], fill=MUTED, width=1)
+    for label, _ in AMOUNT_ROWS:
+        draw.text((MARGIN, y), label, font=fonts['label'], fill=TEXT)
+        y += 36
+    draw.line([MARGIN, y, width - MARGIN, y], fill=TEXT, width=2)
+    draw.text((MARGIN, y + 14), 'Net salary', font=fonts['heading'], fill=TEXT)
+
+    draw.text((MARGIN, PAGE_SIZE[1] - 60), 'This is a system generated payslip and does not need a signature.',
+              font=fonts['small'], fill=MUTED)
+    return page
+
+
+def render_payslip(data, company='simpleHr', font_path=None):
+    """Render one payslip as PDF bytes. `data` holds the EMPLOYEE_ROWS/AMOUNT_ROWS keys and net_salary."""
+    fonts = load_fonts(font_path)
+    page = page_template(company, font_path).copy()
+    draw = ImageDraw.Draw(page)
+    value_x = MARGIN + 220
+    right = PAGE_SIZE[0] - MARGIN
+
+    y = 180
+    for _, key in EMPLOYEE_ROWS:
+        draw.text((value_x, y), str(data.get(key) or '-'), font=fonts['value'], fill=TEXT)
+        y += 36
+
+    y += 74
+    for _, key in AMOUNT_ROWS:
+        draw.text((right, y), format_amount(data.get(key)), font=fonts['value'], fill=TEXT, anchor='ra')
+        y += 36
+    draw.text((right, y + 14), format_amount(data.get('net_salary')), font=fonts['heading'], fill=ACCENT, anchor='ra')
+
+    output = io.BytesIO()
+    page.save(output, 'PDF', resolution=100.0)
+    return output.getvalue()
+
+
+def render_batch(items, company='simpleHr', font_path=None):
+    # Pool entry point: [(key, data)] -> [(key, pdf bytes)]; one task per batch keeps IPC low
+    return [(key, render_payslip(data, company, font_path)) for key, data in items]
+
+
+def format_amount(value):
+    return f"₹{float(value or 0):,.2f}"
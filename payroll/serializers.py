@@ -14,8 +14,9 @@ class PayrollSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'employee', 'employee_name', 'employee_id',
             'department', 'designation', 'basic_salary', 'allowances', 'deductions',
-            'net_salary', 'status', 'pay_date'
+            'net_salary', 'status', 'pay_date', 'payment_batch'
         ]
+        read_only_fields = ['payment_batch']
 
     def get_employee_name(self, obj):
         return f"{obj.employee.first_name} {obj.employee.last_name}"
\ No newline at end of file
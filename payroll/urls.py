@@ -1,10 +1,15 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PayrollViewSet
+from .views import PayrollViewSet, payroll_stats_async
 
 router = DefaultRouter()
 router.register(r'', PayrollViewSet, basename='payroll')
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
+
+# Under ASGI the stats endpoint is served by its async view (must come before the router)
+if settings.ASYNC_VIEWS:
+    urlpatterns.insert(0, path('payroll_stats/', payroll_stats_async, name='payroll-payroll-stats'))
\ No newline at end of file
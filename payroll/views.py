@@ -4,73 +4,258 @@ from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Sum
+from django.db.models import Q, Sum
+from django.db import IntegrityError, transaction
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from .models import Payroll
+from datetime import date, datetime
+import calendar
+from django.views.decorators.http import require_GET
+from .models import PaymentBatch, Payroll, PayrollMonthlySummary, Payslip, SalaryRevision
+from .payslips import payslip_for, stream_zip
 from .serializers import PayrollSerializer
 from employee.models import Employee  # Import for batch generation
+from employee.filters import active_employee_rows
+from lib_management.async_utils import api_checks, run_in_thread
+from lib_management.db_routing import use_primary
+from notifications.outbox import notify
+from audit.recorder import log, record, snapshot
+
+
+def payroll_stats():
+    # One aggregate over the monthly rollup (months x departments rows), not the Payroll table
+    totals = PayrollMonthlySummary.objects.aggregate(paid=Sum('paid_amount'), pending=Sum('pending_amount'))
+    paid_amount = totals['paid'] or 0
+    pending_amount = totals['pending'] or 0
+    total_payroll = paid_amount + pending_amount
+
+    return [
+        {'label': 'Total Payroll', 'value': f"₹{total_payroll:,.2f}", 'color': '#6366f1', 'icon': 'dollar'},
+        {'label': 'Paid', 'value': f"₹{paid_amount:,.2f}", 'color': '#22c55e', 'icon': 'trending'},
+        {'label': 'Pending', 'value': f"₹{pending_amount:,.2f}", 'color': '#f59e0b', 'icon': 'calendar'},
+    ]
+
+
+def payroll_trends(months=12, department_id=None, today=None):
+    # Last N months (oldest first), zero-filled, straight from PayrollMonthlySummary
+    today = today or timezone.now().date()
+    keys = []
+    year, month = today.year, today.month
+    for _ in range(months):
+        keys.append((year, month))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    keys.reverse()
+
+    summaries = PayrollMonthlySummary.objects.filter(year__gte=keys[0][0], year__lte=keys[-1][0])
+    if department_id:
+        summaries = summaries.filter(department_id=department_id)
+    rows = {
+        (row['year'], row['month']): row
+        for row in summaries.values('year', 'month').annotate(
+            paid=Sum('paid_count'), pending=Sum('pending_count'),
+            paid_amount=Sum('paid_amount'), pending_amount=Sum('pending_amount'))
+    }
+
+    trends = []
+    for year, month in keys:
+        row = rows.get((year, month), {})
+        paid_amount = row.get('paid_amount') or 0
+        pending_amount = row.get('pending_amount') or 0
+        trends.append({
+            'year': year,
+            'month': month,
+            'label': date(year, month, 1).strftime('%b %Y'),
+            'paid': row.get('paid', 0),
+            'pending': row.get('pending', 0),
+            'paid_amount': float(paid_amount),
+            'pending_amount': float(pending_amount),
+            'total_amount': float(paid_amount + pending_amount),
+        })
+    return trends
+
 
 class PayrollViewSet(viewsets.ModelViewSet):
     queryset = Payroll.objects.select_related('employee').all().order_by('-pay_date')
     serializer_class = PayrollSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = active_employee_rows(queryset, self.request)
+        return queryset
+
     # 1. Dashboard Stats (Total, Paid, Pending) - INR Currency
     @action(detail=False, methods=['get'])
     def payroll_stats(self, request):
-        total_payroll = Payroll.objects.aggregate(Sum('net_salary'))['net_salary__sum'] or 0
-        paid_amount = Payroll.objects.filter(status='Paid').aggregate(Sum('net_salary'))['net_salary__sum'] or 0
-        pending_amount = Payroll.objects.filter(status='Pending').aggregate(Sum('net_salary'))['net_salary__sum'] or 0
-
-        stats = [
-            {'label': 'Total Payroll', 'value': f"₹{total_payroll:,.2f}", 'color': '#6366f1', 'icon': 'dollar'},
-            {'label': 'Paid', 'value': f"₹{paid_amount:,.2f}", 'color': '#22c55e', 'icon': 'trending'},
-            {'label': 'Pending', 'value': f"₹{pending_amount:,.2f}", 'color': '#f59e0b', 'icon': 'calendar'},
-        ]
-        return Response(stats)
+        return Response(payroll_stats())
 
     # 2. Run Payroll (Batch Generate for all active employees)
+    # Optional body: {"year": 2024, "month": 3, "recalculate": true} to (re-)run a past month
     @action(detail=False, methods=['post'])
     def run_payroll(self, request):
-        employees = Employee.objects.filter(is_active=True)
-        created_count = 0
-        current_month = timezone.now().month
-        current_year = timezone.now().year
+        today = timezone.now().date()
+        try:
+            year = int(request.data.get('year', today.year))
+            month = int(request.data.get('month', today.month))
+            period_start = date(year, month, 1)
+        except (TypeError, ValueError):
+            return Response({'error': 'year and month must be a valid month'}, status=status.HTTP_400_BAD_REQUEST)
+        period_end = date(year, month, calendar.monthrange(year, month)[1])
+        pay_date = today if (year, month) == (today.year, today.month) else period_end
 
-        for emp in employees:
-            # Check if payroll already exists for this Employee ID this month
-            exists = Payroll.objects.filter(
-                employee=emp, 
-                pay_date__month=current_month,
-                pay_date__year=current_year
-            ).exists()
-
-            if not exists:
-                Payroll.objects.create(
-                    employee=emp, 
-                    basic_salary=emp.basic_salary or 5000,
-                    allowances=500, 
-                    deductions=200, 
-                    status='Pending'
-                )
-                created_count += 1
-                
-        if created_count > 0:
-            return Response({'message': f'Successfully generated payroll for {created_count} employees.'})
+        # Everyone employed during the period, including people archived since
+        employees = Employee.all_objects.filter(date_of_joining__lte=period_end).filter(
+            Q(is_active=True) | Q(archived_at__date__gte=period_start))
+        # Salaries in effect at the end of the period, one query for the whole cohort
+        salaries = SalaryRevision.as_of(period_end, employees)
+
+        def salary_for(emp):
+            revision = salaries.get(emp.pk)
+            return revision['basic_salary'] if revision else (emp.basic_salary or 5000)
+
+        period = Payroll.objects.filter(pay_date__year=year, pay_date__month=month)
+        recalculated = []
+        if str(request.data.get('recalculate', '')).lower() in ('1', 'true', 'yes'):
+            # Pending rows are re-priced from the salary history; paid rows are left as paid
+            for payroll in period.filter(status='Pending').select_related('employee'):
+                payroll.basic_salary = salary_for(payroll.employee)
+                payroll.prepare()
+                recalculated.append(payroll)
+
+        # One query for who already has payroll this month, one INSERT for everyone else
+        payrolls = []
+        for emp in employees.exclude(pk__in=period.values('employee_id')):
+            payroll = Payroll(
+                employee=emp,
+                basic_salary=salary_for(emp),
+                allowances=500,
+                deductions=200,
+                status='Pending',
+                pay_date=pay_date,
+            )
+            payroll.prepare()
+            payrolls.append(payroll)
+
+        with transaction.atomic():
+            Payroll.objects.bulk_create(payrolls, batch_size=500)
+            Payroll.objects.bulk_update(recalculated, ['basic_salary', 'net_salary'], batch_size=500)
+            Payslip.objects.filter(payroll__in=recalculated).delete()
+            # bulk writes skip save(), so refresh this month's summary in one pass
+            PayrollMonthlySummary.rebuild_month(year, month)
+            # One outbox row for the whole run; the notification worker fans it out
+            notify('payroll.generated', f"Your payroll for {year}-{month:02d} is ready",
+                   [payroll.employee_id for payroll in payrolls + recalculated],
+                   body=f"Payroll for {year}-{month:02d} has been generated. Your payslip is available in simpleHr.",
+                   payload={'year': year, 'month': month})
+        created_count = len(payrolls)
+
+        if created_count > 0 or recalculated:
+            return Response({
+                'message': f'Successfully generated payroll for {created_count} employees.',
+                'period': f'{year}-{month:02d}',
+                'created': created_count,
+                'recalculated': len(recalculated),
+            })
         else:
-            return Response({'message': 'Payroll for this month is up to date.'})
+            return Response({'message': 'Payroll for this month is up to date.', 'period': f'{year}-{month:02d}'})
 
     # 3. Mark payroll as Paid
     @action(detail=True, methods=['post', 'patch'])
     def mark_paid(self, request, pk=None):
+        with transaction.atomic():
+            row = Payroll.objects.select_for_update().filter(pk=pk).values(*PayrollMonthlySummary.SOURCE_FIELDS).first()
+            if row is None:
+                return Response({'error': 'Payroll not found'}, status=status.HTTP_404_NOT_FOUND)
+            # Status-only UPDATE: no reload, no net_salary recomputation; paying twice is a no-op
+            if row['status'] != 'Paid':
+                Payroll.objects.filter(pk=pk).update(status='Paid')
+                PayrollMonthlySummary.apply(row, -1)
+                PayrollMonthlySummary.apply({**row, 'status': 'Paid'}, 1)
+                Payslip.objects.filter(payroll_id=pk).delete()
+        return Response({'message': f'Payroll #{pk} marked as Paid.', 'status': 'Paid'})
+
+    # 3b. Pay many payrolls at once. Body: {"idempotency_key": "...", "year": 2024, "month": 3,
+    # "department_id": 2, "ids": [1, 2]} (any combination of filters; the key may also be sent
+    # as an Idempotency-Key header). Retrying with the same key returns the first result.
+    @action(detail=False, methods=['post'])
+    def pay_batch(self, request):
+        key = request.headers.get('Idempotency-Key') or request.data.get('idempotency_key')
+        if not key:
+            return Response({'error': 'idempotency_key is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        criteria = {name: request.data.get(name) for name in ('year', 'month', 'department_id', 'ids') if request.data.get(name)}
+        if not criteria:
+            return Response({'error': 'Select payrolls with year/month, department_id or ids'}, status=status.HTTP_400_BAD_REQUEST)
+
+        payrolls = Payroll.objects.all()
         try:
-            payroll = Payroll.objects.get(pk=pk)
-            payroll.status = 'Paid'
-            payroll.save()
-            return Response({'message': f'Payroll #{pk} marked as Paid.', 'status': 'Paid'})
-        except Payroll.DoesNotExist:
-            return Response({'error': 'Payroll not found'}, status=status.HTTP_404_NOT_FOUND)
-
-    # 4. Update basic salary for an employee
+            if 'year' in criteria:
+                payrolls = payrolls.filter(pay_date__year=int(criteria['year']))
+            if 'month' in criteria:
+                payrolls = payrolls.filter(pay_date__month=int(criteria['month']))
+            if 'department_id' in criteria:
+                payrolls = payrolls.filter(department_id=int(criteria['department_id']))
+            if 'ids' in criteria:
+                payrolls = payrolls.filter(pk__in=[int(pk) for pk in criteria['ids']])
+        except (TypeError, ValueError):
+            return Response({'error': 'year, month, department_id and ids must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        existing = PaymentBatch.objects.filter(idempotency_key=key).first()
+        if existing is None:
+            try:
+                with transaction.atomic():
+                    batch = PaymentBatch.objects.create(idempotency_key=key, criteria=criteria)
+                    batch.pay(payrolls)
+                return Response(batch.report(), status=status.HTTP_201_CREATED)
+            except IntegrityError:
+                # A concurrent retry with the same key won the race
+                existing = PaymentBatch.objects.get(idempotency_key=key)
+
+        if existing.criteria != criteria:
+            return Response({'error': 'idempotency_key was already used for a different selection'}, status=status.HTTP_409_CONFLICT)
+        return Response({**existing.report(), 'replayed': True})
+
+    # 4. Monthly trends (?months=12&department_id=3)
+    @action(detail=False, methods=['get'])
+    def trends(self, request):
+        try:
+            months = min(max(int(request.query_params.get('months', 12)), 1), 120)
+        except ValueError:
+            months = 12
+        try:
+            department_id = int(request.query_params['department_id']) if request.query_params.get('department_id') else None
+        except ValueError:
+            return Response({'error': 'department_id must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(payroll_trends(months, department_id))
+
+    # 5. Payslip PDF for one payroll (rendered on first request). On the primary: the GET may
+    # write the payslip, and a replica could still list a file that was just replaced
+    @use_primary
+    @action(detail=True, methods=['get'])
+    def payslip(self, request, pk=None):
+        slip = payslip_for(self.get_object())
+        return FileResponse(slip.file.open('rb'), as_attachment=True, filename=slip.file.name.rsplit('/', 1)[-1])
+
+    # 6. Zip of every rendered payslip in a pay period (?year=2024&month=12), streamed.
+    # Render the period first with `manage.py render_payslips --year 2024 --month 12`.
+    @action(detail=False, methods=['get'])
+    def payslips(self, request):
+        today = timezone.now().date()
+        try:
+            year = int(request.query_params.get('year', today.year))
+            month = int(request.query_params.get('month', today.month))
+        except ValueError:
+            return Response({'error': 'year and month must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        slips = Payslip.objects.filter(payroll__pay_date__year=year, payroll__pay_date__month=month).order_by('payroll_id')
+        if not slips.exists():
+            return Response({'error': f'No payslips rendered for {year}-{month:02d}'}, status=status.HTTP_404_NOT_FOUND)
+
+        response = StreamingHttpResponse(stream_zip(slips.iterator()), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="payslips-{year}-{month:02d}.zip"'
+        return response
+
+    # 7. Update basic salary for an employee (optionally from a past or future "effective_date")
     @action(detail=False, methods=['post'])
     def update_salary(self, request):
         employee_id = request.data.get('employee_id')  # e.g. "EMP006"
@@ -79,14 +264,69 @@ class PayrollViewSet(viewsets.ModelViewSet):
         if not employee_id or not new_salary:
             return Response({'error': 'employee_id and basic_salary are required'}, status=status.HTTP_400_BAD_REQUEST)
 
+        effective_date = timezone.now().date()
+        if request.data.get('effective_date'):
+            try:
+                effective_date = datetime.strptime(str(request.data['effective_date']), "%Y-%m-%d").date()
+            except ValueError:
+                return Response({'error': 'effective_date must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             emp = Employee.objects.get(employee_id=employee_id)
-            emp.basic_salary = new_salary
-            emp.save()
+            before = snapshot(emp, ['basic_salary'])
+            with transaction.atomic():
+                revision = SalaryRevision.record(emp, new_salary, effective_date, note=request.data.get('note', ''))
+                # A future-dated revision leaves the current salary alone; the revision itself is always logged
+                log('employee.employee', emp.pk, {
+                    'salary_revision': [None, {'id': revision.pk, 'basic_salary': revision.basic_salary,
+                                               'effective_date': revision.effective_date, 'note': revision.note}],
+                })
+                record(emp, before)
             return Response({
                 'message': f'Basic salary updated for {emp.first_name} {emp.last_name}',
                 'employee_id': employee_id,
-                'basic_salary': f'₹{new_salary}'
+                'basic_salary': f'₹{new_salary}',
+                'effective_date': str(revision.effective_date),
+                'current_salary': f'₹{emp.basic_salary}',
             })
         except Employee.DoesNotExist:
-            return Response({'error': 'Employee not found'}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+            return Response({'error': 'Employee not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    # 8. Salary history of one employee (?employee_id=EMP006)
+    @action(detail=False, methods=['get'])
+    def salary_history(self, request):
+        revisions = SalaryRevision.objects.filter(employee__employee_id=request.query_params.get('employee_id'))
+        return Response([
+            {'basic_salary': rev.basic_salary, 'effective_date': rev.effective_date, 'note': rev.note, 'recorded_at': rev.created_at}
+            for rev in revisions
+        ])
+
+    # 9. Salary of every active employee as of a date (?date=2024-03-31, default today)
+    @action(detail=False, methods=['get'])
+    def salary_report(self, request):
+        try:
+            on_date = datetime.strptime(request.query_params.get('date', ''), "%Y-%m-%d").date()
+        except ValueError:
+            on_date = timezone.now().date()
+
+        employees = Employee.objects.filter(date_of_joining__lte=on_date).order_by('employee_id')
+        salaries = SalaryRevision.as_of(on_date, employees)
+        report = []
+        for emp in employees:
+            revision = salaries.get(emp.pk, {})
+            report.append({
+                'employee_id': emp.employee_id,
+                'name': f"{emp.first_name} {emp.last_name}",
+                'department': emp.department,
+                'basic_salary': revision.get('basic_salary', emp.basic_salary),
+                'effective_date': revision.get('effective_date'),
+            })
+        return Response({'date': str(on_date), 'results': report})
+
+
+# Async version of payroll_stats (served under ASGI)
+@require_GET
+@api_checks()
+async def payroll_stats_async(request):
+    stats = await run_in_thread(payroll_stats)
+    return JsonResponse(stats, safe=False, json_dumps_params={'ensure_ascii': False})
\ No newline at end of file
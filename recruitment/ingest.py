@@ -0,0 +1,194 @@
+import re
+from datetime import datetime
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .models import PIPELINE_STAGES, Application, HiringMonth, JobPosting, PipelineCounter
+
+MAX_REPORTED_ERRORS = 1000
+NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_email(value):
+    return (value or '').strip().lower()
+
+
+def normalize_phone(value):
+    # Digits only; the last 10 so "+91 98765-43210" and "9876543210" match
+    digits = NON_DIGITS.sub('', value or '')
+    return digits[-10:]
+
+
+def grouped_increment(queryset, field, increments):
+    # One UPDATE for many rows: field = field + CASE pk WHEN .. THEN n .. END
+    if not increments:
+        return
+    queryset.filter(pk__in=list(increments)).update(**{field: F(field) + Case(
+        *[When(pk=pk, then=Value(amount)) for pk, amount in increments.items()],
+        default=Value(0), output_field=IntegerField(),
+    )})
+
+
+class ApplicantIngester:
+    """
+    Stream applicants from a job-board feed into Application rows, chunk by chunk.
+    Duplicates (same posting and same normalized email or phone, either already
+    stored or earlier in the feed) are skipped using an in-memory index, loaded
+    with one query per chunk for the postings it names that are not loaded yet.
+    Counters are moved with grouped UPDATEs per chunk.
+    """
+
+    def __init__(self, job_id=None, chunk_size=1000, dry_run=False):
+        self.default_job = int(job_id) if job_id else None
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.created = 0
+        self.duplicates = 0
+        self.error_count = 0
+        self.errors = []
+
+        self.jobs = set(JobPosting.objects.values_list('id', flat=True))
+        # (job, normalized email) and (job, normalized phone) already applied, for the postings in loaded_jobs
+        self.seen = set()
+        self.loaded_jobs = set()
+
+    def _load_existing(self, job_ids):
+        # Rows may name any posting, not just ?job=: fetch each posting's applicants the first time it appears
+        job_ids = set(job_ids) - self.loaded_jobs
+        if not job_ids:
+            return
+        existing = Application.objects.filter(job_id__in=job_ids)
+        for job_id, email, phone in existing.values_list('job_id', 'email', 'phone').iterator(chunk_size=5000):
+            self._remember(job_id, normalize_email(email), normalize_phone(phone))
+        self.loaded_jobs |= job_ids
+
+    def run(self, rows):
+        numbered = enumerate(rows, start=1)
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                break
+            self._ingest_chunk(chunk)
+        return self.report()
+
+    def report(self):
+        return {
+            'created': self.created,
+            'duplicates': self.duplicates,
+            'failed': self.error_count,
+            'errors': self.errors,
+            'dry_run': self.dry_run,
+        }
+
+    def _remember(self, job_id, email, phone):
+        if email:
+            self.seen.add((job_id, 'email', email))
+        if phone:
+            self.seen.add((job_id, 'phone', phone))
+
+    def _is_duplicate(self, job_id, email, phone):
+        return (email and (job_id, 'email', email) in self.seen) or (phone and (job_id, 'phone', phone) in self.seen)
+
+    def _error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'errors': errors})
+
+    def _parse(self, row_number, row):
+        if not isinstance(row, dict):
+            self._error(row_number, {'non_field_errors': ['Row must be an object']})
+            return None
+
+        errors = {}
+        name = (row.get('candidate_name') or row.get('name') or '').strip()
+        if not name:
+            errors['candidate_name'] = ['This field is required.']
+        email = normalize_email(row.get('email'))
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors['email'] = ['Enter a valid email address.']
+        try:
+            job_id = int(row.get('job') or row.get('job_id') or self.default_job or 0)
+        except (TypeError, ValueError):
+            job_id = 0
+        if job_id not in self.jobs:
+            errors['job'] = ['Unknown job posting.']
+        stage = (row.get('stage') or 'Applied').strip().title()
+        if stage not in dict(Application.STAGE_CHOICES):
+            errors['stage'] = [f'"{stage}" is not a valid stage.']
+        applied_at = timezone.now()
+        if row.get('applied_at'):
+            try:
+                applied_at = datetime.fromisoformat(str(row['applied_at']))
+                if timezone.is_naive(applied_at):
+                    applied_at = timezone.make_aware(applied_at)
+            except ValueError:
+                errors['applied_at'] = ['Use an ISO date/time, e.g. 2024-03-01 or 2024-03-01T10:00:00.']
+        if errors:
+            self._error(row_number, errors)
+            return None
+
+        phone = str(row.get('phone') or '').strip()[:20]
+        return Application(
+            job_id=job_id, candidate_name=name[:200], email=email, phone=phone, stage=stage,
+            furthest_stage=PIPELINE_STAGES.index(stage) if stage in PIPELINE_STAGES else 0,
+            applied_at=applied_at, stage_changed_at=timezone.now(),
+            hired_at=timezone.now() if stage == 'Hired' else None,
+        )
+
+    def _ingest_chunk(self, chunk):
+        parsed = []
+        for row_number, row in chunk:
+            application = self._parse(row_number, row)
+            if application is not None:
+                parsed.append(application)
+        self._load_existing(application.job_id for application in parsed)
+
+        new = []
+        for application in parsed:
+            phone = normalize_phone(application.phone)
+            if self._is_duplicate(application.job_id, application.email, phone):
+                self.duplicates += 1
+                continue
+            self._remember(application.job_id, application.email, phone)
+            new.append(application)
+
+        if new and not self.dry_run:
+            with transaction.atomic():
+                Application.objects.bulk_create(new, batch_size=1000)
+                self._count(new)
+        self.created += len(new)
+
+    def _count(self, applications):
+        # bulk_create skips Application.save(): move the counters for the whole chunk at once
+        per_job, current, reached = {}, {}, {}
+        for application in applications:
+            per_job[application.job_id] = per_job.get(application.job_id, 0) + 1
+            key = (application.job_id, application.stage)
+            current[key] = current.get(key, 0) + 1
+            for index in range(application.furthest_stage + 1):
+                key = (application.job_id, PIPELINE_STAGES[index])
+                reached[key] = reached.get(key, 0) + 1
+
+        grouped_increment(JobPosting.objects.all(), 'applicants_count', per_job)
+
+        counter_ids = {
+            (job_id, stage): pk for pk, job_id, stage in
+            PipelineCounter.objects.filter(job_id__in=list(per_job)).values_list('id', 'job_id', 'stage')
+        }
+        missing = [key for key in set(current) | set(reached) if key not in counter_ids]
+        for job_id, stage in missing:
+            counter, _ = PipelineCounter.objects.get_or_create(job_id=job_id, stage=stage)
+            counter_ids[job_id, stage] = counter.pk
+        grouped_increment(PipelineCounter.objects.all(), 'current', {counter_ids[key]: n for key, n in current.items()})
+        grouped_increment(PipelineCounter.objects.all(), 'reached', {counter_ids[key]: n for key, n in reached.items()})
+
+        for application in applications:
+            if application.hired_at:
+                HiringMonth.bump(application.job_id, application.hired_at, application.applied_at, 1)
@@ -0,0 +1,41 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employee.bulk_import import iter_rows
+from recruitment.ingest import ApplicantIngester
+
+
+class Command(BaseCommand):
+    help = "Ingest a job-board applicant feed (CSV or NDJSON, '-' reads stdin), skipping duplicates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--job', type=int, help='Posting for rows without a job column')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, write nothing')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+
+        try:
+            handle = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        except OSError as e:
+            raise CommandError(f"Cannot open {path}: {e}")
+
+        with handle:
+            try:
+                ingester = ApplicantIngester(job_id=options['job'], chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+                report = ingester.run(iter_rows(handle, fmt))
+            except ValueError as e:
+                raise CommandError(f"Could not read {path}: {e}")
+
+        for error in report['errors']:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'], default=str)}")
+        summary = f"created {report['created']}, duplicates {report['duplicates']}, failed {report['failed']}"
+        if report['dry_run']:
+            summary += " (dry run, nothing written)"
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruitment.models import Resume
+from recruitment.resumes import process_pending
+
+
+class Command(BaseCommand):
+    help = "Extract and index queued resumes on a process pool. Safe to run several at once."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help="Default: RESUME_WORKERS or the CPU count")
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--limit', type=int, help="Stop after claiming this many resumes")
+        parser.add_argument('--reclaim-after', type=int, default=30,
+                            help="Minutes after which a resume stuck in Processing is picked up again")
+        parser.add_argument('--retry-failed', action='store_true', help="Queue failed resumes again first")
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new uploads")
+        parser.add_argument('--sleep', type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            requeued = Resume.objects.filter(status='Failed').update(status='Pending', error='')
+            self.stdout.write(f"Re-queued {requeued} failed resumes.")
+
+        def progress(done, failed):
+            self.stdout.write(f"  {done} indexed, {failed} failed")
+
+        while True:
+            done, failed = process_pending(workers=options['workers'], batch_size=options['batch_size'],
+                                           reclaim_after_minutes=options['reclaim_after'],
+                                           limit=options['limit'], progress=progress)
+            if done or failed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f"Indexed {done} resumes, {failed} failed."))
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from recruitment.models import JobPosting, PipelineCounter
+
+
+class Command(BaseCommand):
+    help = "Rebuild pipeline stage counters, hiring months and applicants_count from the Application table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, action='append', help="Posting id (repeatable); default all")
+
+    def handle(self, *args, **options):
+        job_ids = options['job'] or list(JobPosting.objects.values_list('id', flat=True))
+        PipelineCounter.rebuild(job_ids)
+        self.stdout.write(self.style.SUCCESS(f"Recounted {len(job_ids)} job postings."))
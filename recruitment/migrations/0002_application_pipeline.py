@@ -0,0 +1,79 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+STAGES = ['Applied', 'Screening', 'Interview', 'Offer', 'Hired', 'Rejected']
+
+
+def create_counters(apps, schema_editor):
+    # Existing postings get zeroed stage counters; their hand-entered applicants_count is kept
+    JobPosting = apps.get_model('recruitment', 'JobPosting')
+    PipelineCounter = apps.get_model('recruitment', 'PipelineCounter')
+    PipelineCounter.objects.bulk_create([
+        PipelineCounter(job_id=job_id, stage=stage)
+        for job_id in JobPosting.objects.values_list('id', flat=True)
+        for stage in STAGES
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HiringMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('hires', models.IntegerField(default=0)),
+                ('days_to_hire', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hiring_months', to='recruitment.jobposting')),
+            ],
+            options={
+                'ordering': ['year', 'month'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PipelineCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(choices=[('Applied', 'Applied'), ('Screening', 'Screening'), ('Interview', 'Interview'), ('Offer', 'Offer'), ('Hired', 'Hired'), ('Rejected', 'Rejected')], max_length=20)),
+                ('current', models.IntegerField(default=0)),
+                ('reached', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pipeline_counters', to='recruitment.jobposting')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Application',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('candidate_name', models.CharField(max_length=200)),
+                ('email', models.EmailField(max_length=254)),
+                ('phone', models.CharField(blank=True, default='', max_length=20)),
+                ('stage', models.CharField(choices=[('Applied', 'Applied'), ('Screening', 'Screening'), ('Interview', 'Interview'), ('Offer', 'Offer'), ('Hired', 'Hired'), ('Rejected', 'Rejected')], default='Applied', max_length=20)),
+                ('furthest_stage', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('applied_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('stage_changed_at', models.DateTimeField(auto_now_add=True)),
+                ('hired_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='recruitment.jobposting')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'stage'], name='application_job_stage_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='hiringmonth',
+            constraint=models.UniqueConstraint(fields=('job', 'year', 'month'), name='hiring_month_job_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='pipelinecounter',
+            constraint=models.UniqueConstraint(fields=('job', 'stage'), name='pipeline_counter_job_stage_uniq'),
+        ),
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
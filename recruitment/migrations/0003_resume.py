@@ -0,0 +1,66 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+SEARCH_INDEX_SQL = "CREATE INDEX IF NOT EXISTS resume_text_gin ON recruitment_resume USING gin (to_tsvector('simple', text))"
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(SEARCH_INDEX_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS resume_text_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0002_application_pipeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Resume',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('candidate_name', models.CharField(blank=True, default='', max_length=200)),
+                ('file', models.FileField(max_length=200, upload_to='resumes/%Y/%m/')),
+                ('original_name', models.CharField(blank=True, default='', max_length=200)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Processing', 'Processing'), ('Done', 'Done'), ('Failed', 'Failed')], default='Pending', max_length=20)),
+                ('error', models.CharField(blank=True, default='', max_length=500)),
+                ('text', models.TextField(blank=True, default='', editable=False)),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('claimed_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resumes', to='recruitment.application')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumes', to='recruitment.jobposting')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResumeToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=60)),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='recruitment.jobposting')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='recruitment.resume')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['status', 'uploaded_at'], name='resume_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['job', 'status'], name='resume_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resumetoken',
+            index=models.Index(fields=['job', 'token'], name='resume_token_job_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,4 +1,13 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from employee.models import search_tokens
+
+# Funnel order; Rejected can happen at any point and sits outside it
+PIPELINE_STAGES = ['Applied', 'Screening', 'Interview', 'Offer', 'Hired']
+IN_PROGRESS_STAGES = ['Applied', 'Screening', 'Interview', 'Offer']
+
 
 class JobPosting(models.Model):
     STATUS_CHOICES = [
@@ -11,9 +20,269 @@ class JobPosting(models.Model):
     department = models.CharField(max_length=100)
     location = models.CharField(max_length=100)
     job_type = models.CharField(max_length=50) # e.g. Full-time, Contract
+    # Maintained by Application.save()/delete()
     applicants_count = models.IntegerField(default=0)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Active')
     posted_date = models.DateField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        is_new = self.pk is None
+        super().save(*args, **kwargs)
+        if is_new:
+            PipelineCounter.objects.bulk_create([PipelineCounter(job=self, stage=stage) for stage, _ in Application.STAGE_CHOICES])
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+class Application(models.Model):
+    STAGE_CHOICES = [(stage, stage) for stage in PIPELINE_STAGES] + [('Rejected', 'Rejected')]
+
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='applications')
+    candidate_name = models.CharField(max_length=200)
+    email = models.EmailField()
+    phone = models.CharField(max_length=20, blank=True, default='')
+    stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default='Applied')
+    # Index into PIPELINE_STAGES of the furthest stage reached, so moving back and forth counts once
+    furthest_stage = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    applied_at = models.DateTimeField(default=timezone.now)
+    stage_changed_at = models.DateTimeField(auto_now_add=True)
+    hired_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', 'stage'], name='application_job_stage_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate_name} - {self.job.title} ({self.stage})"
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            # 1. What the counters currently reflect for this application
+            old = None
+            if self.pk:
+                old = Application.objects.select_for_update().filter(pk=self.pk).values(
+                    'job_id', 'stage', 'furthest_stage', 'hired_at', 'applied_at').first()
+
+            previous_furthest = old['furthest_stage'] if old and old['job_id'] == self.job_id else -1
+            if self.stage in PIPELINE_STAGES:
+                self.furthest_stage = max(previous_furthest, PIPELINE_STAGES.index(self.stage))
+            else:
+                self.furthest_stage = max(previous_furthest, 0)
+            if old is None or old['stage'] != self.stage:
+                self.stage_changed_at = timezone.now()
+            if self.stage == 'Hired' and self.hired_at is None:
+                self.hired_at = timezone.now()
+            elif self.stage != 'Hired':
+                self.hired_at = None
+
+            super().save(*args, **kwargs)
+
+            # 2. Move the counters
+            if old and old['job_id'] != self.job_id:
+                # Moved to another posting: take it out of the old one completely
+                self._count(old['job_id'], old['stage'], old['furthest_stage'], old['hired_at'], old['applied_at'], -1)
+                old = None
+            if old is None:
+                self._count(self.job_id, self.stage, self.furthest_stage, self.hired_at, self.applied_at, 1)
+                return
+
+            if old['stage'] != self.stage:
+                PipelineCounter.bump(self.job_id, old['stage'], current=-1)
+                PipelineCounter.bump(self.job_id, self.stage, current=1)
+            for index in range(old['furthest_stage'] + 1, self.furthest_stage + 1):
+                PipelineCounter.bump(self.job_id, PIPELINE_STAGES[index], reached=1)
+            if old['hired_at'] and not self.hired_at:
+                HiringMonth.bump(self.job_id, old['hired_at'], old['applied_at'], -1)
+            elif self.hired_at and not old['hired_at']:
+                HiringMonth.bump(self.job_id, self.hired_at, self.applied_at, 1)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            old = Application.objects.select_for_update().filter(pk=self.pk).values(
+                'job_id', 'stage', 'furthest_stage', 'hired_at', 'applied_at').first()
+            result = super().delete(*args, **kwargs)
+            if old:
+                self._count(old['job_id'], old['stage'], old['furthest_stage'], old['hired_at'], old['applied_at'], -1)
+            return result
+
+    @staticmethod
+    def _count(job_id, stage, furthest_stage, hired_at, applied_at, sign):
+        # Add (sign=1) or remove (sign=-1) one application from every counter it contributes to
+        JobPosting.objects.filter(pk=job_id).update(applicants_count=F('applicants_count') + sign)
+        PipelineCounter.bump(job_id, stage, current=sign)
+        for index in range(furthest_stage + 1):
+            PipelineCounter.bump(job_id, PIPELINE_STAGES[index], reached=sign)
+        if hired_at:
+            HiringMonth.bump(job_id, hired_at, applied_at, sign)
+
+
+class PipelineCounter(models.Model):
+    """
+    Per posting and stage: applications currently at the stage, and how many
+    ever reached it (the funnel). Kept up to date by Application.save()/delete().
+    """
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='pipeline_counters')
+    stage = models.CharField(max_length=20, choices=Application.STAGE_CHOICES)
+    current = models.IntegerField(default=0)
+    reached = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'stage'], name='pipeline_counter_job_stage_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id}/{self.stage}: {self.current} now, {self.reached} reached"
+
+    @classmethod
+    def bump(cls, job_id, stage, current=0, reached=0):
+        if not (current or reached):
+            return
+        updated = cls.objects.filter(job_id=job_id, stage=stage).update(
+            current=F('current') + current, reached=F('reached') + reached)
+        if not updated:
+            # Posting created before counters existed
+            counter, _ = cls.objects.get_or_create(job_id=job_id, stage=stage)
+            cls.objects.filter(pk=counter.pk).update(current=F('current') + current, reached=F('reached') + reached)
+
+    @classmethod
+    def rebuild(cls, job_ids):
+        # Recompute stage counters, hiring months and applicants_count from the applications (bulk paths, repairs)
+        job_ids = list(job_ids)
+        with transaction.atomic():
+            grouped = (Application.objects.filter(job_id__in=job_ids).order_by()
+                       .values('job_id', 'stage', 'furthest_stage').annotate(count=Count('id')))
+            counters = {(job_id, stage): cls(job_id=job_id, stage=stage) for job_id in job_ids for stage, _ in Application.STAGE_CHOICES}
+            totals = dict.fromkeys(job_ids, 0)
+            for row in grouped:
+                counters[row['job_id'], row['stage']].current += row['count']
+                for index in range(row['furthest_stage'] + 1):
+                    counters[row['job_id'], PIPELINE_STAGES[index]].reached += row['count']
+                totals[row['job_id']] += row['count']
+            cls.objects.filter(job_id__in=job_ids).delete()
+            cls.objects.bulk_create(counters.values(), batch_size=1000)
+
+            months = {}
+            hired = Application.objects.filter(job_id__in=job_ids, hired_at__isnull=False).values_list('job_id', 'hired_at', 'applied_at')
+            for job_id, hired_at, applied_at in hired.iterator():
+                month = months.setdefault((job_id, hired_at.year, hired_at.month),
+                                          HiringMonth(job_id=job_id, year=hired_at.year, month=hired_at.month))
+                month.hires += 1
+                month.days_to_hire += max((hired_at - applied_at).days, 0)
+            HiringMonth.objects.filter(job_id__in=job_ids).delete()
+            HiringMonth.objects.bulk_create(months.values(), batch_size=1000)
+
+            postings = list(JobPosting.objects.filter(pk__in=job_ids))
+            for posting in postings:
+                posting.applicants_count = totals[posting.pk]
+            JobPosting.objects.bulk_update(postings, ['applicants_count'])
+
+
+class HiringMonth(models.Model):
+    # Hires per posting and month, with the summed applied->hired days for time-to-hire
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='hiring_months')
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    hires = models.IntegerField(default=0)
+    days_to_hire = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['year', 'month']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'year', 'month'], name='hiring_month_job_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} {self.year}-{self.month:02d}: {self.hires} hires"
+
+    @classmethod
+    def bump(cls, job_id, hired_at, applied_at, sign):
+        days = max((hired_at - applied_at).days, 0)
+        month, _ = cls.objects.get_or_create(job_id=job_id, year=hired_at.year, month=hired_at.month)
+        cls.objects.filter(pk=month.pk).update(hires=F('hires') + sign, days_to_hire=F('days_to_hire') + days * sign)
+
+
+class Resume(models.Model):
+    # Uploaded against a posting; text extraction and indexing run in `manage.py process_resumes`
+    STATUS_CHOICES = [
+        ('Pending', 'Pending'),
+        ('Processing', 'Processing'),
+        ('Done', 'Done'),
+        ('Failed', 'Failed'),
+    ]
+
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='resumes')
+    application = models.ForeignKey(Application, on_delete=models.SET_NULL, null=True, blank=True, related_name='resumes')
+    candidate_name = models.CharField(max_length=200, blank=True, default='')
+    file = models.FileField(upload_to='resumes/%Y/%m/', max_length=200)
+    original_name = models.CharField(max_length=200, blank=True, default='')
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    error = models.CharField(max_length=500, blank=True, default='')
+    # Extracted plain text, searched through resume_text_gin on Postgres and ResumeToken elsewhere
+    text = models.TextField(blank=True, default='', editable=False)
+    uploaded_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    processed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'uploaded_at'], name='resume_status_idx'),
+            models.Index(fields=['job', 'status'], name='resume_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate_name or self.original_name} ({self.job_id}, {self.status})"
+
+    @classmethod
+    def store_text(cls, results):
+        # results: [(resume pk, text, error)] from the extraction workers
+        now = timezone.now()
+        resumes = cls.objects.in_bulk([pk for pk, _, _ in results])
+        done = []
+        for pk, text, error in results:
+            resume = resumes.get(pk)
+            if resume is None:
+                continue
+            resume.text = text
+            resume.error = error
+            resume.status = 'Failed' if error else 'Done'
+            resume.processed_at = now
+            done.append(resume)
+        with transaction.atomic():
+            cls.objects.bulk_update(done, ['text', 'error', 'status', 'processed_at'])
+            # Postgres searches Resume.text through its GIN index; other backends use the token table
+            if connection.vendor != 'postgresql':
+                ResumeToken.reindex(done)
+        return done
+
+
+class ResumeToken(models.Model):
+    # Inverted index for resume search on MySQL/SQLite: one row per distinct word per resume
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='tokens')
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='+')
+    token = models.CharField(max_length=60)
+    count = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', 'token'], name='resume_token_job_idx'),
+        ]
+
+    def __str__(self):
+        return self.token
+
+    @classmethod
+    def reindex(cls, resumes):
+        cls.objects.filter(resume__in=resumes).delete()
+        tokens = []
+        for resume in resumes:
+            counts = {}
+            for token in search_tokens(resume.text):
+                if 1 < len(token) <= 60:
+                    counts[token] = counts.get(token, 0) + 1
+            tokens += [cls(resume=resume, job_id=resume.job_id, token=token, count=count) for token, count in counts.items()]
+        cls.objects.bulk_create(tokens, batch_size=2000)
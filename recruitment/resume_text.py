@@ -0,0 +1,119 @@
+# Plain-text extraction for uploaded resumes using only the standard library.
+# Kept free of Django imports so process-pool workers stay light.
+import io
+import re
+import zipfile
+import zlib
+from html import unescape
+from html.parser import HTMLParser
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt', '.md', '.rtf', '.html', '.htm')
+MAX_TEXT_LENGTH = 200000
+
+PDF_STREAM = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+PDF_TEXT_BLOCK = re.compile(rb'BT(.*?)ET', re.S)
+PDF_STRING = re.compile(rb'\((?:\\.|[^\\()])*\)|<[0-9A-Fa-f\s]+>')
+PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'', b'f': b'', b'(': b'(', b')': b')', b'\\': b'\\'}
+DOCX_TEXT = re.compile(r'<w:t[^>]*>([^<]*)</w:t>|</w:p>')
+RTF_CONTROL = re.compile(r'\\[a-z]+-?\d* ?|[{}]|\\\'[0-9a-f]{2}')
+WHITESPACE = re.compile(r'[ \t\r\f\v]+')
+
+
+def extract_text(data, extension):
+    """Best-effort text of a resume file (bytes); raises ValueError for unsupported types."""
+    extension = extension.lower()
+    if extension == '.pdf':
+        text = pdf_text(data)
+    elif extension == '.docx':
+        text = docx_text(data)
+    elif extension in ('.html', '.htm'):
+        text = html_text(decode(data))
+    elif extension == '.rtf':
+        text = RTF_CONTROL.sub(' ', decode(data))
+    elif extension in ('.txt', '.md'):
+        text = decode(data)
+    else:
+        raise ValueError(f"Unsupported resume type {extension}")
+    lines = (WHITESPACE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)[:MAX_TEXT_LENGTH]
+
+
+def extract_batch(items):
+    # Pool entry point: [(key, bytes, extension)] -> [(key, text, error)]
+    results = []
+    for key, data, extension in items:
+        try:
+            results.append((key, extract_text(data, extension), ''))
+        except Exception as e:  # one broken file must not fail the batch
+            results.append((key, '', f"{type(e).__name__}: {e}"[:500]))
+    return results
+
+
+def decode(data):
+    for encoding in ('utf-8-sig', 'cp1252'):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode('latin-1')
+
+
+def pdf_text(data):
+    # Text-showing operators inside BT..ET blocks of every (Flate-compressed or plain) content stream
+    parts = []
+    for stream in PDF_STREAM.findall(data):
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        for block in PDF_TEXT_BLOCK.findall(stream):
+            strings = [pdf_string(token) for token in PDF_STRING.findall(block)]
+            if strings:
+                parts.append(''.join(strings))
+    return '\n'.join(parts)
+
+
+def pdf_string(token):
+    if token.startswith(b'<'):
+        raw = bytes.fromhex(re.sub(rb'\s', b'', token[1:-1]).decode())
+        # Two-byte hex strings are usually UTF-16 glyph codes
+        if len(raw) % 2 == 0 and raw[:1] == b'\x00':
+            return raw.decode('utf-16-be', 'ignore')
+        return raw.decode('latin-1')
+    body = token[1:-1]
+    body = re.sub(rb'\\([nrtbf()\\])', lambda m: PDF_ESCAPES[m.group(1)], body)
+    body = re.sub(rb'\\([0-7]{1,3})', lambda m: bytes([int(m.group(1), 8) & 0xFF]), body)
+    return body.decode('latin-1')
+
+
+def docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        xml = archive.read('word/document.xml').decode('utf-8')
+    return unescape(''.join(match.group(1) if match.group(1) is not None else '\n' for match in DOCX_TEXT.finditer(xml)))
+
+
+class _HTMLText(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self.skip += 1
+        elif tag in ('br', 'p', 'div', 'li', 'tr', 'h1', 'h2', 'h3'):
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self.skip:
+            self.skip -= 1
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.parts.append(data)
+
+
+def html_text(html):
+    parser = _HTMLText()
+    parser.feed(html)
+    return ''.join(parser.parts)
@@ -0,0 +1,135 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BooleanField, F, FloatField, Q, Sum, Value
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from employee.models import search_tokens
+
+from .models import Resume, ResumeToken
+from .resume_text import extract_batch
+
+# Must match the expression of the resume_text_gin index (migration 0003)
+TSVECTOR_SQL = "to_tsvector('simple', text)"
+
+
+def claim_batch(size, reclaim_after_minutes=30):
+    # Pending resumes (plus ones a crashed worker left in Processing), locked so parallel workers split the queue
+    now = timezone.now()
+    stale = now - timedelta(minutes=reclaim_after_minutes)
+    with transaction.atomic():
+        batch = list(
+            Resume.objects.select_for_update(skip_locked=True)
+            .filter(Q(status='Pending') | Q(status='Processing', claimed_at__lt=stale))
+            .order_by('uploaded_at')[:size]
+        )
+        Resume.objects.filter(pk__in=[resume.pk for resume in batch]).update(status='Processing', claimed_at=now)
+    return batch
+
+
+def read_batch(batch):
+    # Files are read here and the bytes shipped to the workers, so any storage backend works
+    items, failed = [], []
+    for resume in batch:
+        try:
+            with resume.file.open('rb') as handle:
+                items.append((resume.pk, handle.read(), os.path.splitext(resume.file.name)[1]))
+        except OSError as e:
+            failed.append((resume.pk, '', f"Cannot read file: {e}"[:500]))
+    return items, failed
+
+
+def process_pending(workers=None, batch_size=50, reclaim_after_minutes=30, limit=None, progress=None):
+    """
+    Extract and index queued resumes on a process pool until the queue is empty
+    (or `limit` resumes were claimed). Returns (done, failed) counts.
+    """
+    workers = workers or getattr(settings, 'RESUME_WORKERS', None) or os.cpu_count() or 1
+    done = failed = claimed = 0
+
+    def collect(future):
+        stored = Resume.store_text(future.result())
+        errors = sum(1 for resume in stored if resume.status == 'Failed')
+        if progress:
+            progress(len(stored) - errors, errors)
+        return len(stored) - errors, errors
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        while True:
+            batch = []
+            if limit is None or claimed < limit:
+                size = batch_size if limit is None else min(batch_size, limit - claimed)
+                batch = claim_batch(size, reclaim_after_minutes)
+            if batch:
+                claimed += len(batch)
+                items, unreadable = read_batch(batch)
+                if unreadable:
+                    Resume.store_text(unreadable)
+                    failed += len(unreadable)
+                if items:
+                    in_flight.append(pool.submit(extract_batch, items))
+
+            # Keep every worker busy with at most two batches queued per worker
+            if not batch or len(in_flight) >= workers * 2:
+                if not in_flight:
+                    break
+                ok, errors = collect(in_flight.popleft())
+                done += ok
+                failed += errors
+    return done, failed
+
+
+def search_resumes(job_id, query, offset=0, limit=20):
+    """
+    Ranked search over processed resumes of one posting. Every word of the
+    query must prefix-match a word of the resume. Returns (total, [Resume with .rank]).
+    """
+    terms = search_tokens(query)[:8]
+    if not terms:
+        return 0, []
+    if connection.vendor == 'postgresql':
+        return _search_postgres(job_id, terms, offset, limit)
+    return _search_tokens(job_id, terms, offset, limit)
+
+
+def _search_postgres(job_id, terms, offset, limit):
+    # Terms are \w+ only, so they are safe inside a tsquery; ':*' makes each a prefix match
+    tsquery = ' & '.join(f"{term}:*" for term in terms)
+    matches = RawSQL(f"{TSVECTOR_SQL} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+    rank = RawSQL(f"ts_rank({TSVECTOR_SQL}, to_tsquery('simple', %s))", [tsquery], output_field=FloatField())
+
+    resumes = Resume.objects.filter(matches, job_id=job_id, status='Done').defer('text')
+    total = resumes.count()
+    results = list(resumes.annotate(rank=rank).order_by('-rank', '-uploaded_at')[offset:offset + limit])
+    return total, results
+
+
+def _search_tokens(job_id, terms, offset, limit):
+    # MySQL/SQLite: prefix lookups on (job, token), grouped per resume; rank = matched word occurrences
+    any_term = Q()
+    per_term = {}
+    for i, term in enumerate(terms):
+        any_term |= Q(token__startswith=term)
+        per_term[f'hits_{i}'] = Sum('count', filter=Q(token__startswith=term))
+
+    rank = sum((F(f'hits_{i}') for i in range(len(terms))), Value(0))
+    grouped = (ResumeToken.objects.filter(any_term, job_id=job_id, resume__status='Done')
+               .values('resume_id').annotate(**per_term)
+               .filter(**{f'hits_{i}__gt': 0 for i in range(len(terms))}))
+    total = grouped.count()
+    page = list(grouped.annotate(rank=rank).order_by('-rank', '-resume_id')[offset:offset + limit]) if total else []
+
+    resumes = Resume.objects.defer('text').in_bulk([row['resume_id'] for row in page])
+    results = []
+    for row in page:
+        resume = resumes.get(row['resume_id'])
+        if resume is not None:
+            resume.rank = row['rank']
+            results.append(resume)
+    return total, results
@@ -1,7 +1,53 @@
+import os
+
+from django.conf import settings
 from rest_framework import serializers
-from .models import JobPosting
+from .models import Application, JobPosting, Resume
+from .resume_text import SUPPORTED_EXTENSIONS
 
 class JobPostingSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobPosting
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        # Counted from applications, not edited by hand
+        read_only_fields = ['applicants_count']
+
+
+class ApplicationSerializer(serializers.ModelSerializer):
+    job_title = serializers.CharField(source='job.title', read_only=True)
+
+    class Meta:
+        model = Application
+        fields = ['id', 'job', 'job_title', 'candidate_name', 'email', 'phone', 'stage',
+                  'applied_at', 'stage_changed_at', 'hired_at']
+        read_only_fields = ['stage_changed_at', 'hired_at']
+
+
+class ResumeSerializer(serializers.ModelSerializer):
+    job_title = serializers.CharField(source='job.title', read_only=True)
+
+    class Meta:
+        model = Resume
+        fields = ['id', 'job', 'job_title', 'application', 'candidate_name', 'file', 'original_name',
+                  'status', 'error', 'uploaded_at', 'processed_at']
+        read_only_fields = ['original_name', 'status', 'error', 'processed_at']
+
+    def validate_file(self, value):
+        extension = os.path.splitext(value.name)[1].lower()
+        if extension not in SUPPORTED_EXTENSIONS:
+            raise serializers.ValidationError(f"Unsupported file type; use one of {', '.join(sorted(SUPPORTED_EXTENSIONS))}")
+        if value.size > settings.RESUME_MAX_BYTES:
+            raise serializers.ValidationError(f"File is larger than {settings.RESUME_MAX_BYTES} bytes")
+        return value
+
+    def validate(self, attrs):
+        application = attrs.get('application')
+        if application and attrs.get('job') and application.job_id != attrs['job'].id:
+            raise serializers.ValidationError({'application': 'Application is for another posting'})
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['original_name'] = validated_data['file'].name[:200]
+        if not validated_data.get('candidate_name') and validated_data.get('application'):
+            validated_data['candidate_name'] = validated_data['application'].candidate_name
+        return super().create(validated_data)
@@ -1,10 +1,17 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import JobPostingViewSet
+from .views import ApplicationViewSet, JobPostingViewSet, ResumeViewSet, recruitment_stats_async
 
 router = DefaultRouter()
 router.register(r'jobs', JobPostingViewSet)
+router.register(r'applications', ApplicationViewSet, basename='application')
+router.register(r'resumes', ResumeViewSet, basename='resume')
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
+
+# Under ASGI the stats endpoint is served by its async view (must come before the router)
+if settings.ASYNC_VIEWS:
+    urlpatterns.insert(0, path('jobs/dashboard_stats/', recruitment_stats_async, name='jobposting-dashboard-stats'))
\ No newline at end of file
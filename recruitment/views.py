@@ -1,9 +1,82 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Sum
-from .models import JobPosting
-from .serializers import JobPostingSerializer
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from rest_framework.parsers import FormParser, MultiPartParser
+from .models import IN_PROGRESS_STAGES, PIPELINE_STAGES, Application, HiringMonth, JobPosting, PipelineCounter, Resume
+from .serializers import ApplicationSerializer, JobPostingSerializer, ResumeSerializer
+from .ingest import ApplicantIngester
+from .resumes import search_resumes
+from employee.bulk_import import iter_rows
+from lib_management.async_utils import api_checks, run_in_thread
+
+
+def recruitment_stats():
+    # All from counters: O(postings), however many applications there are
+    today = timezone.now().date()
+    open_positions = JobPosting.objects.filter(status='Active').count()
+    # Sum all applicants from all jobs
+    total_applicants = JobPosting.objects.aggregate(Sum('applicants_count'))['applicants_count__sum'] or 0
+    in_progress = PipelineCounter.objects.filter(stage__in=IN_PROGRESS_STAGES).aggregate(total=Sum('current'))['total'] or 0
+    hired_this_month = HiringMonth.objects.filter(year=today.year, month=today.month).aggregate(total=Sum('hires'))['total'] or 0
+
+    return [
+        {'label': 'Open Positions', 'value': open_positions, 'color': '#6366f1'},
+        {'label': 'Total Applicants', 'value': total_applicants, 'color': '#22c55e'},
+        {'label': 'In Progress', 'value': in_progress, 'color': '#f59e0b'},
+        {'label': 'Hired This Month', 'value': hired_this_month, 'color': '#ec4899'},
+    ]
+
+
+def recruitment_funnel(job_id=None):
+    # Stage by stage: how many reached it, how many are there now, and conversion from the previous stage
+    counters = PipelineCounter.objects.all()
+    if job_id:
+        counters = counters.filter(job_id=job_id)
+    totals = {row['stage']: row for row in counters.values('stage').annotate(reached_total=Sum('reached'), current_total=Sum('current'))}
+
+    funnel = []
+    previous = None
+    for stage in PIPELINE_STAGES + ['Rejected']:
+        row = totals.get(stage, {})
+        reached = row.get('reached_total') or 0
+        if stage == 'Rejected':
+            reached = row.get('current_total') or 0
+        conversion = round(reached * 100 / previous, 1) if previous and stage != 'Rejected' else None
+        funnel.append({'stage': stage, 'reached': reached, 'current': row.get('current_total') or 0, 'conversion': conversion})
+        previous = reached
+    return funnel
+
+
+def time_to_hire(months=6, job_id=None):
+    today = timezone.now().date()
+    keys = []
+    year, month = today.year, today.month
+    for _ in range(months):
+        keys.append((year, month))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    keys.reverse()
+
+    rows = HiringMonth.objects.filter(year__gte=keys[0][0], year__lte=keys[-1][0])
+    if job_id:
+        rows = rows.filter(job_id=job_id)
+    totals = {(row['year'], row['month']): row for row in rows.values('year', 'month').annotate(h=Sum('hires'), d=Sum('days_to_hire'))}
+
+    result = []
+    for year, month in keys:
+        row = totals.get((year, month), {})
+        hires = row.get('h') or 0
+        result.append({
+            'year': year,
+            'month': month,
+            'hires': hires,
+            'avg_days_to_hire': round((row.get('d') or 0) / hires, 1) if hires else None,
+        })
+    return result
+
 
 class JobPostingViewSet(viewsets.ModelViewSet):
     queryset = JobPosting.objects.all().order_by('-posted_date')
@@ -12,19 +85,124 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     # API Endpoint: /api/recruitment/jobs/dashboard_stats/
     @action(detail=False, methods=['get'])
     def dashboard_stats(self, request):
-        total_jobs = JobPosting.objects.count()
-        open_positions = JobPosting.objects.filter(status='Active').count()
-        # Sum all applicants from all jobs
-        total_applicants = JobPosting.objects.aggregate(Sum('applicants_count'))['applicants_count__sum'] or 0
-        
-        # Static data for demo (since we don't have an 'Application' model yet)
-        in_progress = 34 
-        hired_this_month = 5
-
-        stats = [
-            {'label': 'Open Positions', 'value': open_positions, 'color': '#6366f1'},
-            {'label': 'Total Applicants', 'value': total_applicants, 'color': '#22c55e'},
-            {'label': 'In Progress', 'value': in_progress, 'color': '#f59e0b'},
-            {'label': 'Hired This Month', 'value': hired_this_month, 'color': '#ec4899'},
-        ]
-        return Response(stats)
\ No newline at end of file
+        return Response(recruitment_stats())
+
+    # /api/recruitment/jobs/funnel/?job=3 (all postings when omitted)
+    @action(detail=False, methods=['get'])
+    def funnel(self, request):
+        return Response(recruitment_funnel(request.query_params.get('job')))
+
+    # /api/recruitment/jobs/time_to_hire/?months=6&job=3
+    @action(detail=False, methods=['get'])
+    def time_to_hire(self, request):
+        try:
+            months = min(max(int(request.query_params.get('months', 6)), 1), 60)
+        except ValueError:
+            months = 6
+        return Response(time_to_hire(months, request.query_params.get('job')))
+
+
+class ApplicationViewSet(viewsets.ModelViewSet):
+    queryset = Application.objects.select_related('job').order_by('-applied_at')
+    serializer_class = ApplicationSerializer
+
+    def get_queryset(self):
+        # Optional filters: ?job=3&stage=Interview
+        queryset = super().get_queryset()
+        job = self.request.query_params.get('job')
+        stage = self.request.query_params.get('stage')
+        if job:
+            queryset = queryset.filter(job_id=job)
+        if stage:
+            queryset = queryset.filter(stage=stage)
+        return queryset
+
+    # Move an application to another stage: {"stage": "Interview"}
+    @action(detail=True, methods=['post', 'patch'])
+    def move(self, request, pk=None):
+        application = self.get_object()
+        stage = request.data.get('stage')
+        if stage not in dict(Application.STAGE_CHOICES):
+            return Response({'error': 'Invalid stage'}, status=status.HTTP_400_BAD_REQUEST)
+        application.stage = stage
+        application.save()
+        return Response(self.get_serializer(application).data)
+
+    # Job-board feed: /api/recruitment/applications/ingest/?input_format=csv|ndjson&job=3&dry_run=true
+    # Body is the raw CSV (with a header row) or NDJSON file, read line by line.
+    # Columns: candidate_name (or name), email, phone, job (unless ?job=), stage, applied_at
+    @action(detail=False, methods=['post'])
+    def ingest(self, request):
+        fmt = request.query_params.get('input_format')  # ('format' is taken by DRF)
+        if not fmt:
+            fmt = 'ndjson' if 'json' in (request.content_type or '') else 'csv'
+        if fmt not in ('csv', 'ndjson'):
+            return Response({"error": "input_format must be csv or ndjson"}, status=status.HTTP_400_BAD_REQUEST)
+        if request.stream is None:
+            return Response({"error": "Request body is empty"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            ingester = ApplicantIngester(job_id=request.query_params.get('job'),
+                                         dry_run=request.query_params.get('dry_run') in ('1', 'true', 'True'))
+        except ValueError:
+            return Response({"error": "job must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        lines = (line.decode('utf-8-sig') for line in request.stream)
+        try:
+            report = ingester.run(iter_rows(lines, fmt))
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({"error": f"Could not read file: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
+
+
+class ResumeViewSet(viewsets.ModelViewSet):
+    # The extracted text can be large: it is only used for search, never sent back
+    queryset = Resume.objects.select_related('job').defer('text').order_by('-uploaded_at')
+    serializer_class = ResumeSerializer
+    parser_classes = [MultiPartParser, FormParser]
+    http_method_names = ['get', 'post', 'delete', 'head', 'options']
+
+    def get_queryset(self):
+        # Optional filters: ?job=3&status=Failed
+        queryset = super().get_queryset()
+        job = self.request.query_params.get('job')
+        resume_status = self.request.query_params.get('status')
+        if job:
+            queryset = queryset.filter(job_id=job)
+        if resume_status:
+            queryset = queryset.filter(status=resume_status)
+        return queryset
+
+    def create(self, request, *args, **kwargs):
+        # Stored and queued; `manage.py process_resumes` extracts and indexes it
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    # Ranked candidates for a posting: /api/recruitment/resumes/search/?job=3&q=python+django&page=1
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        job = request.query_params.get('job')
+        if not job or not job.isdigit():
+            return Response({'error': 'job is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 20)), 1), 100)
+        except ValueError:
+            page, page_size = 1, 20
+
+        total, resumes = search_resumes(int(job), request.query_params.get('q', ''), (page - 1) * page_size, page_size)
+        results = []
+        for resume in resumes:
+            row = self.get_serializer(resume).data
+            row['rank'] = round(float(resume.rank), 4)
+            results.append(row)
+        return Response({'count': total, 'page': page, 'results': results})
+
+
+# Async version of dashboard_stats (served under ASGI)
+@require_GET
+@api_checks()
+async def recruitment_stats_async(request):
+    stats = await run_in_thread(recruitment_stats)
+    return JsonResponse(stats, safe=False)
\ No newline at end of file
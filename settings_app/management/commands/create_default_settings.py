@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from settings_app.models import EmployeeSettings
+
+
+class Command(BaseCommand):
+    help = "Create default settings for every employee that has none, in one bulk insert."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created = EmployeeSettings.create_defaults(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Created default settings for {created} employees."))
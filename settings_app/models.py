@@ -1,6 +1,16 @@
-from django.db import models
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
 from employee.models import Employee
 
+# What the frontend reads on every page load
+SETTINGS_FIELDS = ['theme', 'email_notifications', 'push_notifications', 'language', 'timezone', 'two_factor_enabled']
+
+
+def settings_cache():
+    return caches[getattr(settings, 'SETTINGS_CACHE_ALIAS', 'default')]
+
+
 class EmployeeSettings(models.Model):
     THEME_CHOICES = [('light', 'Light'), ('dark', 'Dark'), ('system', 'System')]
     LANG_CHOICES = [('en', 'English'), ('es', 'Spanish'), ('fr', 'French')]
@@ -23,4 +33,80 @@ class EmployeeSettings(models.Model):
     two_factor_enabled = models.BooleanField(default=False)
 
     def __str__(self):
-        return f"Settings for {self.employee.first_name}"
\ No newline at end of file
+        return f"Settings for {self.employee.first_name}"
+
+    # === CACHE (write-through: every save replaces the cached copy once the transaction commits) ===
+    @staticmethod
+    def cache_key(employee_id):
+        return f'employee_settings:{employee_id}'
+
+    @staticmethod
+    def user_cache_key(user_id):
+        return f'employee_settings:user:{user_id}'
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in SETTINGS_FIELDS}
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        key, values = self.cache_key(self.employee_id), self.as_dict()
+        transaction.on_commit(lambda: settings_cache().set(key, values, settings.SETTINGS_CACHE_TTL))
+
+    def delete(self, *args, **kwargs):
+        key = self.cache_key(self.employee_id)
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(lambda: settings_cache().delete(key))
+        return result
+
+    @classmethod
+    def for_employees(cls, employee_ids):
+        """
+        {employee id: settings dict} for existing employees. Cached entries cost no query;
+        the rest are read in one query, and employees without a row get default settings
+        from one bulk insert.
+        """
+        employee_ids = {int(pk) for pk in employee_ids}
+        cache = settings_cache()
+        cached = cache.get_many([cls.cache_key(pk) for pk in employee_ids])
+        result = {pk: cached[cls.cache_key(pk)] for pk in employee_ids if cls.cache_key(pk) in cached}
+
+        missing = employee_ids - result.keys()
+        if missing:
+            loaded = {row.pop('employee_id'): row for row in cls.objects.filter(employee_id__in=missing).values('employee_id', *SETTINGS_FIELDS)}
+            if len(loaded) < len(missing):
+                cls.create_defaults(missing - loaded.keys())
+                loaded.update({row.pop('employee_id'): row for row in
+                               cls.objects.filter(employee_id__in=missing - loaded.keys()).values('employee_id', *SETTINGS_FIELDS)})
+            cache.set_many({cls.cache_key(pk): values for pk, values in loaded.items()}, settings.SETTINGS_CACHE_TTL)
+            result.update(loaded)
+        return result
+
+    @classmethod
+    def for_employee(cls, employee_id):
+        return cls.for_employees([employee_id]).get(employee_id)
+
+    @classmethod
+    def create_defaults(cls, employee_ids=None, batch_size=1000):
+        # Default settings for every employee (or the given ones) without a row, as one bulk insert
+        employees = Employee.all_objects.filter(settings__isnull=True)
+        if employee_ids is not None:
+            employees = employees.filter(pk__in=employee_ids)
+        rows = [cls(employee_id=pk) for pk in employees.values_list('pk', flat=True)]
+        # ignore_conflicts: a concurrent request may have created some of them already
+        cls.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+        return len(rows)
+
+    @classmethod
+    def employee_for_user(cls, user_id):
+        # The authenticated user's employee id, cached next to the settings (None: not linked)
+        cache = settings_cache()
+        key = cls.user_cache_key(user_id)
+        employee_id = cache.get(key)
+        if employee_id is None:
+            employee_id = Employee.objects.filter(user_id=user_id).values_list('pk', flat=True).first() or 0
+            cache.set(key, employee_id, settings.SETTINGS_CACHE_TTL)
+        return employee_id or None
+
+    @classmethod
+    def forget_users(cls, user_ids):
+        settings_cache().delete_many([cls.user_cache_key(user_id) for user_id in user_ids])
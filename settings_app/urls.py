@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import UserSettingsView
+from .views import BulkSettingsView, UserSettingsView
 
 urlpatterns = [
     path('', UserSettingsView.as_view(), name='user-settings'),
-]
\ No newline at end of file
+    path('bulk/', BulkSettingsView.as_view(), name='user-settings-bulk'),
+]
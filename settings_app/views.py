@@ -1,24 +1,75 @@
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import EmployeeSettings
 from .serializers import EmployeeSettingsSerializer
 from employee.models import Employee
+from lib_management.db_routing import use_primary
 
+# Most employee ids one bulk call may ask for
+BULK_LIMIT = 5000
+
+
+# Settings are read straight back after every save, so never serve them from the replica
+@use_primary
 class UserSettingsView(generics.RetrieveUpdateAPIView):
     serializer_class = EmployeeSettingsSerializer
     # permission_classes = [permissions.IsAuthenticated] # Uncomment if using Auth
 
+    def get_employee_id(self):
+        # The authenticated user's employee (cached, see EmployeeSettings.employee_for_user)
+        user = self.request.user
+        if user and user.is_authenticated:
+            employee_id = EmployeeSettings.employee_for_user(user.pk)
+            if employee_id:
+                return employee_id
+
+        # Fallback logic for demo purposes (no user linked to an employee yet): the first employee
+        employee_id = Employee.objects.order_by('pk').values_list('pk', flat=True).first()
+        if not employee_id:
+            raise NotFound("No employee found")
+        return employee_id
+
+    def retrieve(self, request, *args, **kwargs):
+        # Served from the write-through cache: no query once an employee's settings are cached
+        values = EmployeeSettings.for_employee(self.get_employee_id())
+        if values is None:
+            raise NotFound("No employee found")
+        return Response(values)
+
     def get_object(self):
-        # HARDCODED for development (Replace with self.request.user.employee in production)
-        # Assuming we are editing settings for the first employee found or a specific ID
-        # For real auth: employee = self.request.user.employee
-        
-        # Fallback logic for demo purposes:
-        employee = Employee.objects.first() 
-        
-        if not employee:
-            return None
-
-        # Get existing settings or create default ones
-        obj, created = EmployeeSettings.objects.get_or_create(employee=employee)
-        return obj
\ No newline at end of file
+        # Updates work on the row itself; saving it refreshes the cache
+        employee_id = self.get_employee_id()
+        obj = EmployeeSettings.objects.filter(employee_id=employee_id).first()
+        if obj is None:
+            EmployeeSettings.create_defaults([employee_id])
+            obj = EmployeeSettings.objects.get(employee_id=employee_id)
+        return obj
+
+
+# Settings of many employees at once (notification fan-out):
+# GET /api/settings/bulk/?employees=1,2,3 or POST {"employee_ids": [1, 2, 3]}
+@use_primary
+class BulkSettingsView(APIView):
+    def get(self, request):
+        ids = [part for part in request.query_params.get('employees', '').split(',') if part.strip()]
+        return self.respond(ids)
+
+    def post(self, request):
+        ids = request.data.get('employee_ids')
+        if not isinstance(ids, list):
+            return Response({"error": "employee_ids must be a list"}, status=status.HTTP_400_BAD_REQUEST)
+        return self.respond(ids)
+
+    def respond(self, ids):
+        try:
+            ids = {int(pk) for pk in ids}
+        except (TypeError, ValueError):
+            return Response({"error": "Employee ids must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > BULK_LIMIT:
+            return Response({"error": f"At most {BULK_LIMIT} employees per call"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Unknown employee ids are left out of the results
+        results = EmployeeSettings.for_employees(ids)
+        return Response({'count': len(results), 'results': {str(pk): values for pk, values in sorted(results.items())}})